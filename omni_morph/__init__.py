@@ -5,6 +5,26 @@ omni_morph
 Transform, inspect, and merge data files with a single command-line Swiss Army knife for data engineers.
 """
 
-from .data.converter import Format, read, write, convert
+import functools
 
 __all__ = ["Format", "read", "write", "convert"]
+
+
+@functools.lru_cache(maxsize=1)
+def _version() -> str:
+    # Looking this up walks sys.path and parses METADATA, so do it once
+    import importlib.metadata
+
+    return importlib.metadata.version("omni_morph")
+
+
+def __getattr__(name):
+    if name == "__version__":
+        return _version()
+    # Resolved on first use, so importing the CLI module (omni_morph.omo_cli)
+    # doesn't load PyArrow before a command actually needs it.
+    if name in __all__:
+        from .data import converter
+
+        return getattr(converter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,21 @@
+"""Entry point for ``omo-cli`` and ``python -m omni_morph``."""
+
+import sys
+
+
+def main() -> None:
+    # A bare --version is answered before Typer and the command tree are
+    # imported; combined flags still go through main_callback.
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        from omni_morph import __version__
+
+        print(__version__)
+        return
+
+    from omni_morph.omo_cli import app
+
+    app(prog_name="omo-cli")
+
+
+if __name__ == "__main__":
+    main()
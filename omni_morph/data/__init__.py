@@ -5,21 +5,28 @@ omni_morph.data
 Data handling modules for OmniMorph.
 """
 
-from .formats import Format
-from .converter import read, write, convert
-from .extractor import head, tail, sample
-from .statistics import get_stats
-from .query_engine import query, validate_sql
+# Each name is imported from its module on first use, so a command that only
+# needs, say, the extractor doesn't also load DuckDB through query_engine.
+_EXPORTS = {
+    "Format": "formats",
+    "read": "converter",
+    "write": "converter",
+    "convert": "converter",
+    "head": "extractor",
+    "tail": "extractor",
+    "sample": "extractor",
+    "get_stats": "statistics",
+    "query": "query_engine",
+    "validate_sql": "query_engine",
+}
 
-__all__ = [
-    "Format",
-    "read",
-    "write",
-    "convert",
-    "head",
-    "tail",
-    "sample",
-    "get_stats",
-    "query",
-    "validate_sql",
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
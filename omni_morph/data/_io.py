@@ -4,10 +4,12 @@ Internal I/O helpers - kept separate so the public package namespace stays tidy.
 
 from __future__ import annotations
 
+import functools
+import itertools
 import json
 import warnings
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, Iterator, Union
 
 import pyarrow as pa
 import pyarrow.csv as pacsv
@@ -231,6 +233,30 @@ def _read_impl(path: Path, fmt: Format, schema: pa.Schema = None, **kwargs) -> p
         raise AssertionError("unreachable")
 
 
+def _read_batches_impl(path: Path, fmt: Format, **kwargs) -> Iterator[pa.Table]:
+    """Yield a file as a stream of PyArrow Tables with one schema.
+
+    Parquet is read one row group at a time (an empty file yields one empty
+    table); other formats are read whole with :func:`_read_impl`.
+
+    Args:
+        path: Path to the file to read (local path or cloud URL)
+        fmt: Format of the file
+        **kwargs: Additional format-specific options, as for _read_impl
+    """
+    if fmt is not Format.PARQUET:
+        yield _read_impl(path, fmt, **kwargs)
+        return
+
+    fs, fs_path = FileSystemHandler.get_fs_and_path(str(path))
+    pf = papq.ParquetFile(fs_path, filesystem=fs)
+    if pf.num_row_groups == 0:
+        yield pf.schema_arrow.empty_table()
+        return
+    for rg in range(pf.num_row_groups):
+        yield pf.read_row_group(rg, **kwargs)
+
+
 CHUNK_SIZE = 10000  # Default chunk size for reading large files
 
 
@@ -259,7 +285,7 @@ def _read_avro(
             # Convert Avro schema to PyArrow schema once if needed
             if not avro_pa_schema and avro_schema_dict:
                 try:
-                    avro_pa_schema = _avro_to_pyarrow_schema(avro_schema_dict)
+                    avro_pa_schema = _cached_avro_to_pyarrow_schema(avro_schema_dict)
                 except Exception as e:
                     # Log warning, proceed without specific schema
                     print(
@@ -354,6 +380,7 @@ def _write_impl(table: pa.Table, path: Union[str, Path], fmt: Format, **kwargs)
         fmt: Format of the file
         **kwargs: Additional format-specific options
             - For Parquet: compression, use_dictionary, write_statistics, use_threads
+            - For Avro: compression (fastavro codec, e.g. snappy; default uncompressed)
             - For CSV: include_header, batch_size, delimiter, quoting_style
             - For JSON: indent
     """
@@ -380,37 +407,10 @@ def _write_impl(table: pa.Table, path: Union[str, Path], fmt: Format, **kwargs)
         )
 
         # Pre-identify columns that need conversion
-        datetime_columns = set()
-        string_columns = set()
-        for field in table.schema:
-            if (
-                pa.types.is_timestamp(field.type)
-                or pa.types.is_date(field.type)
-                or pa.types.is_time(field.type)
-            ):
-                datetime_columns.add(field.name)
-            elif pa.types.is_binary(field.type):
-                string_columns.add(field.name)
-
-        # Generate Avro schema directly from the table schema
-        avro_schema_dict = {}
-        for field in table.schema:
-            field_type = _pyarrow_to_avro_type(field.type)
-            if field.name not in avro_schema_dict:
-                avro_schema_dict[field.name] = field_type
-
-        # Create the full Avro schema
-        avro_schema = {
-            "type": "record",
-            "name": "ArrowRecord",
-            "fields": [
-                {"name": name, "type": type_def}
-                for name, type_def in avro_schema_dict.items()
-            ],
-        }
+        datetime_columns, string_columns = _avro_coerce_columns(table.schema)
 
         # Parse the schema for validation and optimization
-        parsed_schema = fastavro.parse_schema(avro_schema)
+        parsed_schema = fastavro.parse_schema(_avro_schema_from_arrow(table.schema))
 
         # Define an optimized generator function
         def optimized_record_generator():
@@ -419,47 +419,22 @@ def _write_impl(table: pa.Table, path: Union[str, Path], fmt: Format, **kwargs)
 
                 # Process only the columns that need conversion
                 for record in records:
-                    # Process datetime columns
-                    for col in datetime_columns:
-                        if (
-                            col in record
-                            and record[col] is not None
-                            and hasattr(record[col], "isoformat")
-                        ):
-                            record[col] = record[col].isoformat()
-
-                    # Process string columns
-                    for col in string_columns:
-                        if col in record and record[col] is not None:
-                            record[col] = str(record[col])
-
-                    yield record
+                    yield _coerce_avro_record(record, datetime_columns, string_columns)
 
                 # Help garbage collection for large tables
                 del records
 
         # Write Avro file using fastavro with the optimized generator
         with FileSystemHandler.open_file(path_str, "wb") as fo:
-            fastavro.writer(fo, parsed_schema, optimized_record_generator())
+            fastavro.writer(
+                fo,
+                parsed_schema,
+                optimized_record_generator(),
+                codec=_avro_codec(compression),
+            )
 
     elif fmt is Format.PARQUET:
-        # Optimize for data-lake workloads with better compression and performance
-        parquet_kwargs = {
-            "compression": compression or "zstd",  # ~30% smaller + ~1.2× write
-            "use_dictionary": kwargs.pop("use_dictionary", True),
-            "write_statistics": kwargs.pop("write_statistics", True),
-            "data_page_size": kwargs.pop(
-                "data_page_size", 512 * 1024
-            ),  # Sane page – row-group ratio
-            "version": kwargs.pop("version", "2.6"),
-        }
-
-        # Note: use_threads is not directly supported by the Parquet writer in this version
-        # Remove it if present to avoid errors
-        kwargs.pop("use_threads", None)
-
-        # Add any remaining kwargs
-        parquet_kwargs.update(kwargs)
+        parquet_kwargs = _parquet_write_kwargs(kwargs, compression)
 
         # Get filesystem and path for cloud storage support
         fs, fs_path = FileSystemHandler.get_fs_and_path(path_str)
@@ -483,18 +458,7 @@ def _write_impl(table: pa.Table, path: Union[str, Path], fmt: Format, **kwargs)
                     fo.write(json.dumps(record, default=str) + "\n")
 
     elif fmt is Format.CSV:
-        # Create WriteOptions with optimized defaults
-        # Note: CSV writer doesn't support use_threads directly
-        write_opts = pacsv.WriteOptions(
-            include_header=kwargs.pop("include_header", True),
-            batch_size=kwargs.pop(
-                "batch_size", 1 << 16
-            ),  # Optimize batch size for wide tables
-            delimiter=kwargs.pop("delimiter", ","),  # Handle delimiter parameter
-            quoting_style=kwargs.pop(
-                "quoting_style", "needed"
-            ),  # Handle quoting_style parameter
-        )
+        write_opts = _csv_write_options(kwargs)
         # Write the table using the filesystem
         with FileSystemHandler.open_file(path_str, "wb") as f:
             # Pass remaining kwargs to write_csv
@@ -552,6 +516,136 @@ def _write_impl(table: pa.Table, path: Union[str, Path], fmt: Format, **kwargs)
         raise AssertionError("unreachable")
 
 
+_NO_COMPRESSION = {"none", "uncompressed"}
+
+
+def _avro_codec(compression: str | None) -> str:
+    """fastavro codec name for a compression setting (None means uncompressed)."""
+    if compression is None or compression.lower() in _NO_COMPRESSION:
+        return "null"
+    return compression
+
+
+def _parquet_write_kwargs(kwargs: dict, compression: str | None) -> dict:
+    """Pop the Parquet writer options out of *kwargs*, filling in defaults."""
+    if compression is not None and compression.lower() in _NO_COMPRESSION:
+        compression = "none"  # the spelling Arrow accepts
+    # Optimize for data-lake workloads with better compression and performance
+    parquet_kwargs = {
+        "compression": compression or "zstd",  # ~30% smaller + ~1.2× write
+        "use_dictionary": kwargs.pop("use_dictionary", True),
+        "write_statistics": kwargs.pop("write_statistics", True),
+        "data_page_size": kwargs.pop(
+            "data_page_size", 512 * 1024
+        ),  # Sane page – row-group ratio
+        "version": kwargs.pop("version", "2.6"),
+    }
+
+    # Note: use_threads is not directly supported by the Parquet writer in this version
+    # Remove it if present to avoid errors
+    kwargs.pop("use_threads", None)
+
+    # Add any remaining kwargs
+    parquet_kwargs.update(kwargs)
+    return parquet_kwargs
+
+
+def _csv_write_options(kwargs: dict) -> pacsv.WriteOptions:
+    """Pop the CSV writer options out of *kwargs*, filling in defaults."""
+    # Create WriteOptions with optimized defaults
+    # Note: CSV writer doesn't support use_threads directly
+    return pacsv.WriteOptions(
+        include_header=kwargs.pop("include_header", True),
+        batch_size=kwargs.pop(
+            "batch_size", 1 << 16
+        ),  # Optimize batch size for wide tables
+        delimiter=kwargs.pop("delimiter", ","),  # Handle delimiter parameter
+        quoting_style=kwargs.pop(
+            "quoting_style", "needed"
+        ),  # Handle quoting_style parameter
+    )
+
+
+def _write_batches_impl(
+    tables: Iterable[pa.Table], path: Union[str, Path], fmt: Format, **kwargs
+) -> None:
+    """Write a stream of same-schema PyArrow Tables to one file.
+
+    Produces the same file as :func:`_write_impl` on the concatenated tables,
+    but Parquet, CSV, JSON and Avro output is written table by table, so
+    only one of them needs to be in memory at a time. Excel output is
+    still assembled in memory.
+
+    Args:
+        tables: Tables to write, in order; the first one fixes the schema
+        path: Path to write the file to (local path or cloud URL)
+        fmt: Format of the file
+        **kwargs: Additional format-specific options, as for _write_impl
+    """
+    path_str = str(path) if isinstance(path, Path) else path
+    tables = iter(tables)
+    first = next(tables, None)
+    if first is None:
+        raise ValueError("No tables to write.")
+    stream = itertools.chain([first], tables)
+    schema = first.schema
+
+    _ = kwargs.pop("use_threads", True)
+    compression = kwargs.pop("compression", None)
+
+    if fmt is Format.PARQUET:
+        parquet_kwargs = _parquet_write_kwargs(kwargs, compression)
+        fs, fs_path = FileSystemHandler.get_fs_and_path(path_str)
+        with papq.ParquetWriter(
+            fs_path, schema, filesystem=fs, **parquet_kwargs
+        ) as writer:
+            for table in stream:
+                writer.write_table(table)
+
+    elif fmt is Format.CSV:
+        write_opts = _csv_write_options(kwargs)
+        with (
+            FileSystemHandler.open_file(path_str, "wb") as f,
+            pacsv.CSVWriter(f, schema, write_options=write_opts, **kwargs) as writer,
+        ):
+            for table in stream:
+                writer.write_table(table)
+
+    elif fmt is Format.JSON:
+        with FileSystemHandler.open_file(path_str, "w") as fo:
+            for table in stream:
+                fo.write(
+                    "".join(
+                        json.dumps(record, default=str) + "\n"
+                        for record in table.to_pylist()
+                    )
+                )
+
+    elif fmt is Format.AVRO:
+        if not HAS_FASTAVRO:
+            raise ImportError(
+                "Fastavro is not available. Please install fastavro to support Avro format."
+            )
+        datetime_columns, string_columns = _avro_coerce_columns(schema)
+        parsed_schema = fastavro.parse_schema(_avro_schema_from_arrow(schema))
+
+        def records():
+            for table in stream:
+                for record in table.to_pylist():
+                    yield _coerce_avro_record(record, datetime_columns, string_columns)
+
+        with FileSystemHandler.open_file(path_str, "wb") as fo:
+            fastavro.writer(
+                fo, parsed_schema, records(), codec=_avro_codec(compression)
+            )
+
+    else:
+        # Excel has no incremental writer here; fall back to one table
+        if compression is not None:
+            kwargs["compression"] = compression
+        _write_impl(pa.concat_tables(stream), path_str, fmt, **kwargs)
+
+
 # Add memoization cache for schema conversion
 _pyarrow_to_avro_type_cache = {}
 
@@ -636,6 +730,51 @@ def _pyarrow_to_avro_type(pa_type: pa.DataType, field_path="") -> str | list | d
     return result
 
 
+def _avro_schema_from_arrow(schema: pa.Schema) -> dict:
+    """Build a nullable Avro record schema from a PyArrow schema."""
+    fields = {}
+    for field in schema:
+        if field.name not in fields:
+            fields[field.name] = _pyarrow_to_avro_type(field.type)
+    return {
+        "type": "record",
+        "name": "ArrowRecord",
+        "fields": [
+            {"name": name, "type": type_def} for name, type_def in fields.items()
+        ],
+    }
+
+
+def _avro_coerce_columns(schema: pa.Schema) -> tuple[set, set]:
+    """Return the (datetime, binary) column names that Avro stores as strings."""
+    datetime_columns = set()
+    string_columns = set()
+    for field in schema:
+        if (
+            pa.types.is_timestamp(field.type)
+            or pa.types.is_date(field.type)
+            or pa.types.is_time(field.type)
+        ):
+            datetime_columns.add(field.name)
+        elif pa.types.is_binary(field.type):
+            string_columns.add(field.name)
+    return datetime_columns, string_columns
+
+
+def _coerce_avro_record(
+    record: dict, datetime_columns: set, string_columns: set
+) -> dict:
+    """Convert datetime and binary values in *record* to their Avro string form."""
+    for col in datetime_columns:
+        value = record.get(col)
+        if value is not None and hasattr(value, "isoformat"):
+            record[col] = value.isoformat()
+    for col in string_columns:
+        if record.get(col) is not None:
+            record[col] = str(record[col])
+    return record
+
+
 def _generate_avro_schema(table: pa.Table, sample_records: list) -> tuple:
     """Generate an Avro schema based on a PyArrow table and sample records.
 
@@ -689,6 +828,29 @@ def _avro_to_pyarrow_schema(avro_schema: Dict) -> pa.Schema:
     return pa.schema(fields)
 
 
+def _cached_avro_to_pyarrow_schema(avro_schema: Dict) -> pa.Schema:
+    """Memoized :func:`_avro_to_pyarrow_schema`, keyed by the schema's JSON.
+
+    ``doc`` strings don't affect the translation and often differ per file
+    (e.g. sample values), so they are left out of the key.
+    """
+    key = json.dumps(_strip_avro_docs(avro_schema), sort_keys=True)
+    return _avro_json_to_pyarrow_schema(key)
+
+
+def _strip_avro_docs(node: Any) -> Any:
+    if isinstance(node, dict):
+        return {k: _strip_avro_docs(v) for k, v in node.items() if k != "doc"}
+    if isinstance(node, list):
+        return [_strip_avro_docs(v) for v in node]
+    return node
+
+
+@functools.lru_cache(maxsize=128)
+def _avro_json_to_pyarrow_schema(schema_json: str) -> pa.Schema:
+    return _avro_to_pyarrow_schema(json.loads(schema_json))
+
+
 def _avro_type_to_pyarrow(avro_type: Any) -> pa.DataType:
     """Convert a single Avro type definition to a PyArrow DataType."""
     # Handle union types (often ["null", type])
@@ -9,7 +9,10 @@ Public API
 ----------
 • read(path, fmt=None) → pa.Table        - read file into a PyArrow Table
 • write(table, path, fmt=None, **kw)     - write table to file, returns *table*
+• write_batches(tables, path, fmt=None)  - write a stream of tables to one file
 • convert(src, dst, *, src_fmt=None, dst_fmt=None) → pa.Table
+• convert_batches(src, dst, *, src_fmt=None, dst_fmt=None) - streaming convert
+• has_nested_types(schema) → bool        - lists/structs/maps CSV can't hold
 
 Example
 -------
@@ -23,19 +26,53 @@ Copyright 2025 Christian R. Jaensch.  MIT license.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Optional, Union
 
 import pyarrow as pa
 
 from . import _io as _io
 from .formats import Format
 
-__all__ = ["Format", "read", "write", "convert"]
+__all__ = [
+    "Format",
+    "read",
+    "write",
+    "write_batches",
+    "convert",
+    "convert_batches",
+    "has_nested_types",
+]
 
 
 # ============================== public helpers ============================== #
 
 
+# Type ids of the nested types a flat format like CSV cannot represent
+_NESTED_TYPE_IDS = frozenset(
+    t.id
+    for t in (
+        pa.list_(pa.int8()),
+        pa.large_list(pa.int8()),
+        pa.list_(pa.int8(), 1),  # fixed-size list
+        pa.list_view(pa.int8()),
+        pa.large_list_view(pa.int8()),
+        pa.struct([]),
+        pa.map_(pa.int8(), pa.int8()),
+        pa.sparse_union([]),
+        pa.dense_union([]),
+    )
+)
+
+
+def has_nested_types(schema: pa.Schema) -> bool:
+    """Return True if any top-level field of *schema* is a list, struct, map or union.
+
+    Compares integer type ids, so wide schemas are checked without calling
+    into the ``pa.types`` predicates once per field and type.
+    """
+    return any(t.id in _NESTED_TYPE_IDS for t in schema.types)
+
+
 def read(
     path: Union[str, Path],
     fmt: Optional[Format] = None,
@@ -138,6 +175,41 @@ def write(
     return table
 
 
+def write_batches(
+    tables: Iterable[pa.Table],
+    path: Union[str, Path],
+    fmt: Optional[Format] = None,
+    *,
+    compression: Optional[str] = None,
+    **kwargs,
+) -> None:
+    """Write a stream of PyArrow Tables with one schema to a single file.
+
+    The output matches :func:`write` on the concatenated tables, but for
+    Parquet, CSV, JSON and Avro each table is written as soon as it arrives,
+    so the whole dataset never has to be held in memory.
+
+    Args:
+        tables: Iterable of tables sharing the schema of the first one.
+        path: A string or Path object pointing to the destination file.
+        fmt: Optional format specification. If None, the format is inferred
+             from the file extension.
+        compression: Compression algorithm to use (primarily for Parquet).
+        **kwargs: Additional keyword arguments passed to the underlying
+                 PyArrow writer.
+
+    Raises:
+        ValueError: If *tables* is empty, or if the format cannot be inferred
+                   from the file extension and no format is explicitly provided.
+        IOError: If the file cannot be written to the specified path.
+    """
+    resolved_fmt = fmt or Format.from_path(path)
+    if compression is not None:
+        kwargs["compression"] = compression
+
+    _io._write_batches_impl(tables, Path(path), resolved_fmt, **kwargs)
+
+
 def convert(
     src: Union[str, Path],
     dst: Union[str, Path],
@@ -222,3 +294,45 @@ def convert(
 
     # Write to the destination file
     return write(table, dst, fmt=resolved_dst_fmt, **write_kwargs)
+
+
+def convert_batches(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    *,
+    src_fmt: Optional[Format] = None,
+    dst_fmt: Optional[Format] = None,
+    compression: Optional[str] = None,
+    write_kwargs: Optional[dict[str, Any]] = None,
+) -> None:
+    """Convert a data file from one format to another without returning it.
+
+    The output matches :func:`convert`, but a Parquet source is read one row
+    group at a time and handed to :func:`write_batches`, so only one row
+    group needs to be in memory for Parquet, CSV, JSON and Avro output.
+    Other sources are read whole, as in :func:`convert`.
+
+    Args:
+        src: A string or Path object pointing to the source file.
+        dst: A string or Path object pointing to the destination file.
+        src_fmt: Optional source format specification. If None, the format is
+                inferred from the source file extension.
+        dst_fmt: Optional destination format specification. If None, the format
+                is inferred from the destination file extension.
+        compression: Compression algorithm to use for writing (primarily for Parquet).
+        write_kwargs: Optional dictionary of keyword arguments passed to the
+                     underlying PyArrow writer.
+
+    Raises:
+        ValueError: If the formats cannot be inferred from file extensions
+                   and no formats are explicitly provided.
+        IOError: If the source file cannot be read or the destination file
+                cannot be written.
+    """
+    write_kwargs = dict(write_kwargs or {})
+    if compression is not None:
+        write_kwargs["compression"] = compression
+
+    resolved_src_fmt = src_fmt or Format.from_path(src)
+    tables = _io._read_batches_impl(Path(src), resolved_src_fmt)
+    write_batches(tables, dst, fmt=dst_fmt, **write_kwargs)
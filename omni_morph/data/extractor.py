@@ -9,14 +9,17 @@ Public API
     tbl   = head("events.parquet", 100)               # pyarrow.Table
     frame = tail("logs.jsonl",  20, return_type="pandas")
     sample_tbl = sample("data.csv", n=50, seed=42)     # random sample of 50 records
+    for tbl in sample_batches("big.parquet", fraction=0.5):  # streamed sample
+        ...
 
 ---------------------------------------------------------------------------
 """
 
 from __future__ import annotations
+import json
 import os
 from enum import Enum
-from typing import Literal, Optional, Union
+from typing import Iterator, Literal, Optional, Union
 from pathlib import Path
 import random
 
@@ -24,6 +27,7 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 import pandas as pd
 from collections import deque
+from io import StringIO
 
 try:
     from fastavro import reader as avro_reader
@@ -32,11 +36,13 @@ except ImportError:  # fastavro is optional until Avro is actually used
 
 from .formats import Format
 from .sampling import (
+    _DENSE_FRACTION,
     parquet_sample,
+    parquet_sample_batches,
+    jsonl_sample,
+    csv_sample,
     streaming_sample,
-    iter_avro,
-    iter_jsonl,
-    iter_csv,
+    iter_avro_batches,
 )
 from .exceptions import ExtractError
 from .filesystems import FileSystemHandler
@@ -45,6 +51,7 @@ __all__ = [
     "head",
     "tail",
     "sample",
+    "sample_batches",
     "ExtractError",
 ]
 
@@ -220,16 +227,17 @@ def sample(
             )
         elif resolved_fmt is Format.AVRO:
             table = streaming_sample(
-                iter_avro(path_str),
+                iter_avro_batches(path_str),
                 n,
                 fraction,
                 rng,
                 with_replacement,
                 small_file_threshold,
+                batched=True,
             )
         elif resolved_fmt is Format.JSON:
-            table = streaming_sample(
-                iter_jsonl(path_str),
+            table = jsonl_sample(
+                path_str,
                 n,
                 fraction,
                 rng,
@@ -237,8 +245,8 @@ def sample(
                 small_file_threshold,
             )
         elif resolved_fmt is Format.CSV:
-            table = streaming_sample(
-                iter_csv(path_str),
+            table = csv_sample(
+                path_str,
                 n,
                 fraction,
                 rng,
@@ -272,6 +280,68 @@ def sample(
     return table if return_type == "arrow" else table.to_pandas()
 
 
+def sample_batches(
+    path: Union[str, Path],
+    *,
+    n: Optional[int] = None,
+    fraction: Optional[float] = None,
+    fmt: Optional[Format] = None,
+    seed: Optional[int] = None,
+    with_replacement: bool = False,
+    small_file_threshold: int = 100 * 1024 * 1024,
+) -> Iterator[pa.Table]:
+    """Yield a random sample of records from a file as a stream of tables.
+
+    Takes the same arguments as :func:`sample` and selects the same records.
+    A dense fraction of a Parquet file is filtered batch by batch, so the
+    sample can be written out while the file is still being decoded. Other
+    samples are bounded by *n* or come from a single in-memory pass, and are
+    yielded as one table.
+
+    Yields:
+        Non-empty PyArrow Tables sharing one schema. At least one table is
+        yielded, even if no record was selected.
+
+    Raises:
+        ValueError: If neither or both of n and fraction are specified.
+        ExtractError: If the sampling operation fails.
+    """
+    if (n is None) == (fraction is None):  # xor check
+        raise ValueError("Specify exactly one of `n` or `fraction`.")
+
+    path_str = str(path)
+    resolved_fmt = fmt or Format.from_path(path_str)
+    if (
+        resolved_fmt is not Format.PARQUET
+        or n is not None
+        or fraction < _DENSE_FRACTION
+    ):
+        yield sample(
+            path,
+            n=n,
+            fraction=fraction,
+            fmt=fmt,
+            seed=seed,
+            with_replacement=with_replacement,
+            small_file_threshold=small_file_threshold,
+        )
+        return
+
+    empty = True
+    try:
+        for table in parquet_sample_batches(path_str, fraction, random.Random(seed)):
+            empty = False
+            yield table
+    except Exception as exc:
+        raise ExtractError(
+            f"sample failed for {os.path.basename(path)!r}: {exc}"
+        ) from exc
+
+    # Same fallback as sample(): an empty fraction sample returns one record
+    if empty:
+        yield head(path, 1, fmt=fmt, small_file_threshold=small_file_threshold)
+
+
 # ---------------------------------------------------------------------------
 # Core engine – kept exactly as before (only _Operation renamed)
 # ---------------------------------------------------------------------------
@@ -527,8 +597,6 @@ def _avro_extract_tail_large_file(path: str, n: int) -> pa.Table:
 
 
 def _jsonl_extract(path: str, n: int, op: _Operation, limit: int) -> pa.Table:
-    import json
-
     if op is _Operation.HEAD:
         with open(path, "r", encoding="utf8") as fh:
             rows = [json.loads(line) for _, line in zip(range(n), fh)]
@@ -547,8 +615,6 @@ def _csv_extract(path: str, n: int, op: _Operation, limit: int) -> pa.Table:
         if size > limit:
             lines = _tail_lines(path, n + 1)  # preserve header
             header = _read_csv_header(path)
-            from io import StringIO
-
             csv_chunk = "\n".join([header] + lines[-n:])
             df = pd.read_csv(StringIO(csv_chunk))
         else:
@@ -5,12 +5,16 @@ Supports local and cloud storage (Azure ADLS Gen2).
 
 from __future__ import annotations
 
+import re
 from typing import Union, BinaryIO, TextIO, Any, Dict
 
-# For Azure ADLS Gen2 support
-import adlfs
+# adlfs (and the Azure SDK behind it) is imported only for abfs[s]:// paths
 import fsspec
 
+# abfs[s]://<container>@<account>.dfs.core.windows.net/<path>; the
+# container@account part is optional so bare abfs URLs still match.
+_AZ_URL_RE = re.compile(r"^(abfss?)://(?:([^@/]+)@([^./]+))?")
+
 
 class FileSystemHandler:
     """Abstract file system operations for different storage backends."""
@@ -25,6 +29,18 @@ class FileSystemHandler:
         "client_secret": None,
     }
 
+    # Read throughput knobs for Azure, see set_azure_credentials
+    _azure_transfer = {
+        "read_concurrency": None,
+        "read_chunk_size": None,
+        "read_buffer_size": None,
+    }
+
+    # Settings last applied by set_azure_credentials, and the Azure
+    # filesystems built from them keyed by account name
+    _applied_settings: tuple = ()
+    _azure_fs_cache: Dict[Any, Any] = {}
+
     @classmethod
     def set_azure_credentials(cls, credentials: dict) -> None:
         """
@@ -38,11 +54,31 @@ class FileSystemHandler:
                 - tenant_id: Azure tenant ID for service principal
                 - client_id: Azure client ID for service principal
                 - client_secret: Azure client secret for service principal
+                - read_concurrency: Parallel requests per blob read
+                - read_chunk_size: Bytes fetched per request (DuckDB only)
+                - read_buffer_size: Bytes read ahead per open blob
+
+            Keys may be given with or without the ``azure_`` prefix used by
+            the CLI context object.
+            Calling again with the same settings is a no-op.
         """
         if credentials:
+            settings = tuple(
+                sorted((k, v) for k, v in credentials.items() if v is not None)
+            )
+            if settings == cls._applied_settings:
+                return
+            cls._applied_settings = settings
+            # clients built from the previous settings must not be reused
+            cls._azure_fs_cache.clear()
             for key, value in credentials.items():
-                if key.startswith("azure_") and value is not None:
-                    cls._azure_credentials[key.replace("azure_", "")] = value
+                if value is None:
+                    continue
+                name = key.removeprefix("azure_")
+                if name in cls._azure_transfer:
+                    cls._azure_transfer[name] = value
+                elif name in cls._azure_credentials:
+                    cls._azure_credentials[name] = value
 
     @classmethod
     def get_fs_and_path(cls, path: str) -> tuple[Any, str]:
@@ -59,17 +95,20 @@ class FileSystemHandler:
         Returns:
             A tuple of (filesystem, path)
         """
-        if path.startswith(("abfss://", "abfs://")):
+        m = _AZ_URL_RE.match(path)
+        if m:
             # Parse Azure ADLS Gen2 path
             credential = None
             account_name = None
 
             # Extract account name from URL if possible
-            if "@" in path:
-                account_part = path.split("@")[1].split(".")[0]
-                account_name = (
-                    cls._azure_credentials.get("account_name") or account_part
-                )
+            if m.group(3):
+                account_name = cls._azure_credentials.get("account_name") or m.group(3)
+
+            # Reuse the client (and its auth tokens) built for this account
+            fs = cls._azure_fs_cache.get(account_name)
+            if fs is not None:
+                return fs, path
 
             # Try connection string first
             if cls._azure_credentials.get("connection_string"):
@@ -92,15 +131,36 @@ class FileSystemHandler:
                     client_secret=cls._azure_credentials["client_secret"],
                 )
 
-            # Create the filesystem
+            # Create the filesystem, with any throughput knobs that were set
+            import adlfs
+
+            transfer = {}
+            if cls._azure_transfer["read_concurrency"]:
+                transfer["max_concurrency"] = cls._azure_transfer["read_concurrency"]
+            if cls._azure_transfer["read_buffer_size"]:
+                transfer["blocksize"] = cls._azure_transfer["read_buffer_size"]
             fs = adlfs.AzureBlobFileSystem(
-                account_name=account_name, credential=credential
+                account_name=account_name, credential=credential, **transfer
             )
+            cls._azure_fs_cache[account_name] = fs
             return fs, path
         else:
             # Local filesystem
             return fsspec.filesystem("file"), str(path)
 
+    @staticmethod
+    def is_remote(path: str) -> bool:
+        """
+        Check whether a path points at Azure storage rather than the local disk.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            True for abfs/abfss URLs, False otherwise
+        """
+        return _AZ_URL_RE.match(str(path)) is not None
+
     @classmethod
     def open_file(
         cls, path: str, mode: str = "rb", **kwargs
@@ -1,13 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import json
+import queue
+import threading
 import pyarrow as pa
-import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import pyarrow.parquet as pq
 import pandas as pd
 
 from omni_morph.data.formats import Format
 from omni_morph.data.filesystems import FileSystemHandler
 from .exceptions import ExtractError
+from ._io import _avro_coerce_columns, _avro_schema_from_arrow, _coerce_avro_record
+from .converter import _NESTED_TYPE_IDS
 
 try:
     from fastavro import reader as avro_reader
@@ -27,6 +32,7 @@ def merge_files(
     allow_cast: bool = True,
     chunksize: int = 100_000,
     progress: bool = False,
+    max_workers: int = 4,
 ):
     """
     Merge multiple data files of possibly different format, like parquet, avro, JSON or CSV,
@@ -46,6 +52,8 @@ def merge_files(
                    Incompatible columns raise ExtractError.
         chunksize: Maximum rows loaded per source batch to keep memory usage bounded.
         progress: If True, print progress information to stdout during the merge.
+        max_workers: Number of sources read ahead concurrently while the writer
+                    drains already-read batches. Output order is preserved.
 
     Raises:
         ValueError: If no input files are supplied.
@@ -61,32 +69,40 @@ def merge_files(
     if out_fmt not in {"parquet", "avro", "csv", "jsonl", "xlsx"}:
         raise ExtractError(f"Unsupported output format {out_fmt!r}")
 
-    # ---------- establish target schema from the first source ---------------
-    first_batches = _batch_reader(sources[0], chunksize)
-    first = next(first_batches)
-    schema = first.schema
-
-    # open writer ------------------------------------------------------------
-    _writer = _open_writer(output_path, out_fmt, schema)
-    rows_written = 0
-
-    def write_batch(tbl):
-        nonlocal rows_written
-        if allow_cast and tbl.schema != schema:
-            tbl = _reconcile_schema(tbl, schema)
-        _writer(tbl)
-        rows_written += len(tbl)
-        if progress and rows_written % (chunksize * 10) == 0:
-            print(f"{rows_written:,} rows merged...", flush=True)
-
-    write_batch(first)  # first batch from first file
-    for tbl in first_batches:
-        write_batch(tbl)
-
-    # remaining files
-    for src in sources[1:]:
-        for tbl in _batch_reader(src, chunksize):
+    # ---------- same-schema Parquet: one multi-threaded DuckDB COPY ----------
+    if out_fmt == "parquet":
+        rows_written = _duckdb_parquet_merge(sources, output_path)
+        if rows_written is not None:
+            if progress:
+                print(f"Merge complete → {output_path}  ({rows_written:,} rows)")
+            return
+
+    # ---------- read ahead on a thread pool, write on this thread ------------
+    batches = _prefetch_batches(sources, chunksize, max_workers=max_workers)
+
+    try:
+        # ---------- establish target schema from the first source -----------
+        first = next(batches)
+        schema = first.schema
+
+        # open writer --------------------------------------------------------
+        _writer = _open_writer(output_path, out_fmt, schema)
+        rows_written = 0
+
+        def write_batch(tbl):
+            nonlocal rows_written
+            if allow_cast and tbl.schema != schema:
+                tbl = _reconcile_schema(tbl, schema)
+            _writer(tbl)
+            rows_written += len(tbl)
+            if progress and rows_written % (chunksize * 10) == 0:
+                print(f"{rows_written:,} rows merged...", flush=True)
+
+        write_batch(first)  # first batch from first file
+        for tbl in batches:  # rest of the first file, then remaining files
             write_batch(tbl)
+    finally:
+        batches.close()  # stop the reader threads if writing failed
 
     # close writer -----------------------------------------------------------
     _writer.close()
@@ -99,6 +115,176 @@ def merge_files(
 # ---------------------------------------------------------------------------
 
 
+def _duckdb_parquet_merge(sources: list[str], output_path: str) -> Optional[int]:
+    """
+    Concatenate local Parquet files with one DuckDB ``COPY``, when it is exact.
+
+    DuckDB decodes and encodes row groups on all cores, but it rewrites some
+    Arrow types (large strings, dictionaries, millisecond or zoned
+    nanosecond timestamps) and drops schema metadata. So this applies only
+    when every source has the same schema and DuckDB writes it back
+    unchanged; the output then matches the batch-wise merge, rows in source
+    order.
+
+    Args:
+        sources: Paths of the input files, in output order
+        output_path: Path of the Parquet file to write
+
+    Returns:
+        Number of rows written, or None if the sources don't qualify (the
+        output is then left for the batch-wise merge to write).
+    """
+    paths = [*sources, output_path]
+    if any(FileSystemHandler.is_remote(p) for p in paths):
+        return None
+    try:
+        if any(Format.from_path(src) is not Format.PARQUET for src in sources):
+            return None
+    except ValueError:
+        return None
+
+    schema = None
+    for src in sources:
+        meta = pq.read_metadata(src)
+        other = meta.schema.to_arrow_schema()
+        if schema is None:
+            schema = other
+            if not all(_duckdb_keeps_type(t) for t in schema.types):
+                return None
+        elif not other.equals(schema):
+            return None
+        if not _duckdb_keeps_metadata(other.metadata):
+            return None
+        # legacy INT96 timestamps read back as microseconds
+        columns = (meta.schema.column(i) for i in range(meta.num_columns))
+        if any(col.physical_type == "INT96" for col in columns):
+            return None
+
+    from omni_morph.data.query_engine import _open_connection, _sql_literal
+
+    con, _ = _open_connection(Format.PARQUET, output_path, None)
+    try:
+        files = ", ".join(_sql_literal(src) for src in sources)
+        # insertion order is preserved by default, so rows keep source order
+        rows = con.execute(
+            f"COPY (SELECT * FROM read_parquet([{files}])) "
+            f"TO {_sql_literal(output_path)} (FORMAT parquet)"
+        ).fetchone()[0]
+    finally:
+        con.close()
+    # a type the checks above missed: let the batch-wise merge rewrite it
+    if not pq.read_schema(output_path).equals(schema):
+        return None
+    return rows
+
+
+def _duckdb_keeps_type(t: pa.DataType) -> bool:
+    """True if a DuckDB Parquet round-trip reads back as the same Arrow type."""
+    if pa.types.is_timestamp(t):
+        return (t.unit == "us" and t.tz in (None, "UTC")) or (
+            t.unit == "ns" and t.tz is None
+        )
+    return (
+        pa.types.is_integer(t)
+        or pa.types.is_float32(t)
+        or pa.types.is_float64(t)
+        or pa.types.is_boolean(t)
+        or pa.types.is_string(t)
+        or pa.types.is_binary(t)
+        or pa.types.is_date32(t)
+        or pa.types.is_decimal128(t)
+    )
+
+
+def _duckdb_keeps_metadata(metadata) -> bool:
+    """True if dropping this schema metadata loses nothing.
+
+    pandas metadata describing only a RangeIndex is harmless to lose (the
+    merged file gets a fresh default index either way); anything else, such
+    as an index stored as a column, is not.
+    """
+    if not metadata:
+        return True
+    if set(metadata) != {b"pandas"}:
+        return False
+    index_columns = json.loads(metadata[b"pandas"]).get("index_columns", [])
+    return all(isinstance(col, dict) for col in index_columns)
+
+
+_SENTINEL = object()  # end-of-source marker on a prefetch queue
+
+
+def _prefetch_batches(
+    sources: list[str],
+    chunksize: int,
+    *,
+    max_workers: int = 4,
+    max_queued: int = 2,
+):
+    """
+    Yield batches from all sources in order while reading ahead in worker threads.
+
+    Each source gets its own bounded queue filled by one worker, so up to
+    ``max_workers * max_queued`` batches are held in memory at any time.
+    Consuming the queues in source order keeps the output deterministic; the
+    writer stays on the calling thread because the Parquet/CSV writers are not
+    thread-safe.
+
+    Args:
+        sources: Paths of the input files, in output order
+        chunksize: Maximum number of rows per batch
+        max_workers: Number of sources read concurrently
+        max_queued: Maximum number of batches buffered per source
+
+    Yields:
+        PyArrow Tables from the first source, then the second, etc.
+
+    Raises:
+        Any exception raised while reading a source is re-raised here.
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=max_queued) for _ in sources]
+
+    def _put(q: queue.Queue, item) -> bool:
+        # poll so a worker blocked on a full queue notices an aborted merge
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(src: str, q: queue.Queue) -> None:
+        if stop.is_set():  # merge aborted before this source was reached
+            return
+        try:
+            for tbl in _batch_reader(src, chunksize):
+                if not _put(q, tbl):
+                    return
+        except BaseException as exc:  # handed to the consumer thread
+            _put(q, exc)
+            return
+        _put(q, _SENTINEL)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        try:
+            for src, q in zip(sources, queues):
+                pool.submit(_produce, src, q)
+            for q in queues:
+                while True:
+                    item = q.get()
+                    if item is _SENTINEL:
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    yield item
+        finally:
+            stop.set()
+            # drop sources still waiting for a worker instead of opening them
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
 def _reconcile_schema(tbl: pa.Table, target: pa.Schema) -> pa.Table:
     """
     Reconcile a table's schema with a target schema by adding missing columns and casting types.
@@ -119,17 +305,21 @@ def _reconcile_schema(tbl: pa.Table, target: pa.Schema) -> pa.Table:
             tbl = tbl.append_column(
                 name, pa.nulls(len(tbl), type=target.field(name).type)
             )
-    # reorder & cast
-    cols = []
+    # reorder (zero-copy), then cast all columns in one schema-level call
+    tbl = tbl.select(target.names)
+    if tbl.schema == target:
+        return tbl
+    try:
+        return tbl.cast(target, safe=False)
+    except pa.ArrowInvalid:
+        pass
+    # slow path, only on failure: cast column by column to name the culprit
     for field in target:
-        arr = tbl[field.name]
-        if arr.type != field.type:
-            try:
-                arr = pc.cast(arr, target_type=field.type, safe=False)
-            except pa.ArrowInvalid as exc:
-                raise ExtractError(f"Cannot cast column {field.name}: {exc}") from exc
-        cols.append(arr)
-    return pa.table(cols, names=target.names)
+        try:
+            tbl[field.name].cast(field.type, safe=False)
+        except pa.ArrowInvalid as exc:
+            raise ExtractError(f"Cannot cast column {field.name}: {exc}") from exc
+    return tbl.cast(target, safe=False)
 
 
 def _open_writer(path: str, fmt: str, schema: pa.Schema):
@@ -166,17 +356,28 @@ def _open_writer(path: str, fmt: str, schema: pa.Schema):
     if fmt == "avro":
         if avro_reader is None:
             raise ImportError("fastavro needed for Avro.")
-        from fastavro import writer as avro_writer, parse_schema
+        from fastavro import parse_schema
+        from fastavro.write import Writer as AvroWriter
 
-        avro_schema = json.loads(schema.to_json())
+        # Convert and parse the schema once; the Writer emits the header
+        # a single time and appends one block per flush.
+        parsed_schema = parse_schema(_avro_schema_from_arrow(schema))
+        datetime_columns, string_columns = _avro_coerce_columns(schema)
         # Use FileSystemHandler to open file for Azure support
         fo = FileSystemHandler.open_file(path, "wb")
+        avro_out = AvroWriter(fo, parsed_schema)
 
         def _write(tbl):
-            records = tbl.to_pylist()
-            avro_writer(fo, parse_schema(avro_schema), records)
+            for rec in _iter_records(tbl):
+                avro_out.write(
+                    _coerce_avro_record(rec, datetime_columns, string_columns)
+                )
 
-        _write.close = lambda: fo.close()
+        def _close():
+            avro_out.flush()
+            fo.close()
+
+        _write.close = _close
         return _write
     if fmt == "xlsx":
         """Local filesystem Excel writer using pandas.ExcelWriter (openpyxl)."""
@@ -210,29 +411,69 @@ def _open_writer(path: str, fmt: str, schema: pa.Schema):
         return _write
     if fmt == "csv":
         header_written = False
-        # Use FileSystemHandler to open file for Azure support
-        fo = FileSystemHandler.open_file(path, "w", newline="", encoding="utf8")
+        # Use FileSystemHandler to open file for Azure support; binary mode
+        # skips the text layer since Arrow already produces UTF-8 bytes
+        fo = FileSystemHandler.open_file(path, "wb")
+        # Arrow's CSV writer has no text form for lists/structs/maps, so
+        # those cells are written as their Python string instead
+        nested = [i for i, f in enumerate(schema) if f.type.id in _NESTED_TYPE_IDS]
 
         def _write(tbl):
             nonlocal header_written
-            df = tbl.to_pandas()
-            df.to_csv(fo, index=False, header=not header_written, mode="a")
+            for i in nested:
+                values = [None if v is None else str(v) for v in tbl[i].to_pylist()]
+                tbl = tbl.set_column(
+                    i, tbl.field(i).name, pa.array(values, pa.string())
+                )
+            # Render the whole batch with Arrow's CSV writer, then issue one write
+            buf = pa.BufferOutputStream()
+            pacsv.write_csv(
+                tbl,
+                buf,
+                write_options=pacsv.WriteOptions(include_header=not header_written),
+            )
+            fo.write(buf.getvalue())
             header_written = True
 
         _write.close = lambda: fo.close()
         return _write
     if fmt == "jsonl":
         # Use FileSystemHandler to open file for Azure support
-        fo = FileSystemHandler.open_file(path, "w", encoding="utf8")
+        fo = FileSystemHandler.open_file(path, "wb")
 
         def _write(tbl):
-            for rec in tbl.to_pylist():
-                fo.write(json.dumps(rec, default=str) + "\n")
+            # One encoded write per record batch instead of one per record
+            for batch in tbl.to_batches(max_chunksize=_RECORD_BATCH_ROWS):
+                lines = [json.dumps(rec, default=str) for rec in _batch_records(batch)]
+                if lines:
+                    fo.write(("\n".join(lines) + "\n").encode("utf8"))
 
         _write.close = lambda: fo.close()
         return _write
 
 
+_RECORD_BATCH_ROWS = 8192  # rows converted to Python objects at a time
+
+
+def _batch_records(batch: pa.RecordBatch):
+    """
+    Yield the rows of a record batch as dicts, pivoting column-wise.
+
+    ``to_pydict`` converts each column in one call; zipping the resulting
+    lists avoids the per-row dict building done by ``to_pylist``.
+    """
+    names = batch.schema.names
+    cols = batch.to_pydict()
+    for row in zip(*(cols[name] for name in names)):
+        yield dict(zip(names, row))
+
+
+def _iter_records(tbl: pa.Table):
+    """Yield the rows of a table as dicts, one bounded record batch at a time."""
+    for batch in tbl.to_batches(max_chunksize=_RECORD_BATCH_ROWS):
+        yield from _batch_records(batch)
+
+
 def _batch_reader(path: str, chunksize: int):
     """
     Read data from a file in batches, yielding PyArrow Tables.
@@ -296,8 +537,6 @@ def _batch_reader(path: str, chunksize: int):
             for df in pd.read_csv(f, chunksize=chunksize):
                 yield pa.Table.from_pandas(df, preserve_index=False)
     elif fmt == "jsonl":
-        import json
-
         batch = []
         # Use FileSystemHandler to open file for Azure support
         with FileSystemHandler.open_file(path, "r", encoding="utf8") as fh:
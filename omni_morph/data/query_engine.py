@@ -3,9 +3,25 @@
 # ---------------------------------------------------------------------------
 
 import duckdb
+import functools
+import json
+import os
 import pathlib
-from typing import Optional, Literal, Union, Dict, Any
+import sys
+from typing import Optional, Literal, Union, Dict, Any, Tuple
 from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+try:
+    import fastavro
+except ImportError:  # only needed when the DuckDB Avro extension is missing
+    fastavro = None
+
+from omni_morph.data._io import _cached_avro_to_pyarrow_schema
+from omni_morph.data.filesystems import FileSystemHandler
 from omni_morph.data.formats import Format
 
 
@@ -13,6 +29,61 @@ class QueryError(RuntimeError):
     """Raised when SQL cannot be parsed / bound or during execution."""
 
 
+class QuerySession:
+    """One connection with one view of *source*, shared by several calls.
+
+    Pass it as ``session=`` to :func:`validate_sql` and :func:`query` so the
+    source is registered (and, for remote files, its footer fetched) once
+    rather than once per call. The view is created on first use, so a SQL
+    syntax error never opens the source.
+
+    Example:
+        >>> with QuerySession("sales.parquet") as session:
+        ...     if validate_sql(sql, "sales.parquet", session=session) is None:
+        ...         query(sql, "sales.parquet", session=session)
+    """
+
+    def __init__(
+        self,
+        source: Union[str, Path],
+        *,
+        fmt: Optional[Format] = None,
+        azure_credentials: Optional[Dict[str, Any]] = None,
+        lazy: bool = False,
+    ):
+        self.source = str(source)
+        self.fmt = fmt or Format.from_path(self.source)
+        self.lazy = lazy
+        self.con, self._avro_loaded = _open_connection(
+            self.fmt, self.source, azure_credentials
+        )
+        self._registered = False
+
+    def view(self):
+        """Return the connection, registering the source's view on first call."""
+        if not self._registered:
+            _register_source(
+                self.con,
+                self.fmt,
+                self.source,
+                lazy=self.lazy,
+                avro_loaded=self._avro_loaded,
+            )
+            self._registered = True
+        return self.con
+
+    def close(self) -> None:
+        # the connection owns its database, so closing it drops everything
+        # the session (or user SQL) created
+        self.con.close()
+
+    def __enter__(self) -> "QuerySession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 # ---------------------------------------------------------------------------
 # CORE API
 # ---------------------------------------------------------------------------
@@ -25,6 +96,7 @@ def query(
     fmt: Optional[Format] = None,
     return_type: Literal["arrow", "pandas", "stdout"] = "stdout",
     azure_credentials: Optional[Dict[str, Any]] = None,
+    session: Optional[QuerySession] = None,
 ) -> Optional[object]:
     """Run SQL queries against a data file (source) in various formats.
 
@@ -41,54 +113,45 @@ def query(
                     - "arrow": Returns a pyarrow.Table
                     - "pandas": Returns a pandas.DataFrame
                     - "stdout": Prints a Markdown table to stdout and returns None
+        azure_credentials: Optional Azure credentials for ``abfs[s]://`` sources.
+        session: Optional :class:`QuerySession` on *source* to run on; its view
+                 is reused and it stays open afterwards.
 
     Returns:
         Depending on return_type:
         - pyarrow.Table if return_type is "arrow"
         - pandas.DataFrame if return_type is "pandas"
         - None if return_type is "stdout" (results are printed to stdout)
+        - None for statements that return no rows (CREATE, SET, ...)
 
     Raises:
         QueryError: If the SQL query cannot be parsed, bound, or executed.
     """
-    con = duckdb.connect(
-        database=":memory:", config={"allow_unsigned_extensions": "true"}
-    )
-
-    # Convert path to string for internal functions
-    path_str = str(source)
-    resolved_fmt = fmt or Format.from_path(path_str)
-
-    # Install and load Avro extension if needed
-    if resolved_fmt == Format.AVRO:
-        _ensure_avro_extension(con)
-
-    # Load Azure extension if needed for Azure paths
-    if path_str.startswith(("abfss://", "abfs://")):
-        azure_loaded = _ensure_azure_extension(con)
-        if azure_loaded:
-            _configure_azure_credentials(con, azure_credentials)
-
-    _register_source(con, resolved_fmt, path_str)
-
+    own_session = session is None
+    if own_session:
+        session = QuerySession(source, fmt=fmt, azure_credentials=azure_credentials)
     try:
-        result = con.sql(sql)
-    except duckdb.Error as exc:
-        raise QueryError(str(exc)) from exc
-
-    if return_type == "arrow":
-        return result.arrow()
-    if return_type == "pandas":
-        return result.df()
+        con = session.view()
 
-    # markdown pretty-print to stdout
-    import pandas as pd
-    import sys
-
-    pd.set_option("display.max_columns", None)
-    df = result.df()
-    sys.stdout.write("\n" + df.to_markdown(index=False) + "\n")
-    return None
+        try:
+            result = con.sql(sql)
+        except duckdb.Error as exc:
+            raise QueryError(str(exc)) from exc
+        if result is None:
+            return None  # a statement with no result set, e.g. CREATE or SET
+
+        if return_type == "arrow":
+            # materialize before the connection closes
+            return result.to_arrow_table()
+        if return_type == "pandas":
+            return result.df()
+
+        # markdown pretty-print to stdout, one Arrow batch at a time
+        _write_markdown(result.to_arrow_reader(_MD_BATCH_ROWS), sys.stdout)
+        return None
+    finally:
+        if own_session:
+            session.close()
 
 
 # ---------------------------------------------------------------------------
@@ -102,49 +165,88 @@ def validate_sql(
     *,
     fmt: Optional[Format] = None,
     azure_credentials: Optional[Dict[str, Any]] = None,
-) -> Optional[str]:
+    with_schema: bool = False,
+    session: Optional[QuerySession] = None,
+) -> Union[Optional[str], Tuple[Optional[str], Optional[str]]]:
     """Validate SQL syntax against a data source without executing the query.
 
     This function parses and binds the SQL query against the specified data source
     without actually executing it. It's useful for checking SQL syntax and
     validating column references before running a potentially expensive query.
 
+    The query is parsed first, so a syntax error is reported without
+    opening the source (no footer or HEAD requests for remote files). It is
+    then bound with DuckDB's ``PREPARE`` on a new connection, which owns
+    both the temp view and the prepared statement, so without a *session*
+    neither outlives the call and nothing is cached per SQL.
+
     Args:
         sql: The SQL query to validate.
         source: A string or Path object pointing to the data file to validate against.
         fmt: Optional format specification. If None, the format is inferred
              from the file extension.
+        azure_credentials: Optional Azure credentials for ``abfs[s]://`` sources.
+        with_schema: If True, also return the view's schema (as JSON text) when
+             validation fails, read from the view DuckDB already bound, so
+             callers building an AI prompt need not open the file again.
+        session: Optional :class:`QuerySession` on *source* to validate on, so
+             a following :func:`query` reuses the view bound here. Without
+             one, a private session with a lazily read view is used.
 
     Returns:
         None if the SQL is valid, or a human-readable error string if validation fails.
+        With ``with_schema``, an ``(error, schema_json)`` tuple instead; the
+        schema is None when the SQL is valid or the view could not be described.
 
     Raises:
         No exceptions are raised as errors are returned as strings.
     """
-    con = duckdb.connect(
-        database=":memory:", config={"allow_unsigned_extensions": "true"}
-    )
-
-    # Convert path to string for internal functions
-    path_str = str(source)
-    resolved_fmt = fmt or Format.from_path(path_str)
+    own_session = session is None
+    if own_session:
+        # lazy views
+        session = QuerySession(
+            source, fmt=fmt, azure_credentials=azure_credentials, lazy=True
+        )
+    con = session.con
+    try:
+        # parse only: needs no view, so nothing is read from the source
+        try:
+            con.extract_statements(sql)
+        except duckdb.ParserException as exc:
+            if not with_schema:
+                return str(exc)
+            parse_error = str(exc)
+        else:
+            parse_error = None
+
+        session.view()
+        if parse_error is not None:
+            # the schema is wanted for the AI prompt, so the view is needed
+            return parse_error, _describe_view(con, session.source)
+
+        # PREPARE parses, binds and type-checks without rendering a plan
+        con.execute("PREPARE _omo_validate AS " + sql)
+        return (None, None) if with_schema else None
+    except duckdb.Error as exc:
+        if not with_schema:
+            return str(exc)
+        return str(exc), _describe_view(con, session.source)
+    finally:
+        if own_session:
+            session.close()
 
-    # Install and load Avro extension if needed
-    if resolved_fmt == Format.AVRO:
-        _ensure_avro_extension(con)
 
-    # Load Azure extension if needed for Azure paths
-    if path_str.startswith(("abfss://", "abfs://")):
-        azure_loaded = _ensure_azure_extension(con)
-        if azure_loaded:
-            _configure_azure_credentials(con, azure_credentials)
-
-    _register_source(con, resolved_fmt, path_str, lazy=True)  # lazy views
+def _describe_view(con, source):
+    """Schema of *source*'s view as ``get_schema``-style JSON, or None."""
     try:
-        con.execute("EXPLAIN " + sql)  # parse & bind only
-        return None
-    except duckdb.Error as exc:
-        return str(exc)
+        rows = con.execute(f"DESCRIBE {_sql_ident(_view_name(source))}").fetchall()
+    except duckdb.Error:
+        return None  # the view itself failed to register
+    fields = [
+        {"name": name, "type": typ, "nullable": null == "YES"}
+        for name, typ, null, *_ in rows
+    ]
+    return json.dumps({"fields": fields}, indent=2)
 
 
 # ---------------------------------------------------------------------------
@@ -175,7 +277,8 @@ def ai_suggest(
         ImportError: If the OpenAI package is not installed.
         RuntimeError: If the OPENAI_API_KEY environment variable is not set.
     """
-    import os
+    # openai is only needed on this (network-bound) path, so it isn't
+    # imported with the module
     from openai import OpenAI
 
     # Initialize the OpenAI client
@@ -214,11 +317,78 @@ def ai_suggest(
     return completion.choices[0].message.content.strip()
 
 
+def set_threads(threads: Optional[int]) -> None:
+    """Limit the DuckDB worker threads used by later queries.
+
+    Args:
+        threads: Number of threads, or None for DuckDB's default (one per core).
+    """
+    global _threads
+    _threads = threads
+
+
+# DuckDB thread count for new connections; None keeps DuckDB's default
+_threads: Optional[int] = None
+
+
 # ---------------------------------------------------------------------------
 # INTERNAL HELPERS
 # ---------------------------------------------------------------------------
 
 
+def _open_connection(fmt, source, azure_credentials):
+    """Return a new in-memory DuckDB connection set up for *fmt*/*source*.
+
+    Every call gets its own database, so tables, macros and settings created
+    by user SQL end with it. Only the outcome of the extension probes and
+    installs is kept between calls (see :func:`_load_extension`); loading an
+    installed extension and applying Azure settings is cheap.
+
+    Returns:
+        tuple: ``(connection, avro_loaded)``; ``avro_loaded`` is None for
+        non-Avro sources.
+    """
+    config = {"allow_unsigned_extensions": "true"}
+    if _threads:
+        config["threads"] = _threads
+    con = duckdb.connect(database=":memory:", config=config)
+
+    # Install and load Avro extension if needed
+    avro_loaded = (
+        _load_extension(con, "avro", _ensure_avro_extension)
+        if fmt == Format.AVRO
+        else None
+    )
+
+    # Load Azure extension if needed for Azure paths
+    if source.startswith(("abfss://", "abfs://")):
+        if _load_extension(con, "azure", _ensure_azure_extension):
+            _configure_azure_credentials(con, azure_credentials)
+
+    return con, avro_loaded
+
+
+# Whether each extension could be installed and loaded, by name
+_extensions_ok: Dict[str, bool] = {}
+
+
+def _load_extension(con, name, ensure):
+    """Load extension *name* into *con*, probing or installing it only once.
+
+    The first call runs *ensure* (which may download the extension); later
+    connections just ``LOAD`` it, or skip it if it was unavailable.
+    """
+    ok = _extensions_ok.get(name)
+    if ok is None:
+        ok = _extensions_ok[name] = ensure(con)
+    elif ok:
+        try:
+            con.execute(f"LOAD {name}")
+        except duckdb.Error:
+            return False
+    return ok
+
+
 def _ensure_avro_extension(con):
     """Ensure the Avro extension is installed and loaded in DuckDB.
 
@@ -263,6 +433,15 @@ def _configure_azure_credentials(con, azure_credentials):
     if not azure_credentials:
         return
 
+    # Read throughput settings of the azure extension
+    for option, setting in (
+        ("azure_read_concurrency", "azure_read_transfer_concurrency"),
+        ("azure_read_chunk_size", "azure_read_transfer_chunk_size"),
+        ("azure_read_buffer_size", "azure_read_buffer_size"),
+    ):
+        if azure_credentials.get(option):
+            con.execute(f"SET {setting}={int(azure_credentials[option])}")
+
     # Configure Azure credentials
     if azure_credentials.get("azure_connection_string"):
         con.execute(
@@ -314,7 +493,106 @@ def _ensure_azure_extension(con):
         return False
 
 
-def _register_source(con, fmt, source, *, lazy=False):
+def _sql_literal(value):
+    """Quote *value* as a SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _sql_ident(name):
+    """Quote *name* as a SQL identifier (file stems may contain ``-``, spaces)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _parquet_dataset(path):
+    """Return the Arrow dataset for a local Parquet file, reused until it changes."""
+    return _cached_parquet_dataset(path, os.stat(path).st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_parquet_dataset(path, mtime_ns):
+    return ds.dataset(path, format="parquet")
+
+
+# Rows fetched per Arrow batch when streaming Markdown to stdout
+_MD_BATCH_ROWS = 1024
+
+
+def _write_markdown(reader, out):
+    """Stream a ``pa.RecordBatchReader`` to *out* as a Markdown pipe table.
+
+    Each batch is cast to UTF-8 column-wise and written in one call, so
+    memory stays bounded by the batch size rather than the result size.
+    Cells are not padded to a common width since that would need the whole
+    result up front.
+    """
+    schema = reader.schema
+    header = " | ".join(_md_escape(name) for name in schema.names)
+    rule = "|".join(
+        "---:" if pa.types.is_integer(t) or pa.types.is_floating(t) else ":---"
+        for t in schema.types
+    )
+    out.write(f"\n| {header} |\n|{rule}|\n")
+    for batch in reader:
+        columns = [_md_column(col) for col in batch.columns]
+        out.write("".join(f"| {' | '.join(row)} |\n" for row in zip(*columns)))
+    out.write("\n")
+
+
+def _md_column(col):
+    """Render one Arrow column as a list of escaped Markdown cell strings."""
+    try:
+        if pa.types.is_boolean(col.type):
+            # Python's spelling, not Arrow's true/false
+            text = pc.if_else(col, "True", "False")
+        else:
+            text = pc.cast(col, pa.string())
+        if pa.types.is_timestamp(col.type) or pa.types.is_time(col.type):
+            # 07:55:29 rather than 07:55:29.000000000; real fractions stay
+            text = pc.replace_substring_regex(text, r"\.0+(Z?)$", r"\1")
+    except (pa.ArrowNotImplementedError, pa.ArrowInvalid):
+        # nested types have no string cast: fall back to Python's repr
+        text = pa.array(
+            [None if v is None else str(v) for v in col.to_pylist()], pa.string()
+        )
+    text = pc.fill_null(text, "")
+    text = pc.replace_substring(text, "|", "\\|")
+    text = pc.replace_substring(text, "\n", " ")
+    return text.to_pylist()
+
+
+def _md_escape(value):
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+# Rows per record batch when streaming Avro through the fastavro fallback
+_AVRO_BATCH_ROWS = 8192
+
+
+def _avro_batch(records, arrow_schema):
+    """Convert one buffer of fastavro records to a ``pa.RecordBatch``.
+
+    The translated *arrow_schema* is used when it fits; logical types the
+    translation doesn't cover fall back to Arrow's own inference.
+    """
+    if arrow_schema is not None:
+        try:
+            return pa.RecordBatch.from_pylist(records, schema=arrow_schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    return pa.RecordBatch.from_pylist(records)
+
+
+def _view_name(source):
+    """Name of the view a source is exposed as: its file stem."""
+    # For Azure paths, we need to use the full path as the source
+    # but still extract just the filename for the view name
+    if source.startswith(("abfss://", "abfs://")):
+        # Extract the filename from the Azure path
+        return source.split("/")[-1].split(".")[0]
+    return pathlib.Path(source).stem
+
+
+def _register_source(con, fmt, source, *, lazy=False, avro_loaded=None):
     """Create DuckDB views for the specified data file.
 
     This internal helper function registers a data file as a DuckDB view.
@@ -326,46 +604,49 @@ def _register_source(con, fmt, source, *, lazy=False):
         source: Path to the source file as a string.
         lazy: If True, only reads headers/metadata for schema inference without
                loading the full data. Useful for validation purposes.
+        avro_loaded: Result of an earlier Avro extension probe on this
+               connection; None probes again.
 
     Raises:
         QueryError: If the source file format is unsupported.
     """
-    # For Azure paths, we need to use the full path as the source
-    # but still extract just the filename for the view name
-    if source.startswith(("abfss://", "abfs://")):
-        # Extract the filename from the Azure path
-        name = source.split("/")[-1].split(".")[0]
-    else:
-        p = pathlib.Path(source)
-        name = p.stem
+    name = _view_name(source)
+    view = _sql_ident(name)
+    src = _sql_literal(source)
 
     if fmt == Format.PARQUET:
-        # read_parquet doesn't scan the whole file until execution time
-        con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{source}')")
+        if source.startswith(("abfss://", "abfs://")):
+            # read_parquet doesn't scan the whole file until execution time
+            con.execute(f"CREATE TEMP VIEW {view} AS SELECT * FROM read_parquet({src})")
+        else:
+            # Replacement scan over a cached Arrow dataset: no SQL to parse,
+            # and DuckDB pushes projections/filters into the dataset scan
+            con.register(name, _parquet_dataset(source))
 
     elif fmt == Format.CSV:
         # sample=1 forces only header inference when lazy=True
         sample_clause = ", sample_size=1" if lazy else ""
         con.execute(
-            f"CREATE VIEW {name} AS "
-            f"SELECT * FROM read_csv_auto('{source}'{sample_clause})"
+            f"CREATE TEMP VIEW {view} AS "
+            f"SELECT * FROM read_csv_auto({src}{sample_clause})"
         )
 
     elif fmt == Format.JSON:
         con.execute(
-            f"CREATE VIEW {name} AS "
-            f"SELECT * FROM read_json_auto('{source}', maximum_object_size=131072)"
+            f"CREATE TEMP VIEW {view} AS "
+            f"SELECT * FROM read_json_auto({src}, maximum_object_size=131072)"
         )
 
     elif fmt == Format.AVRO:
         # Try to use DuckDB's native Avro support via the community extension first
-        avro_extension_loaded = _ensure_avro_extension(con)
+        if avro_loaded is None:
+            avro_loaded = _load_extension(con, "avro", _ensure_avro_extension)
 
-        if avro_extension_loaded:
+        if avro_loaded:
             # Use DuckDB's native Avro support
             try:
                 con.execute(
-                    f"CREATE VIEW {name} AS SELECT * FROM read_avro('{source}')"
+                    f"CREATE TEMP VIEW {view} AS SELECT * FROM read_avro({src})"
                 )
                 return
             except duckdb.Error:
@@ -373,47 +654,57 @@ def _register_source(con, fmt, source, *, lazy=False):
                 pass
 
         # Fall back to fastavro
+        if fastavro is None:
+            raise QueryError(
+                "The fastavro package is required for Avro support: "
+                "No module named 'fastavro'"
+            )
         try:
-            import fastavro
-            import pandas as pd
-            import pyarrow as pa
-
-            # Read the Avro file using fastavro
-            records = []
-
             # Handle both local and Azure paths
             if source.startswith(("abfss://", "abfs://")):
-                from omni_morph.data.filesystems import FileSystemHandler
-
-                with FileSystemHandler.open_file(source, "rb") as f:
-                    reader = fastavro.reader(f)
-                    if not lazy:
-                        records = list(reader)
-                    schema = reader.schema
+                opener = FileSystemHandler.open_file
             else:
-                with open(str(source), "rb") as f:
-                    reader = fastavro.reader(f)
-                    if not lazy:
-                        records = list(reader)
-                    schema = reader.schema
-
-            # If lazy loading, just create an empty DataFrame with the schema
-            if lazy and not records:
-                # Create an empty DataFrame with the correct schema
-                fields = schema.get("fields", [])
-                empty_data = {field["name"]: [] for field in fields}
-                df = pd.DataFrame(empty_data)
+                opener = open
+
+            with opener(str(source), "rb") as f:
+                reader = fastavro.reader(f)
+
+                # Translate the Avro schema up front so Arrow skips type inference
+                try:
+                    arrow_schema = _cached_avro_to_pyarrow_schema(reader.writer_schema)
+                except ValueError:
+                    arrow_schema = None
+
+                # Stream fixed-size record batches so only one batch of
+                # Python dicts is alive at a time
+                batches = []
+                if not lazy:
+                    buf = []
+                    for rec in reader:
+                        buf.append(rec)
+                        if len(buf) >= _AVRO_BATCH_ROWS:
+                            batches.append(_avro_batch(buf, arrow_schema))
+                            buf = []
+                    if buf:
+                        batches.append(_avro_batch(buf, arrow_schema))
+
+            # Build the Arrow table straight from the batches (no pandas)
+            if not batches:
+                table = (
+                    arrow_schema.empty_table()
+                    if arrow_schema is not None
+                    else pa.table({})
+                )
             else:
-                df = pd.DataFrame(records)
+                # batches only differ when schema inference kicked in
+                table = pa.concat_tables(
+                    [pa.Table.from_batches([b]) for b in batches],
+                    promote_options="permissive",
+                )
 
-            # Convert to PyArrow table and register with DuckDB
-            table = pa.Table.from_pandas(df)
+            # Register the Arrow table with DuckDB
             con.register(name, table)
             return
-        except ImportError as imp_err:
-            raise QueryError(
-                f"The fastavro package is required for Avro support: {str(imp_err)}"
-            ) from imp_err
         except Exception as exc:
             raise QueryError(
                 f"Failed to read Avro file using fastavro: {str(exc)}"
@@ -423,10 +714,6 @@ def _register_source(con, fmt, source, *, lazy=False):
         # ------------------------------------------------------------------
         # Excel via pandas -> PyArrow -> DuckDB view
         # ------------------------------------------------------------------
-        import pandas as pd
-        import pyarrow as pa
-        from omni_morph.data.filesystems import FileSystemHandler
-
         try:
             if lazy:
                 df = FileSystemHandler.read_excel(source, nrows=0)
@@ -1,14 +1,25 @@
 from __future__ import annotations
+import csv
+from concurrent.futures import ThreadPoolExecutor
+import io
+import itertools
+import json
+import math
+import mmap
+import os
 import random
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.json as pajson
 import pyarrow.parquet as pq
 
 try:
-    from fastavro import reader as avro_reader
+    from fastavro import block_reader as avro_block_reader, reader as avro_reader
 except ImportError:  # fastavro is optional until Avro is actually used
-    avro_reader = None
+    avro_reader = avro_block_reader = None
 
 from .exceptions import ExtractError
 from .filesystems import FileSystemHandler
@@ -17,6 +28,10 @@ from .filesystems import FileSystemHandler
 #  PARQUET SAMPLING (efficient row-group aware)
 # ---------------------------------------------------------------------------
 
+# Above this keep-probability a boolean filter (one sequential scan) beats
+# gathering the chosen rows with take()
+_DENSE_FRACTION = 0.05
+
 
 def parquet_sample(
     path: str,
@@ -32,63 +47,297 @@ def parquet_sample(
     # Create ParquetFile using fsspec filesystem
     pfile = pq.ParquetFile(fs_path, filesystem=fs)
     total_rows = pfile.metadata.num_rows
+    # ``limit`` is kept for signature parity with streaming_sample; the
+    # row-group read below is already minimal regardless of file size.
 
-    # Get file size using FileSystemHandler
-    file_info = FileSystemHandler.get_file_info(path)
-    file_size = file_info.get("size", 0)
+    # ---------- dense fraction: one sequential filter pass --------------------
+    if fraction is not None and fraction >= _DENSE_FRACTION:
+        mask = _bernoulli_mask(rng, total_rows, fraction)
+        if not mask.any():
+            return pa.table({})  # empty sample
+        return pfile.read().filter(pa.array(mask))
 
     # ---------- choose indices ------------------------------------------------
+    chosen_idx = _choose_indices(total_rows, n, fraction, rng, replace)
+    if chosen_idx.size == 0:
+        return pa.table({})  # empty sample
+
+    # ---------- read only the row-groups that hold a sampled row -------------
+    rg_meta = pfile.metadata.row_group
+    rg_rows = np.array(
+        [rg_meta(rg).num_rows for rg in range(pfile.num_row_groups)], dtype=np.int64
+    )
+    rg_stop = np.cumsum(rg_rows)
+
+    # Map each (sorted) selected index to its row-group and in-group offset,
+    # then split the offsets into one run per row-group
+    rg_ids = np.searchsorted(rg_stop, chosen_idx, side="right")
+    local = chosen_idx - (rg_stop - rg_rows)[rg_ids]
+    needed_rgs, first = np.unique(rg_ids, return_index=True)
+    by_rg_offset = np.split(local, first[1:])
+
+    if len(needed_rgs) == 1:
+        return _take_row_group(pfile, int(needed_rgs[0]), by_rg_offset[0])
+
+    # Fan the row-group reads out over threads: Arrow releases the GIL while
+    # decoding, and on Azure each read is a separate, latency-bound request.
+    # Every task opens its own reader from the already-parsed footer, since
+    # a ParquetFile isn't safe to share across threads.
+    def read_one(rg, offsets):
+        reader = pq.ParquetFile(fs_path, filesystem=fs, metadata=pfile.metadata)
+        return _take_row_group(reader, rg, offsets)
+
+    with ThreadPoolExecutor(max_workers=min(8, len(needed_rgs))) as ex:
+        partial = list(ex.map(read_one, needed_rgs.tolist(), by_rg_offset))
+    return pa.concat_tables(partial)
+
+
+# Rows decoded per batch when streaming a dense Parquet sample
+_PARQUET_STREAM_ROWS = 1 << 16
+
+
+def parquet_sample_batches(
+    path: str, fraction: float, rng: random.Random
+) -> Iterator[pa.Table]:
+    """Stream a Bernoulli sample of a Parquet file one filtered batch at a time.
+
+    Draws the keep-mask from the same generator sequence as
+    :func:`parquet_sample`'s dense path, so a given seed selects the same
+    rows, but never holds more than one decoded batch in memory. Batches
+    left empty by the filter are skipped.
+    """
+    fs, fs_path = FileSystemHandler.get_fs_and_path(path)
+    pfile = pq.ParquetFile(fs_path, filesystem=fs)
+    gen = np.random.default_rng(rng.getrandbits(64))
+    for batch in pfile.iter_batches(batch_size=_PARQUET_STREAM_ROWS):
+        mask = gen.random(batch.num_rows) < fraction
+        if mask.any():
+            yield pa.Table.from_batches([batch.filter(pa.array(mask))])
+
+
+def _take_row_group(pfile: pq.ParquetFile, rg: int, offsets: np.ndarray) -> pa.Table:
+    """Read row-group *rg* and keep the rows at the in-group *offsets*."""
+    return pfile.read_row_group(rg).take(pa.array(offsets, type=pa.int64()))
+
+
+def _choose_indices(
+    total_rows: int,
+    n: Optional[int],
+    fraction: Optional[float],
+    rng: random.Random,
+    replace: bool,
+) -> np.ndarray:
+    """Pick the sorted row positions for a sample of a *total_rows* table."""
     if fraction is not None:
-        # keep each row with probability p
-        chosen_idx = [i for i in range(total_rows) if rng.random() < fraction]
+        # keep each row with probability p (flatnonzero is already sorted)
+        return np.flatnonzero(_bernoulli_mask(rng, total_rows, fraction))
+    if replace:
+        chosen_idx = [rng.randrange(total_rows) for _ in range(n)]
+    elif n > total_rows:
+        print(
+            f"Warning: Requested {n} samples but file only contains {total_rows} rows. Returning all rows."
+        )
+        chosen_idx = list(range(total_rows))
     else:
-        if replace:
-            chosen_idx = [rng.randrange(total_rows) for _ in range(n)]
-        else:
-            if n > total_rows:
-                print(
-                    f"Warning: Requested {n} samples but file only contains {total_rows} rows. Returning all rows."
-                )
-                chosen_idx = list(range(total_rows))
-            else:
-                chosen_idx = rng.sample(range(total_rows), n)
+        chosen_idx = rng.sample(range(total_rows), n)
+    return np.sort(np.asarray(chosen_idx, dtype=np.int64))
 
-    if not chosen_idx:
+
+def _sample_table(
+    tbl: pa.Table,
+    n: Optional[int],
+    fraction: Optional[float],
+    rng: random.Random,
+    replace: bool,
+) -> pa.Table:
+    """Sample rows of an in-memory Arrow table by position."""
+    if fraction is not None and fraction >= _DENSE_FRACTION:
+        mask = _bernoulli_mask(rng, tbl.num_rows, fraction)
+        return tbl.filter(pa.array(mask)) if mask.any() else pa.table({})
+
+    chosen_idx = _choose_indices(tbl.num_rows, n, fraction, rng, replace)
+    if chosen_idx.size == 0:
         return pa.table({})  # empty sample
+    return tbl.take(pa.array(chosen_idx, type=pa.int64()))
 
-    chosen_idx.sort()
 
-    # ---------- small file? just read once -----------------------------------
+def _bernoulli_mask(rng: random.Random, size: int, fraction: float) -> np.ndarray:
+    """Keep-mask of *size* rows, each True with probability *fraction*.
+
+    The NumPy generator is seeded from *rng*, so a seeded ``random.Random``
+    still yields a reproducible sample.
+    """
+    gen = np.random.default_rng(rng.getrandbits(64))
+    return gen.random(size) < fraction
+
+
+# ---------------------------------------------------------------------------
+#  JSONL SAMPLING (Arrow parser for small files)
+# ---------------------------------------------------------------------------
+
+
+def jsonl_sample(
+    path: str,
+    n: Optional[int],
+    fraction: Optional[float],
+    rng: random.Random,
+    replace: bool,
+    limit: int,
+) -> pa.Table:
+    # Small files: parse once with Arrow's multithreaded JSON reader and
+    # sample by position, skipping the per-line Python dict round-trip
+    file_size = FileSystemHandler.get_file_info(path).get("size", 0)
     if file_size < limit:
-        tbl = pfile.read()
-        return tbl.take(pa.array(chosen_idx, type=pa.int64()))
+        try:
+            with FileSystemHandler.open_file(path, "rb") as fo:
+                tbl = pajson.read_json(fo)
+                temporal = [f.name for f in tbl.schema if pa.types.is_temporal(f.type)]
+                if temporal:
+                    # re-read with those fields pinned to strings, as
+                    # json.loads leaves them on the large-file paths
+                    fo.seek(0)
+                    parse_options = pajson.ParseOptions(
+                        explicit_schema=pa.schema(
+                            [(name, pa.string()) for name in temporal]
+                        ),
+                        unexpected_field_behavior="infer",
+                    )
+                    tbl = pajson.read_json(fo, parse_options=parse_options)
+        except pa.ArrowInvalid:
+            tbl = None  # rows Arrow can't unify; use the Python parser
+        if tbl is not None:
+            return _sample_table(tbl, n, fraction, rng, replace)
+
+    # Large local files: index line offsets once, then parse only the
+    # sampled lines instead of every record in the stream
+    if not path.startswith(("abfss://", "abfs://")):
+        starts, ends = _jsonl_line_index(path)
+        chosen_idx = _choose_indices(len(starts), n, fraction, rng, replace)
+        if chosen_idx.size == 0:
+            return pa.table({})  # empty sample
+        with (
+            open(path, "rb") as fh,
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            lines = [
+                mm[start:end]
+                for start, end in zip(
+                    starts[chosen_idx].tolist(), ends[chosen_idx].tolist()
+                )
+            ]
+        rows = [json.loads(line) for line in lines]
+        return _records_to_table(rows)
 
-    # ---------- large file: read minimal row-groups ---------------------------
-    rg_meta = pfile.metadata.row_group
-    rg_boundaries = []
-    offset = 0
-    for rg in range(pfile.num_row_groups):
-        rows_here = rg_meta(rg).num_rows
-        rg_boundaries.append((offset, offset + rows_here, rg))
-        offset += rows_here
-
-    # Determine which row-groups contain each selected index
-    needed_rgs = set()
-    by_rg_offset = {}
-    for idx in chosen_idx:
-        for start, stop, rg in rg_boundaries:
-            if start <= idx < stop:
-                needed_rgs.add(rg)
-                by_rg_offset.setdefault(rg, []).append(idx - start)
-                break
-
-    # Read only those row-groups
-    partial = []
-    for rg in sorted(needed_rgs):
-        rg_tbl = pfile.read_row_group(rg)
-        offsets = by_rg_offset[rg]
-        partial.append(rg_tbl.take(pa.array(offsets, type=pa.int64())))
-    return pa.concat_tables(partial)
+    return streaming_sample(iter_jsonl(path), n, fraction, rng, replace, limit)
+
+
+# Bytes scanned per step while building a JSONL newline index
+_INDEX_BLOCK = 64 << 20
+
+# Largest index (16 bytes per line) kept in memory between calls; bigger
+# ones are rebuilt on each call rather than pinned for the process lifetime
+_INDEX_CACHE_BYTES = 256 << 20
+
+# The most recent small-enough index, keyed by (path, mtime_ns, size) so a
+# rewritten file is indexed again
+_index_cache: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+
+# Bytes ``bytes.strip()`` treats as whitespace
+_WHITESPACE = np.array([9, 10, 11, 12, 13, 32], dtype=np.uint8)
+
+
+def _jsonl_line_index(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(starts, ends)`` byte offsets of the non-blank lines in *path*."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    index = _index_cache.get(key)
+    if index is None:
+        index = _build_newline_index(path, st.st_size)
+        _index_cache.clear()
+        if index[0].nbytes + index[1].nbytes <= _INDEX_CACHE_BYTES:
+            _index_cache[key] = index
+    return index
+
+
+def _build_newline_index(path: str, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Scan *path* for newlines with NumPy over an mmap, block by block.
+
+    Lines that are empty or hold only whitespace are left out, the same
+    lines ``iter_jsonl`` skips.
+    """
+    if size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    newlines = []
+    with (
+        open(path, "rb") as fh,
+        mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        for offset in range(0, size, _INDEX_BLOCK):
+            block = np.frombuffer(
+                mm,
+                dtype=np.uint8,
+                count=min(_INDEX_BLOCK, size - offset),
+                offset=offset,
+            )
+            newlines.append(np.flatnonzero(block == 10) + offset)
+            del block  # release the buffer export before the mmap closes
+
+        ends = np.concatenate(newlines).astype(np.int64)
+        if ends.size == 0 or ends[-1] != size - 1:
+            ends = np.append(ends, size)  # last line has no trailing newline
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        keep = ends > starts
+
+        # a line is blank only if it starts with whitespace, so just those
+        # few candidates need a full look
+        data = np.frombuffer(mm, dtype=np.uint8)
+        first = np.zeros(starts.size, dtype=bool)
+        first[keep] = np.isin(data[starts[keep]], _WHITESPACE)
+        del data
+        for i in np.flatnonzero(first).tolist():
+            keep[i] = bool(mm[starts[i] : ends[i]].strip())
+
+    return starts[keep], ends[keep]
+
+
+# ---------------------------------------------------------------------------
+#  CSV SAMPLING (Arrow parser for small files)
+# ---------------------------------------------------------------------------
+
+
+def csv_sample(
+    path: str,
+    n: Optional[int],
+    fraction: Optional[float],
+    rng: random.Random,
+    replace: bool,
+    limit: int,
+) -> pa.Table:
+    # Small files: Arrow's block-parallel CSV reader builds the columns
+    # directly, so sampling is a positional take with no per-row dicts.
+    # Every column is read as text, as iter_csv returns it for large files.
+    file_size = FileSystemHandler.get_file_info(path).get("size", 0)
+    if file_size < limit:
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+        try:
+            with FileSystemHandler.open_file(path, "rb") as fo:
+                with pacsv.open_csv(fo, read_options=read_options) as reader:
+                    names = reader.schema.names
+                fo.seek(0)
+                convert_options = pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in names}
+                )
+                tbl = pacsv.read_csv(
+                    fo, read_options=read_options, convert_options=convert_options
+                )
+        except pa.ArrowInvalid:
+            tbl = None  # ragged rows Arrow rejects; use the Python parser
+        if tbl is not None:
+            return _sample_table(tbl, n, fraction, rng, replace)
+
+    return streaming_sample(iter_csv(path), n, fraction, rng, replace, limit)
 
 
 # ---------------------------------------------------------------------------
@@ -97,16 +346,22 @@ def parquet_sample(
 
 
 def streaming_sample(
-    iterator: Iterable[dict],
+    iterator: Iterable[dict] | Iterable[list[dict]],
     n: Optional[int],
     fraction: Optional[float],
     rng: random.Random,
     replace: bool,
     limit: int,
+    *,
+    batched: bool = False,
 ) -> pa.Table:
+    # ``batched=True`` means the iterator yields lists of records (e.g.
+    # iter_avro_batches), so per-batch work replaces per-record work
+    records = itertools.chain.from_iterable(iterator) if batched else iterator
+
     # Cheap size test: if the underlying file is small, load into memory first
     if hasattr(iterator, "__len__") and (getattr(iterator, "_size_bytes", 0) < limit):
-        data = list(iterator)
+        data = list(records)
         return sample_in_memory(data, n, fraction, rng, replace)
 
     # ---- streaming path -----------------------------------------------------
@@ -114,19 +369,42 @@ def streaming_sample(
         raise ExtractError("`with_replacement=True` not supported for large files.")
 
     if n is not None:  # reservoir, one pass, O(n) memory
-        reservoir: list[dict] = []
-        for i, rec in enumerate(iterator):
-            if i < n:
-                reservoir.append(rec)
-            else:
-                j = rng.randint(0, i)
-                if j < n:
-                    reservoir[j] = rec
-        data = reservoir
+        data = _reservoir_sample(iter(records), n, rng)
+    elif batched:  # fraction sampling, one Bernoulli mask per batch
+        data = []
+        for batch in iterator:
+            mask = _bernoulli_mask(rng, len(batch), fraction)
+            data.extend(itertools.compress(batch, mask.tolist()))
     else:  # fraction sampling
-        data = [rec for rec in iterator if rng.random() < fraction]
+        data = [rec for rec in records if rng.random() < fraction]
+
+    return _records_to_table(data)
+
+
+_MISSING = object()
 
-    return pa.Table.from_pylist(data) if data else pa.table({})
+
+def _reservoir_sample(it, n: int, rng: random.Random) -> list[dict]:
+    """Li's Algorithm L reservoir sample of *n* records from *it*.
+
+    Instead of drawing a random number for every record past the first *n*,
+    the gap to the next accepted record is drawn from a geometric
+    distribution and skipped with ``islice``, so only
+    ``O(n * (1 + log(N / n)))`` random draws are needed for a stream of N.
+    """
+    reservoir = list(itertools.islice(it, n))
+    if n == 0 or len(reservoir) < n:
+        return reservoir
+
+    # uniform draws in (0, 1] so the logs below stay finite
+    w = math.exp(math.log(1.0 - rng.random()) / n)
+    while True:
+        skip = int(math.log(1.0 - rng.random()) / math.log(1.0 - w))
+        rec = next(itertools.islice(it, skip, None), _MISSING)
+        if rec is _MISSING:
+            return reservoir
+        reservoir[rng.randrange(n)] = rec
+        w *= math.exp(math.log(1.0 - rng.random()) / n)
 
 
 def sample_in_memory(
@@ -137,7 +415,8 @@ def sample_in_memory(
     replace: bool,
 ) -> pa.Table:
     if fraction is not None:
-        sample = [row for row in data if rng.random() < fraction]
+        mask = _bernoulli_mask(rng, len(data), fraction)
+        sample = list(itertools.compress(data, mask.tolist()))
     else:
         if replace:
             sample = [rng.choice(data) for _ in range(n)]
@@ -150,7 +429,16 @@ def sample_in_memory(
             else:
                 sample = rng.sample(data, n)
 
-    return pa.Table.from_pylist(sample) if sample else pa.table({})
+    return _records_to_table(sample)
+
+
+def _records_to_table(records: list[dict]) -> pa.Table:
+    """Build an Arrow table from sampled records (empty sample -> empty table).
+
+    ``from_pylist`` already builds column-at-a-time from the first record's
+    keys; pivoting to per-column lists in Python first measured no faster.
+    """
+    return pa.Table.from_pylist(records) if records else pa.table({})
 
 
 # ---------------------------------------------------------------------------
@@ -163,32 +451,54 @@ def iter_avro(path: str):
         raise ImportError("fastavro is required (`pip install fastavro`).")
     # Use FileSystemHandler to handle both local and Azure paths
     with FileSystemHandler.open_file(path, "rb") as fo:
-        for rec in avro_reader(fo):
-            yield rec
+        for block in avro_block_reader(fo):
+            yield from block
 
 
-def iter_jsonl(path: str):
-    import json
+def iter_avro_batches(path: str, batch_size: int = 8192):
+    """Stream an Avro file as lists of up to *batch_size* records.
 
+    Whole Avro blocks are decoded at a time via fastavro's ``block_reader``
+    and regrouped into fixed-size batches for :func:`streaming_sample`.
+    """
+    if avro_reader is None:
+        raise ImportError("fastavro is required (`pip install fastavro`).")
     # Use FileSystemHandler to handle both local and Azure paths
-    with FileSystemHandler.open_file(path, "r", encoding="utf8") as fh:
+    with FileSystemHandler.open_file(path, "rb") as fo:
+        batch: list[dict] = []
+        for block in avro_block_reader(fo):
+            batch.extend(block)
+            while len(batch) >= batch_size:
+                yield batch[:batch_size]
+                batch = batch[batch_size:]
+        if batch:
+            yield batch
+
+
+def iter_jsonl(path: str):
+    # Use FileSystemHandler to handle both local and Azure paths; json.loads
+    # decodes the UTF-8 bytes itself, so skip the text-mode decode layer
+    with FileSystemHandler.open_file(path, "rb") as fh:
         for line in fh:
-            if line.strip():
+            if not line.isspace():
                 yield json.loads(line)
 
 
 def iter_csv(path: str):
-    import csv
-    import io
-
     # Use FileSystemHandler to handle both local and Azure paths
     with FileSystemHandler.open_file(path, "r", newline="", encoding="utf8") as fh:
-        # Ensure we have a proper file-like object for csv.DictReader
+        # Ensure we have a proper file-like object for csv.reader
         if not hasattr(fh, "read") or not callable(fh.read):
             fh = io.StringIO(fh.read())
-        rdr = csv.DictReader(fh)
+        # csv.reader + zip with a bound header skips DictReader's per-row
+        # bookkeeping
+        rdr = csv.reader(fh)
+        header = next(rdr, None)
+        if header is None:
+            return
         for row in rdr:
-            yield row
+            if row:  # DictReader skips blank rows too
+                yield dict(zip(header, row))
 
 
 def iter_xlsx(path: str, *, sheet_name: int | str = 0):
@@ -206,8 +516,6 @@ def iter_xlsx(path: str, *, sheet_name: int | str = 0):
     Yields:
         dict: Row records compatible with :pyfunc:`streaming_sample`.
     """
-    from omni_morph.data.filesystems import FileSystemHandler
-
     df = FileSystemHandler.read_excel(path, sheet_name=sheet_name)
     for rec in df.to_dict(orient="records"):
         yield rec
@@ -1,21 +1,33 @@
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Union, Dict, List, Tuple
+from typing import Optional, Union, Dict, Iterable, Iterator, List, Tuple
+import heapq
 import math
-import io
+from operator import itemgetter
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.json as pajson
 import pyarrow.parquet as pq
 
 from fastdigest import TDigest  # Required dependency
 
 try:
-    from fastavro import reader as avro_reader  # pip install fastavro
+    from fastavro import block_reader as avro_block_reader  # pip install fastavro
 except ImportError:
-    avro_reader = None
+    avro_block_reader = None
 
+try:
+    from datasketches import hll_sketch  # pip install datasketches
+except ImportError:
+    hll_sketch = None
+
+from omni_morph.data._io import _cached_avro_to_pyarrow_schema
 from omni_morph.data.exceptions import ExtractError
 from omni_morph.data.formats import Format
 from omni_morph.data.filesystems import FileSystemHandler
@@ -29,69 +41,258 @@ __all__ = ["get_stats"]
 @dataclass
 class _NumAgg:
     count: int = 0
-    mean: float = 0.0
-    M2: float = 0.0  # variance accumulator (not exposed yet)
+    sum: float = 0.0
+    sumsq: float = 0.0  # for variance (not exposed yet)
     minv: Union[float, None] = None
     maxv: Union[float, None] = None
-    td: Union[TDigest, None] = None
+    sample: Optional["_Reservoir"] = None  # feeds the t-digest at finish()
+    bounds_known: bool = False  # min/max already taken from file metadata
 
     def update(self, arr):
+        kept = []
         for v in arr:
             if v is None or (isinstance(v, float) and math.isnan(v)):
                 continue
-            # online mean / variance (Welford)
             self.count += 1
-            delta = v - self.mean
-            self.mean += delta / self.count
-            self.M2 += delta * (v - self.mean)
+            self.sum += v
+            self.sumsq += v * v
             self.minv = v if self.minv is None else min(self.minv, v)
             self.maxv = v if self.maxv is None else max(self.maxv, v)
-            if self.td is not None:
-                self.td.update(v)
+            kept.append(v)
+        if self.sample is not None and kept:
+            # one vectorised reservoir step for the whole call
+            self.sample.add(np.asarray(kept, dtype=np.float64))
+
+    def update_arrow(self, ca):
+        """Fold a whole Arrow column into the running aggregate.
+
+        Nulls (and NaNs, for floating columns) are dropped with one Arrow
+        mask, after which each chunk of a primitive column is viewed as a
+        NumPy array without copying.
+        """
+        if pa.types.is_floating(ca.type):
+            # the mask is null where ca is, and filter drops null selections
+            arr = pc.filter(ca, pc.invert(pc.is_nan(ca)))
+        else:
+            arr = pc.drop_null(ca) if ca.null_count else ca
+            if not pa.types.is_integer(arr.type):
+                arr = pc.cast(arr, pa.float64())  # bool, decimal, all-null columns
+        chunks = arr.chunks if isinstance(arr, pa.ChunkedArray) else [arr]
+        for chunk in chunks:
+            self._fold(chunk.to_numpy())
+
+    def update_array(self, values: np.ndarray):
+        """Fold a null-free NumPy array in with one-pass ufunc reductions."""
+        if values.dtype.kind == "f":
+            values = values[~np.isnan(values)]
+        self._fold(values)
+
+    def _fold(self, values: np.ndarray):
+        if not values.size:
+            return
+        f64 = values.astype(np.float64, copy=False)
+        self.count += values.size
+        self.sum += float(np.add.reduce(f64))
+        self.sumsq += float(np.dot(f64, f64))
+
+        if not self.bounds_known:
+            lo = np.minimum.reduce(values).item()
+            hi = np.maximum.reduce(values).item()
+            self.minv = lo if self.minv is None else min(self.minv, lo)
+            self.maxv = hi if self.maxv is None else max(self.maxv, hi)
+        if self.sample is not None:
+            self.sample.add(f64)
 
     def finish(self):
         median = None
-        if self.td is not None and not self.td.is_empty:
+        td = _create_tdigest() if self.sample and self.sample.seen else None
+        if td is not None:
+            td.batch_update(self.sample.values())
             # Use direct median() method if available, fallback to quantile(0.5)
             try:
-                median = self.td.median()
+                median = td.median()
             except AttributeError:
-                median = self.td.quantile(0.5)
+                median = td.quantile(0.5)
         return {
             "count": self.count,
             "min": self.minv,
             "max": self.maxv,
-            "mean": self.mean if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
             "median": median,
         }
 
 
+class _Reservoir:
+    """Fixed-size uniform sample of a numeric stream (Algorithm R).
+
+    Each batch is placed with one vectorised draw rather than a Python step
+    per value; the seed is fixed so repeated runs report the same median.
+    """
+
+    def __init__(self, k: int, seed: int = 0):
+        self.k = k
+        self.seen = 0
+        self._buf = np.empty(k, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values: np.ndarray) -> None:
+        fill = min(self.k - min(self.seen, self.k), values.size)
+        if fill:
+            self._buf[self.seen : self.seen + fill] = values[:fill]
+        rest = values[fill:]
+        if rest.size:
+            # item t (1-based) replaces slot j ~ U[0, t) when j < k; later
+            # items win on duplicate slots, exactly as the sequential loop
+            t = np.arange(self.seen + fill + 1, self.seen + values.size + 1)
+            j = self._rng.integers(0, t)
+            keep = j < self.k
+            self._buf[j[keep]] = rest[keep]
+        self.seen += values.size
+
+    def add_one(self, v) -> None:
+        self.add(np.array([v], dtype=np.float64))
+
+    def values(self) -> np.ndarray:
+        return self._buf[: min(self.seen, self.k)]
+
+
+class _HLL:
+    """HyperLogLog distinct counter on the fastest available backend.
+
+    Prefers the C++ ``datasketches`` sketch and falls back to the pure-Python
+    ``datasketch`` one; raises ImportError when neither is installed.
+    """
+
+    def __init__(self, lg_k: int = 12):  # 2**12 registers, ~1.6% error
+        if hll_sketch is not None:
+            self._sketch = hll_sketch(lg_k)
+            self._add = self._sketch.update
+            self._estimate = self._sketch.get_estimate
+        else:
+            from datasketch.hyperloglog import HyperLogLog
+
+            self._sketch = HyperLogLog(p=lg_k)
+            self._add = lambda s: self._sketch.update(s.encode())
+            self._estimate = self._sketch.count
+
+    def update(self, values: Iterable) -> None:
+        add = self._add
+        for v in values:
+            add(str(v))
+
+    def count(self) -> int:
+        return round(self._estimate())
+
+
+class _SpaceSaving:
+    """Space-Saving heavy hitters: approximate top-k counts in O(k) memory.
+
+    Counts are exact until more than ``k`` distinct items have been seen;
+    after that an evicted slot's count is inherited, so counts may
+    overestimate by at most the smallest tracked count.
+    """
+
+    def __init__(self, k: int = 64, seed: Iterable[Tuple[object, int]] = ()):
+        self.k = k
+        self.counts: Dict[object, int] = dict(seed)
+
+    def update(self, item, weight: int = 1) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += weight
+        elif len(counts) < self.k:
+            counts[item] = weight
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            counts[item] = counts.pop(victim) + weight
+
+    def most_common(self, n: int) -> List[Tuple[object, int]]:
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+
 @dataclass
 class _CatAgg:
-    counter: Counter = field(default_factory=Counter)
+    counter: Optional[Counter] = field(default_factory=Counter)
     hll: object = None
+    heavy: Optional[_SpaceSaving] = None
     max_card: int = 100_000  # switch to HLL if too many uniques
+    top_k: int = 64  # heavy-hitter slots kept once the Counter is dropped
+
+    def __post_init__(self):
+        # With the C++ backend the sketch runs alongside the Counter from the
+        # start (a few KB), so promotion only has to drop the Counter. The
+        # pure-Python fallback costs far more per key than the Counter, so it
+        # is started only once a column gets near max_card, seeded from the
+        # Counter's keys; most columns never get there.
+        self._sketch_from = 0 if hll_sketch is not None else self.max_card // 2
 
     def update(self, arr):
-        self.counter.update(("__NULL__" if v in (None, "") else v) for v in arr)
-        if len(self.counter) > self.max_card and self.hll is None:
-            try:
-                from datasketch.hyperloglog import HyperLogLog
+        keys = ["__NULL__" if v in (None, "") else v for v in arr]
+        if self.counter is not None:
+            self.counter.update(keys)
+        else:
+            for k in keys:
+                self.heavy.update(k)
+        self._track_cardinality(keys)
+
+    def update_arrow(self, ca):
+        """Count an Arrow column with ``value_counts`` instead of per-row hashing.
+
+        Only the (usually small) table of distinct values crosses into Python;
+        types without a ``value_counts`` kernel go through :meth:`update`.
+        Dictionary-encoded chunks are counted on their integer indices.
+        """
+        if pa.types.is_dictionary(ca.type):
+            chunks = ca.chunks if isinstance(ca, pa.ChunkedArray) else [ca]
+            for chunk in chunks:
+                vc = pc.value_counts(chunk.indices)
+                values = chunk.dictionary.take(vc.field("values"))
+                self._add_counts(values.to_pylist(), vc.field("counts").to_pylist())
+            return
+        try:
+            vc = pc.value_counts(ca)
+        except pa.ArrowNotImplementedError:
+            self.update(ca.to_pylist())
+            return
+        self._add_counts(vc.field("values").to_pylist(), vc.field("counts").to_pylist())
+
+    def _add_counts(self, values, counts):
+        keys = ["__NULL__" if k in (None, "") else k for k in values]
+        if self.counter is not None:
+            for k, c in zip(keys, counts):
+                self.counter[k] += c
+        else:
+            for k, c in zip(keys, counts):
+                self.heavy.update(k, c)
+        self._track_cardinality(keys)
 
-                self.hll = HyperLogLog()
-                self.hll.update(b"seed")  # warm-up
-                for k in self.counter:
-                    self.hll.update(str(k).encode())
+    def _track_cardinality(self, keys):
+        counter = self.counter
+        if self.hll is not None:
+            self.hll.update(set(keys))  # each distinct key once per call
+        elif len(counter) >= self._sketch_from:
+            try:
+                self.hll = _HLL()
             except ImportError:
-                pass  # stay with the Counter (memory ↑)
+                # no sketch backend: the Counter stays exact (memory ↑)
+                self._sketch_from = math.inf
+                return
+            self.hll.update(counter)  # everything seen so far, this call included
+        else:
+            return
+        if counter is not None and len(counter) > self.max_card:
+            self._promote()
 
-        if self.hll is not None:
-            for v in arr:
-                self.hll.update(str(v).encode())
+    def _promote(self):
+        """Drop the exact Counter, keeping the sketch plus heavy hitters."""
+        self.heavy = _SpaceSaving(self.top_k, self.counter.most_common(self.top_k))
+        self.counter = None
 
     def finish(self):
-        distinct = self.hll.count() if self.hll is not None else len(self.counter)
-        top5 = self.counter.most_common(5)
+        if self.counter is not None:
+            distinct, top5 = len(self.counter), self.counter.most_common(5)
+        else:
+            distinct, top5 = self.hll.count(), self.heavy.most_common(5)
         return {
             "distinct": distinct,
             "top5": [{"value": v, "count": c} for v, c in top5],
@@ -117,7 +318,8 @@ def get_stats(
     For numeric columns, it calculates min, max, mean, and approximate median (using TDigest).
     For categorical columns, it counts distinct values and identifies the top 5 categories.
 
-    Large files are processed by streaming, while small files use Arrow compute kernels directly.
+    Data is streamed through Arrow compute kernels batch by batch, so memory use
+    stays bounded regardless of file size.
 
     Args:
         path: A string or Path object pointing to the data file to analyze.
@@ -128,7 +330,8 @@ def get_stats(
         sample_size: Number of samples to use for t-digest reservoir sampling per column.
                     Set to 0 to disable median approximation.
         small_file_threshold: File size threshold in bytes below which the file
-                             is loaded entirely into memory.
+                             is loaded entirely into memory. Parquet files are
+                             always streamed in batches and ignore it.
 
     Returns:
         A dictionary mapping column names to their statistics. Each column's statistics
@@ -143,14 +346,8 @@ def get_stats(
 
     resolved_fmt = fmt or Format.from_path(path_str)
 
-    # Get file size using FileSystemHandler
-    file_info = FileSystemHandler.get_file_info(path_str)
-    size = file_info.get("size", 0)
-
     if resolved_fmt == Format.PARQUET:
-        return _stats_parquet(
-            path_str, columns, size, sample_size, small_file_threshold
-        )
+        return _stats_parquet(path_str, columns, sample_size)
     elif resolved_fmt == Format.AVRO:
         return _stats_avro(path_str, columns, sample_size, small_file_threshold)
     elif resolved_fmt == Format.CSV:
@@ -165,79 +362,176 @@ def get_stats(
 
 # ---------- Parquet --------------------------------------------------------
 
+_PARQUET_BATCH_ROWS = 1 << 18
+
 
 def _stats_parquet(
-    path: str, cols: Optional[List[str]], size: int, sample_size: int, limit: int
+    path: str, cols: Optional[List[str]], sample_size: int
 ) -> Dict[str, Dict]:
     # Use FileSystemHandler to handle both local and Azure paths
     fs, fs_path = FileSystemHandler.get_fs_and_path(path)
     pf = pq.ParquetFile(fs_path, filesystem=fs)
     if cols is None:
         cols = [f.name for f in pf.schema_arrow]
-    small = size < limit
 
     num_aggs, cat_aggs = _prep_aggs(pf.schema_arrow, cols, sample_size)
+    for name, (lo, hi) in _parquet_footer_bounds(pf, num_aggs).items():
+        agg = num_aggs[name]
+        agg.minv, agg.maxv, agg.bounds_known = lo, hi, True
+    dict_cols = _parquet_dictionary_columns(pf, cat_aggs)
+    if dict_cols:
+        # reopen on the parsed footer so those columns decode as dictionaries
+        pf = pq.ParquetFile(
+            fs_path, filesystem=fs, metadata=pf.metadata, read_dictionary=dict_cols
+        )
 
-    if small:
-        tbl = pf.read(columns=cols)
-        _update_aggs_from_table(tbl, num_aggs, cat_aggs)
-    else:
-        for rg in range(pf.num_row_groups):
-            tbl = pf.read_row_group(rg, columns=cols)
-            _update_aggs_from_table(tbl, num_aggs, cat_aggs)
+    # Each column owns its aggregator, so columns fold in parallel without
+    # locking; the Arrow/NumPy kernels doing the work release the GIL.
+    # pa.cpu_count() honours a --threads limit set via pa.set_cpu_count
+    workers = min(len(cols), pa.cpu_count())
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # Fixed-size batches rather than whole row-groups (often hundreds of
+        # MB) keep memory bounded, whatever the file size.
+        batches = pf.iter_batches(batch_size=_PARQUET_BATCH_ROWS, columns=cols)
+        _fold_batches(_prefetched(batches), num_aggs, cat_aggs, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     return _finish_aggs(num_aggs, cat_aggs)
 
 
+def _parquet_footer_bounds(
+    pf: pq.ParquetFile, names: Iterable[str]
+) -> Dict[str, Tuple[float, float]]:
+    """Fold per-row-group min/max statistics from the Parquet footer.
+
+    Only integer and floating columns whose statistics cover every
+    row-group are returned; anything else still needs its bounds scanned.
+    """
+    meta = pf.metadata
+    schema = pf.schema_arrow
+    wanted = {
+        n
+        for n in names
+        if pa.types.is_integer(schema.field(n).type)
+        or pa.types.is_floating(schema.field(n).type)
+    }
+    if not wanted or not meta.num_row_groups:
+        return {}
+
+    bounds: Dict[str, Tuple[float, float]] = {}
+    for rg in range(meta.num_row_groups):
+        group = meta.row_group(rg)
+        seen = set()
+        for j in range(group.num_columns):
+            col = group.column(j)
+            name = col.path_in_schema
+            if name not in wanted:
+                continue
+            st = col.statistics
+            if st is None or not st.has_min_max:
+                wanted.discard(name)
+                bounds.pop(name, None)
+                continue
+            seen.add(name)
+            if name in bounds:
+                lo, hi = bounds[name]
+                bounds[name] = (min(lo, st.min), max(hi, st.max))
+            else:
+                bounds[name] = (st.min, st.max)
+        # a row-group without a chunk for the column leaves it incomplete
+        for name in wanted - seen:
+            bounds.pop(name, None)
+        wanted &= seen
+    return bounds
+
+
+def _parquet_dictionary_columns(pf: pq.ParquetFile, names: Iterable[str]) -> List[str]:
+    """String/binary columns that are dictionary-encoded in every row-group.
+
+    Reading these back as Arrow dictionaries lets :class:`_CatAgg` count the
+    integer indices instead of hashing every value.
+    """
+    meta = pf.metadata
+    schema = pf.schema_arrow
+    wanted = {
+        n
+        for n in names
+        if pa.types.is_string(schema.field(n).type)
+        or pa.types.is_binary(schema.field(n).type)
+    }
+    if not wanted or not meta.num_row_groups:
+        return []
+    for rg in range(meta.num_row_groups):
+        group = meta.row_group(rg)
+        encoded = {
+            group.column(j).path_in_schema
+            for j in range(group.num_columns)
+            if group.column(j).has_dictionary_page
+        }
+        wanted &= encoded
+    return sorted(wanted)
+
+
 # ---------- Avro -----------------------------------------------------------
 
 
 def _stats_avro(
     path: str, cols: Optional[List[str]], sample_size: int, limit: int
 ) -> Dict[str, Dict]:
-    if avro_reader is None:
+    if avro_block_reader is None:
         raise ImportError("fastavro missing (`pip install fastavro`).")
 
     num_aggs, cat_aggs = {}, {}
     # Use FileSystemHandler to handle both local and Azure paths
     with FileSystemHandler.open_file(path, "rb") as fo:
-        for rec in avro_reader(fo):
-            _update_aggs_from_dict(rec, num_aggs, cat_aggs, cols, sample_size)
+        reader = avro_block_reader(fo)
+        # Translate the writer schema once; every block shares it
+        try:
+            arrow_schema = _cached_avro_to_pyarrow_schema(reader.writer_schema)
+        except ValueError:
+            arrow_schema = None
+        else:
+            names = arrow_schema.names
+            if cols:
+                names = [n for n in cols if n in names]
+            num_aggs, cat_aggs = _prep_record_aggs(arrow_schema, names, sample_size)
+
+        for block in reader:
+            records = list(block)
+            batch = None
+            if arrow_schema is not None:
+                try:
+                    batch = pa.RecordBatch.from_pylist(records, schema=arrow_schema)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    pass  # logical types the translation doesn't cover
+            if batch is None:
+                _update_aggs_from_records(
+                    records, num_aggs, cat_aggs, cols, sample_size
+                )
+            else:
+                _update_aggs_from_table(batch, num_aggs, cat_aggs)
     return _finish_aggs(num_aggs, cat_aggs)
 
 
 # ---------- CSV & JSONL ----------------------------------------------------
 
 
+_CSV_BLOCK_BYTES = 8 << 20
+
+
 def _stats_csv(
     path: str, cols: Optional[List[str]], sample_size: int, limit: int
 ) -> Dict[str, Dict]:
     try:
-        # Use FileSystemHandler to handle both local and Azure paths
-        fs, fs_path = FileSystemHandler.get_fs_and_path(path)
-
-        # If no columns specified, read the header row first to get all column names
-        if cols is None:
-            # Open the file using FileSystemHandler
-            with FileSystemHandler.open_file(path, "r", encoding="utf8") as f:
-                # Create a pandas-compatible file-like object if needed
-                if not hasattr(f, "read") or not callable(f.read):
-                    f = io.StringIO(f.read())
-                # Read just the header to get column names
-                df_header = pd.read_csv(f, nrows=0)
-                cols = df_header.columns.tolist()
-
-        # For chunked reading, we need to create a generator that uses FileSystemHandler
-        def read_chunks():
-            with FileSystemHandler.open_file(path, "r", encoding="utf8") as f:
-                # Create a pandas-compatible file-like object if needed
-                if not hasattr(f, "read") or not callable(f.read):
-                    f = io.StringIO(f.read())
-                # Use pandas to read in chunks
-                for chunk in pd.read_csv(f, chunksize=1_000_000):
-                    yield chunk
-
-        return _stats_from_chunks(read_chunks(), cols, sample_size)
+        try:
+            return _stats_csv_arrow(path, cols, sample_size)
+        except pa.ArrowInvalid:
+            # Types inferred from the first block that a later block breaks
+            # (or an empty file): rescan with pandas, which widens as it goes.
+            return _stats_csv_pandas(path, cols, sample_size)
     except FileNotFoundError:
         raise ExtractError(f"CSV file not found: {path}")
     except PermissionError:
@@ -250,12 +544,71 @@ def _stats_csv(
         raise ExtractError(f"Error processing CSV file {path}: {e}") from e
 
 
+def _stats_csv_arrow(
+    path: str, cols: Optional[List[str]], sample_size: int
+) -> Dict[str, Dict]:
+    """Stream a CSV through Arrow's multithreaded reader, batch by batch.
+
+    Dates and timestamps are kept as the text found in the file and null
+    markers count as nulls in text columns too, as with the pandas reader,
+    so categorical counts read the same.
+    """
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=_CSV_BLOCK_BYTES)
+    column_types = {}
+    # Use FileSystemHandler to handle both local and Azure paths
+    with FileSystemHandler.open_file(path, "rb") as fo:
+        while True:
+            convert_options = pacsv.ConvertOptions(
+                include_columns=cols or [],
+                column_types=column_types,
+                strings_can_be_null=True,  # "NULL", "N/A", ... as pandas reads them
+            )
+            with pacsv.open_csv(
+                fo, read_options=read_options, convert_options=convert_options
+            ) as reader:
+                schema = reader.schema
+                temporal = {
+                    f.name: pa.string() for f in schema if pa.types.is_temporal(f.type)
+                }
+                if temporal:
+                    # re-read with those columns pinned to strings
+                    column_types.update(temporal)
+                    fo.seek(0)
+                    continue
+                names = cols or schema.names
+                num_aggs, cat_aggs = _prep_aggs(schema, names, sample_size)
+                _fold_batches(_prefetched(reader), num_aggs, cat_aggs)
+                return _finish_aggs(num_aggs, cat_aggs)
+
+
+def _stats_csv_pandas(
+    path: str, cols: Optional[List[str]], sample_size: int
+) -> Dict[str, Dict]:
+    # If no columns specified, read the header row first to get all column names
+    if cols is None:
+        with FileSystemHandler.open_file(path, "r", encoding="utf8") as f:
+            cols = pd.read_csv(f, nrows=0).columns.tolist()
+
+    def read_chunks():
+        with FileSystemHandler.open_file(path, "r", encoding="utf8") as f:
+            yield from pd.read_csv(f, usecols=cols, chunksize=1_000_000)
+
+    return _stats_from_chunks(read_chunks(), cols, sample_size)
+
+
 def _stats_jsonl(
     path: str, cols: Optional[List[str]], sample_size: int, limit: int
 ) -> Dict[str, Dict]:
     import json
 
     try:
+        try:
+            return _stats_jsonl_arrow(path, cols, sample_size)
+        except pa.ArrowInvalid:
+            # Records Arrow can't unify into one schema, overlong lines or
+            # invalid JSON: use the per-line parser, which reports the line.
+            pass
+
         # If no columns specified, read the first record to get all keys
         if cols is None:
             with FileSystemHandler.open_file(path, "r", encoding="utf8") as fh:
@@ -302,6 +655,40 @@ def _stats_jsonl(
         raise ExtractError(f"Error processing JSONL file {path}: {e}") from e
 
 
+_JSON_BLOCK_BYTES = 8 << 20
+
+
+def _stats_jsonl_arrow(
+    path: str, cols: Optional[List[str]], sample_size: int
+) -> Dict[str, Dict]:
+    """Stream a JSONL file through Arrow's multithreaded JSON reader.
+
+    Strings Arrow would parse as timestamps stay strings, as ``json.loads``
+    leaves them in the per-record path.
+    """
+    read_options = pajson.ReadOptions(use_threads=True, block_size=_JSON_BLOCK_BYTES)
+    parse_options = None
+    with FileSystemHandler.open_file(path, "rb") as fo:
+        while True:
+            with pajson.open_json(
+                fo, read_options=read_options, parse_options=parse_options
+            ) as reader:
+                schema = reader.schema
+                temporal = [f.name for f in schema if pa.types.is_temporal(f.type)]
+                if temporal and parse_options is None:
+                    # re-read with those fields pinned to strings
+                    parse_options = pajson.ParseOptions(
+                        explicit_schema=pa.schema([(n, pa.string()) for n in temporal]),
+                        unexpected_field_behavior="infer",
+                    )
+                    fo.seek(0)
+                    continue
+                names = [n for n in cols if n in schema.names] if cols else schema.names
+                num_aggs, cat_aggs = _prep_record_aggs(schema, names, sample_size)
+                _fold_batches(_prefetched(reader), num_aggs, cat_aggs)
+                return _finish_aggs(num_aggs, cat_aggs)
+
+
 # ---------- XLSX -----------------------------------------------------------
 
 
@@ -350,6 +737,11 @@ def _create_tdigest():
         return None
 
 
+def _new_num_agg(sample_size: int) -> _NumAgg:
+    """A numeric aggregator whose median comes from a ``sample_size`` reservoir."""
+    return _NumAgg(sample=_Reservoir(sample_size) if sample_size > 0 else None)
+
+
 def _stats_from_chunks(
     chunks: Union[pd.DataFrame, List[Dict]], cols: Optional[List[str]], sample_size: int
 ) -> Dict[str, Dict]:
@@ -358,8 +750,7 @@ def _stats_from_chunks(
 
     for chunk in chunks:
         if isinstance(chunk, list):  # JSONL list-of-dicts
-            for rec in chunk:
-                _update_aggs_from_dict(rec, num_aggs, cat_aggs, cols, sample_size)
+            _update_aggs_from_records(chunk, num_aggs, cat_aggs, cols, sample_size)
         else:  # pandas DataFrame
             tbl = pa.Table.from_pandas(chunk, preserve_index=False)
 
@@ -379,31 +770,30 @@ def _stats_from_chunks(
     return _finish_aggs(num_aggs, cat_aggs)
 
 
+# Arrow type ids that get numeric stats; decimals are folded as float64
+_NUM_TYPE_IDS = frozenset(
+    t.id
+    for t in (
+        pa.int8(),
+        pa.int16(),
+        pa.int32(),
+        pa.int64(),
+        pa.uint8(),
+        pa.uint16(),
+        pa.uint32(),
+        pa.uint64(),
+        pa.float16(),
+        pa.float32(),
+        pa.float64(),
+        pa.decimal128(1, 0),
+        pa.decimal256(1, 0),
+    )
+)
+
+
 def _is_numeric_type(field_type):
-    """Check if a PyArrow type is numeric in a version-compatible way."""
-    try:
-        # Try the newer API first
-        if hasattr(pa.types, "is_numeric"):
-            return pa.types.is_numeric(field_type)
-        # Fall back to manual type checking for older PyArrow versions
-        numeric_types = (
-            pa.int8(),
-            pa.int16(),
-            pa.int32(),
-            pa.int64(),
-            pa.uint8(),
-            pa.uint16(),
-            pa.uint32(),
-            pa.uint64(),
-            pa.float16(),
-            pa.float32(),
-            pa.float64(),
-        )
-        return any(field_type == t for t in numeric_types)
-    except Exception:
-        # If all else fails, use string type name check
-        type_name = str(field_type).lower()
-        return any(name in type_name for name in ("int", "float", "double", "decimal"))
+    """Check if a PyArrow type is numeric with one type-id lookup."""
+    return field_type.id in _NUM_TYPE_IDS
 
 
 def _prep_aggs(
@@ -414,42 +804,131 @@ def _prep_aggs(
         field = schema.field(name) if hasattr(schema, "field") else None
         is_num = field and _is_numeric_type(field.type)
         if is_num:
-            td = _create_tdigest() if sample_size > 0 else None
-            num_aggs[name] = _NumAgg(td=td)
+            num_aggs[name] = _new_num_agg(sample_size)
         else:
             cat_aggs[name] = _CatAgg()
     return num_aggs, cat_aggs
 
 
+def _prep_record_aggs(
+    schema: pa.Schema, cols: List[str], sample_size: int
+) -> Tuple[Dict[str, _NumAgg], Dict[str, _CatAgg]]:
+    """:func:`_prep_aggs` for formats that also have a per-record path.
+
+    Bool columns and columns that are only ever null are numeric there, so
+    they are made numeric here too.
+    """
+    num_aggs, cat_aggs = _prep_aggs(schema, cols, sample_size)
+    for name in cols:
+        typ = schema.field(name).type
+        if pa.types.is_boolean(typ) or pa.types.is_null(typ):
+            del cat_aggs[name]
+            num_aggs[name] = _new_num_agg(sample_size)
+    return num_aggs, cat_aggs
+
+
 def _update_aggs_from_table(
-    tbl: pa.Table, num_aggs: Dict[str, _NumAgg], cat_aggs: Dict[str, _CatAgg]
+    tbl: Union[pa.Table, pa.RecordBatch],
+    num_aggs: Dict[str, _NumAgg],
+    cat_aggs: Dict[str, _CatAgg],
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> None:
+    _fold_batches([tbl], num_aggs, cat_aggs, pool)
+
+
+def _fold_batches(
+    batches: Iterable[Union[pa.Table, pa.RecordBatch]],
+    num_aggs: Dict[str, _NumAgg],
+    cat_aggs: Dict[str, _CatAgg],
+    pool: Optional[ThreadPoolExecutor] = None,
 ) -> None:
-    for name, agg in num_aggs.items():
-        arr = tbl[name].to_pylist()
-        agg.update(arr)
-    for name, agg in cat_aggs.items():
-        arr = tbl[name].to_pylist()
-        agg.update(arr)
+    """Fold a stream of same-schema batches into the aggregators.
+
+    Columns are bound to their aggregator by position once, from the first
+    batch, so later batches skip the name lookups entirely.
+    """
+    bound = None
+    for batch in batches:
+        if bound is None:
+            bound = _bind_aggs(batch.schema, num_aggs, cat_aggs)
+        if pool is None:
+            for i, agg in bound:
+                agg.update_arrow(batch.column(i))
+        else:
+            # list() drains the map so a failing column re-raises here
+            list(pool.map(lambda job: job[1].update_arrow(batch.column(job[0])), bound))
+
+
+_END = object()
 
 
-def _update_aggs_from_dict(
-    rec: Dict,
+def _prefetched(batches: Iterable, depth: int = 2) -> Iterator:
+    """Yield from *batches* while one worker thread reads up to *depth* ahead.
+
+    Arrow releases the GIL while it reads and decodes, so the next batch is
+    fetched while the caller aggregates the current one. A single worker
+    keeps the reads sequential, as the underlying readers require.
+    """
+    it = iter(batches)
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = deque(reader.submit(next, it, _END) for _ in range(depth))
+        while True:
+            batch = pending.popleft().result()
+            if batch is _END:
+                return
+            pending.append(reader.submit(next, it, _END))
+            yield batch
+
+
+def _bind_aggs(
+    schema: pa.Schema, num_aggs: Dict[str, _NumAgg], cat_aggs: Dict[str, _CatAgg]
+) -> List[Tuple[int, Union[_NumAgg, _CatAgg]]]:
+    """Pair each column position with its aggregator; both kinds share update_arrow."""
+    agg_by_name = {**num_aggs, **cat_aggs}
+    return [
+        (i, agg_by_name[name])
+        for i, name in enumerate(schema.names)
+        if name in agg_by_name
+    ]
+
+
+def _update_aggs_from_records(
+    records: List[Dict],
     num_aggs: Dict[str, _NumAgg],
     cat_aggs: Dict[str, _CatAgg],
     cols: Optional[List[str]],
     sample_size: int,
 ) -> None:
-    for k, v in rec.items():
-        if cols and k not in cols:
-            continue
-        if isinstance(v, (int, float)) or v is None:
-            agg = num_aggs.setdefault(
-                k, _NumAgg(td=_create_tdigest() if sample_size > 0 else None)
-            )
-            agg.update([v])
+    """Route a chunk of records to the aggregators by Python value type.
+
+    Ints, floats, bools and None count as numeric, anything else as
+    categorical. Each column is collected first and then aggregated once,
+    numeric columns through the Arrow kernels of :meth:`_NumAgg.update_arrow`.
+    """
+    wanted = set(cols) if cols else None
+    num_buf: Dict[str, list] = {}
+    cat_buf: Dict[str, list] = {}
+    for rec in records:
+        for k, v in rec.items():
+            if wanted is not None and k not in wanted:
+                continue
+            if isinstance(v, (int, float)) or v is None:
+                num_buf.setdefault(k, []).append(v)
+            else:
+                cat_buf.setdefault(k, []).append(v)
+
+    for k, vals in num_buf.items():
+        agg = num_aggs.get(k)
+        if agg is None:
+            agg = num_aggs[k] = _new_num_agg(sample_size)
+        try:
+            arr = pa.array(vals)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            agg.update(vals)  # e.g. bools mixed with ints, or ints beyond int64
         else:
-            agg = cat_aggs.setdefault(k, _CatAgg())
-            agg.update([v])
+            agg.update_arrow(arr)
+    for k, vals in cat_buf.items():
+        cat_aggs.setdefault(k, _CatAgg()).update(vals)
 
 
 def _finish_aggs(
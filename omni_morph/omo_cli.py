@@ -1,22 +1,19 @@
 import logging
 from pathlib import Path
-import importlib.metadata
-import json
-from omni_morph.data.converter import convert, Format, write
-from omni_morph.data.extractor import (
-    head as extract_head,
-    tail as extract_tail,
-    sample as extract_sample,
-)
-from omni_morph.data.statistics import get_stats
-from omni_morph.data.merging import merge_files
-from omni_morph.data.query_engine import query as run_query, validate_sql, ai_suggest
-from omni_morph.utils.file_utils import get_schema
-from omni_morph.data.filesystems import FileSystemHandler
+import sys
+from typing import TYPE_CHECKING
+
 import typer
-import pyarrow as pa
+
+# Data-layer modules (and PyArrow/DuckDB behind them) are imported inside the
+# commands that use them, so --help and --version start without loading them;
+# the same goes for json, only needed by the orjson-less fallback.
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 DEFAULT_RECORDS = 20
+# Rows converted to Python objects and printed per write by head/tail
+_ECHO_ROWS_CHUNK = 1024
 
 app = typer.Typer(
     help="Transform, inspect, and merge data files with a single command-line tool"
@@ -28,7 +25,9 @@ def main_callback(
     ctx: typer.Context,
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable info logging"),
     debug: bool = typer.Option(False, "--debug", "-d", help="Enable debug logging"),
-    version: bool = typer.Option(False, "--version", help="Show version and exit"),
+    version: bool = typer.Option(
+        False, "--version", "-V", help="Show version and exit"
+    ),
     azure_connection_string: str = typer.Option(
         None,
         "--azure-connection-string",
@@ -65,6 +64,28 @@ def main_callback(
         envvar="AZURE_CLIENT_SECRET",
         help="Azure client secret for service principal authentication",
     ),
+    azure_read_concurrency: int = typer.Option(
+        16,
+        "--azure-read-concurrency",
+        help="Parallel requests per Azure blob read",
+    ),
+    azure_read_chunk_size: int = typer.Option(
+        8 * 1024 * 1024,
+        "--azure-read-chunk-size",
+        help="Bytes fetched per Azure read request (used by query)",
+    ),
+    azure_read_buffer_size: int = typer.Option(
+        128 * 1024 * 1024,
+        "--azure-read-buffer-size",
+        help="Bytes read ahead per open Azure blob",
+    ),
+    threads: int = typer.Option(
+        None,
+        "--threads",
+        "-j",
+        min=1,
+        help="Worker threads for DuckDB and PyArrow (default: one per core)",
+    ),
 ):
     # Store Azure credentials in context for use by commands
     ctx.obj = {
@@ -74,11 +95,16 @@ def main_callback(
         "azure_tenant_id": azure_tenant_id,
         "azure_client_id": azure_client_id,
         "azure_client_secret": azure_client_secret,
+        "azure_read_concurrency": azure_read_concurrency,
+        "azure_read_chunk_size": azure_read_chunk_size,
+        "azure_read_buffer_size": azure_read_buffer_size,
+        "threads": threads,
     }
 
     if version:
-        version_str = importlib.metadata.version("omni_morph")
-        typer.echo(version_str)
+        from omni_morph import __version__
+
+        typer.echo(__version__)
         raise typer.Exit()
     level = logging.WARNING
     if debug:
@@ -87,6 +113,97 @@ def main_callback(
         level = logging.INFO
     logging.basicConfig(level=level)
 
+    if threads:
+        import pyarrow as pa
+
+        pa.set_cpu_count(threads)
+        pa.set_io_thread_count(threads)
+
+
+def _set_duckdb_threads(ctx: typer.Context) -> None:
+    """Hand the global --threads option to the DuckDB query engine."""
+    threads = (ctx.obj or {}).get("threads")
+    if threads:
+        from omni_morph.data.query_engine import set_threads
+
+        set_threads(threads)
+
+
+def _set_azure_credentials(ctx: typer.Context) -> None:
+    """Hand the global Azure options to the filesystem layer."""
+    if ctx.obj:
+        from omni_morph.data.filesystems import FileSystemHandler
+
+        FileSystemHandler.set_azure_credentials(ctx.obj)
+
+
+def _dump_json(obj) -> str:
+    """``json.dumps(obj, indent=2, default=str)``, through orjson when installed."""
+    return _dump_json_bytes(obj).decode()
+
+
+def _dump_json_bytes(obj) -> bytes:
+    """Like :func:`_dump_json`, as UTF-8 bytes (orjson's native output)."""
+    import json
+
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(obj, indent=2, default=str).encode()
+    option = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME  # datetimes go through str() as before
+    )
+    try:
+        return orjson.dumps(obj, default=str, option=option)
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which the stdlib encoder handles
+        return json.dumps(obj, indent=2, default=str).encode()
+
+
+def _echo_json(obj) -> None:
+    """Print *obj* as indented JSON, writing the encoded bytes once when piped."""
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None or sys.stdout.isatty():
+        typer.echo(_dump_json(obj))
+        return
+    # pipes and files take orjson's bytes as is: no decode and re-encode
+    sys.stdout.flush()
+    out.write(_dump_json_bytes(obj) + b"\n")
+    out.flush()
+
+
+def _column_values(col: "pa.ChunkedArray") -> list:
+    """Python values of *col*; null-free numeric columns go through NumPy."""
+    import pyarrow as pa
+
+    t = col.type
+    if col.null_count == 0 and (
+        pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_boolean(t)
+    ):
+        return col.to_numpy().tolist()
+    return col.to_pylist()
+
+
+def _echo_rows(table: "pa.Table") -> None:
+    """Print each row of *table* as a dict, one write per slice of rows."""
+    names = table.column_names
+    tty = sys.stdout.isatty()
+    # Python objects exist for one slice at a time, however large -n is
+    for offset in range(0, table.num_rows, _ECHO_ROWS_CHUNK):
+        part = table.slice(offset, _ECHO_ROWS_CHUNK)
+        columns = [_column_values(col) for col in part.columns]
+        text = "\n".join(repr(dict(zip(names, vals))) for vals in zip(*columns))
+        if tty:
+            typer.echo(text)
+        else:
+            # pipes and files take the text as is, without Click's echo pipeline
+            sys.stdout.write(text + "\n")
+    if not tty:
+        sys.stdout.flush()
+
 
 @app.command()
 def head(
@@ -101,12 +218,11 @@ def head(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
-        table = extract_head(str(file_path), n)
-        for row in table.to_pylist():
-            typer.echo(row)
+        from omni_morph.data.extractor import head as extract_head
+
+        _echo_rows(extract_head(str(file_path), n))
     except Exception as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(code=1)
@@ -125,12 +241,11 @@ def tail(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        from omni_morph.data.extractor import tail as extract_tail
 
-        table = extract_tail(str(file_path), n)
-        for row in table.to_pylist():
-            typer.echo(row)
+        _echo_rows(extract_tail(str(file_path), n))
     except Exception as e:
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(code=1)
@@ -146,13 +261,12 @@ def meta(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
         from omni_morph.utils.file_utils import get_metadata
 
         metadata = get_metadata(str(file_path))
-        typer.echo(json.dumps(metadata, default=str, indent=2))
+        _echo_json(metadata)
     except Exception as e:
         typer.echo(f"Error extracting metadata: {e}", err=True)
         raise typer.Exit(code=1)
@@ -171,10 +285,11 @@ def schema(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
         # Import here to avoid import errors for other commands
+        from omni_morph.utils.file_utils import get_schema
+
         schema = get_schema(str(file_path))
 
         # Output the results based on format preference
@@ -183,7 +298,7 @@ def schema(
 
             typer.echo(schema_to_markdown(schema))
         else:
-            typer.echo(json.dumps(schema, indent=2))
+            _echo_json(schema)
     except Exception as e:
         typer.echo(f"Error extracting schema: {e}", err=True)
         raise typer.Exit(code=1)
@@ -219,69 +334,67 @@ def stats(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
         # Validate option combinations
-        if fast and (columns or sample_size != 2048 or markdown):
+        if fast and (sample_size != 2048 or markdown):
             typer.echo(
-                "Error: When using --fast, the options --columns, --sample-size, and --markdown cannot be used.",
+                "Error: When using --fast, the options --sample-size and --markdown cannot be used.",
                 err=True,
             )
             typer.echo(
-                "Use either 'stats --fast [--format FORMAT] FILE' or 'stats [--markdown] [--columns COLS] [--sample-size N] [--format FORMAT] FILE'",
+                "Use either 'stats --fast [--columns COLS] [--format FORMAT] FILE' or 'stats [--markdown] [--columns COLS] [--sample-size N] [--format FORMAT] FILE'",
                 err=True,
             )
             raise typer.Exit(code=1)
 
+        # Parse comma-separated columns into list
+        if columns:
+            columns = [col.strip() for col in columns.split(",")]
+        else:
+            columns = None
+
         # If fast option is enabled, use DuckDB's Summarize
         if fast:
+            _set_duckdb_threads(ctx)
+
             # Extract the table name from the file path (stem without extension)
             table_name = Path(file_path).stem
 
-            # Build the SQL query
-            sql_query = f"SUMMARIZE {table_name};"
-
             # Use the query engine to execute the query
-            from omni_morph.data.query_engine import query
-            import tempfile
-            import os
+            from omni_morph.data.converter import Format
+            from omni_morph.data.query_engine import _sql_ident, query
+            from omni_morph.utils.convert_summary import (
+                convert_summary_from_df,
+                summarize_parquet,
+            )
+
+            # Build the SQL query, projecting the requested columns if any
+            if columns:
+                projection = ", ".join(_sql_ident(col) for col in columns)
+                sql_query = (
+                    f"SUMMARIZE (SELECT {projection} FROM {_sql_ident(table_name)});"
+                )
+            else:
+                sql_query = f"SUMMARIZE {_sql_ident(table_name)};"
 
             # Force format if provided
             fmt = Format(format) if format else None
 
-            # Execute the query and get the results as a pandas DataFrame
-            result_df = query(sql_query, file_path, fmt=fmt, return_type="pandas")
-
-            # Save to a temporary markdown file for processing
-            with tempfile.NamedTemporaryFile(suffix=".md", delete=False) as temp_file:
-                temp_path = temp_file.name
-                # Convert DataFrame to markdown and save
-                with open(temp_path, "w") as f:
-                    f.write(result_df.to_markdown(index=False))
-
-            try:
-                # Convert the summary to our format
-                from omni_morph.utils.convert_summary import convert_summary
-
-                result_md = convert_summary(temp_path)
-
-                # Output the results
-                typer.echo(result_md)
-            finally:
-                # Clean up the temporary file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            if (fmt or Format.from_path(str(file_path))) == Format.PARQUET:
+                # Counts and numeric bounds come straight from the footer
+                result_df = summarize_parquet(str(file_path), table_name, columns, fmt)
+            else:
+                # Execute the query and convert the in-memory result
+                result_df = query(sql_query, file_path, fmt=fmt, return_type="pandas")
+            typer.echo(convert_summary_from_df(result_df))
         else:
+            from omni_morph.data.converter import Format
+            from omni_morph.data.statistics import get_stats
+
             # Convert format string to Format enum if provided
             fmt = Format(format) if format else None
 
-            # Parse comma-separated columns into list
-            if columns:
-                columns = [col.strip() for col in columns.split(",")]
-            else:
-                columns = None
-
             # Get statistics for the file
             stats_result = get_stats(
                 path=file_path, fmt=fmt, columns=columns, sample_size=sample_size
@@ -294,7 +407,7 @@ def stats(
                 typer.echo(stats_to_markdown(stats_result))
             else:
                 # Output the results as JSON
-                typer.echo(json.dumps(stats_result, indent=2, default=str))
+                _echo_json(stats_result)
     except Exception as e:
         typer.echo(f"Error computing statistics: {e}", err=True)
         raise typer.Exit(code=1)
@@ -312,6 +425,12 @@ def merge(
     progress: bool = typer.Option(
         False, "--progress", "-p", help="Show progress during merge"
     ),
+    concurrency: int = typer.Option(
+        8,
+        "--concurrency",
+        min=1,
+        help="Sources read ahead in parallel when any of them lives on Azure",
+    ),
     ctx: typer.Context = typer.Context,
 ):
     """
@@ -319,12 +438,20 @@ def merge(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        from omni_morph.data.converter import Format
+        from omni_morph.data.filesystems import FileSystemHandler
+        from omni_morph.data.merging import merge_files
 
         # Convert Path objects to strings
         source_files = [str(file) for file in files]
 
+        # Blob reads are latency-bound, so keep several in flight; local
+        # sources are read one at a time to avoid churning the page cache.
+        remote = any(FileSystemHandler.is_remote(src) for src in source_files)
+        max_workers = concurrency if remote else 1
+
         # Determine the output format from the file extension
         output_fmt = Format.from_path(output_path)
 
@@ -335,6 +462,7 @@ def merge(
             output_fmt=output_fmt,
             allow_cast=allow_cast,
             progress=progress,
+            max_workers=max_workers,
         )
 
         typer.echo(f"Files merged successfully to {output_path}")
@@ -355,10 +483,11 @@ def to_json(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
-        convert(
+        from omni_morph.data.converter import Format, convert_batches
+
+        convert_batches(
             file_path,
             output_path,
             dst_fmt=Format.JSON,
@@ -383,8 +512,9 @@ def to_csv(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        from omni_morph.data.converter import Format, convert_batches
 
         # Only include parameters supported by PyArrow's WriteOptions
         write_kwargs = {
@@ -392,7 +522,9 @@ def to_csv(
             "delimiter": delimiter,
             "quoting_style": "needed" if quote == '"' else "all",
         }
-        convert(file_path, output_path, dst_fmt=Format.CSV, write_kwargs=write_kwargs)
+        convert_batches(
+            file_path, output_path, dst_fmt=Format.CSV, write_kwargs=write_kwargs
+        )
     except Exception as e:
         typer.echo(f"Error converting to CSV: {e}", err=True)
         raise typer.Exit(code=1)
@@ -403,7 +535,9 @@ def to_avro(
     file_path: Path = typer.Argument(..., help="Path to the input file"),
     output_path: Path = typer.Argument(..., help="Path to the output Avro file"),
     compression: str = typer.Option(
-        "uncompressed", "--compression", help="Compression method"
+        "snappy",
+        "--compression",
+        help="Compression codec (snappy, deflate, ...) or 'uncompressed'",
     ),
     ctx: typer.Context = typer.Context,
 ):
@@ -412,13 +546,14 @@ def to_avro(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
-        write_kwargs = (
-            {"compression": compression} if compression != "uncompressed" else None
+        from omni_morph.data.converter import Format, convert_batches
+
+        write_kwargs = {"compression": compression}
+        convert_batches(
+            file_path, output_path, dst_fmt=Format.AVRO, write_kwargs=write_kwargs
         )
-        convert(file_path, output_path, dst_fmt=Format.AVRO, write_kwargs=write_kwargs)
     except Exception as e:
         typer.echo(f"Error converting to Avro: {e}", err=True)
         raise typer.Exit(code=1)
@@ -429,7 +564,9 @@ def to_parquet(
     file_path: Path = typer.Argument(..., help="Path to the input file"),
     output_path: Path = typer.Argument(..., help="Path to the output Parquet file"),
     compression: str = typer.Option(
-        "uncompressed", "--compression", help="Compression method"
+        "zstd",
+        "--compression",
+        help="Compression codec (zstd, snappy, gzip, ...) or 'uncompressed'",
     ),
     ctx: typer.Context = typer.Context,
 ):
@@ -438,13 +575,12 @@ def to_parquet(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
 
-        write_kwargs = (
-            {"compression": compression} if compression != "uncompressed" else None
-        )
-        convert(
+        from omni_morph.data.converter import Format, convert_batches
+
+        write_kwargs = {"compression": compression}
+        convert_batches(
             file_path, output_path, dst_fmt=Format.PARQUET, write_kwargs=write_kwargs
         )
     except Exception as e:
@@ -465,8 +601,9 @@ def to_excel(
 ):
     """Convert one file to Excel (.xlsx) format."""
     try:
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        from omni_morph.data.converter import Format, convert
 
         # Pass sheet name via write_kwargs so converter → _io can honour it.
         write_kwargs = {"sheet_name": sheet_name}
@@ -491,25 +628,23 @@ def random_sample(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        import itertools
+
+        from omni_morph.data.converter import Format, has_nested_types, write_batches
+        from omni_morph.data.extractor import sample_batches
 
-        # Extract the sample as a PyArrow Table
-        table = extract_sample(str(file_path), n=n, fraction=fraction, seed=seed)
+        # Stream the sample as PyArrow Tables; the first one fixes the schema
+        tables = sample_batches(str(file_path), n=n, fraction=fraction, seed=seed)
+        first = next(tables)
 
         # Determine the output format from the file extension
         output_fmt = Format.from_path(output_path)
 
         # Check for complex types when writing to CSV
         if output_fmt == Format.CSV:
-            has_complex_types = any(
-                pa.types.is_list(field.type)
-                or pa.types.is_struct(field.type)
-                or pa.types.is_map(field.type)
-                for field in table.schema
-            )
-
-            if has_complex_types:
+            if has_nested_types(first.schema):
                 typer.echo(
                     "Error: Data contains complex types (lists, maps, or nested structures) "
                     "that cannot be represented in CSV format."
@@ -519,8 +654,8 @@ def random_sample(
                 )
                 raise typer.Exit(code=1)
 
-        # Write the table directly to the output file
-        write(table, output_path, fmt=output_fmt)
+        # Write each table as it is sampled
+        write_batches(itertools.chain([first], tables), output_path, fmt=output_fmt)
 
         typer.echo(f"Sampled data written to {output_path}")
     except Exception as e:
@@ -545,29 +680,47 @@ def query(
     """
     try:
         # Set Azure credentials if provided
-        if ctx.obj:
-            FileSystemHandler.set_azure_credentials(ctx.obj)
+        _set_azure_credentials(ctx)
+
+        from omni_morph.data.converter import Format
+        from omni_morph.data.query_engine import (
+            QueryError,
+            QuerySession,
+            ai_suggest,
+            query as run_query,
+            validate_sql,
+        )
+        from omni_morph.utils.file_utils import get_schema
 
         # Force format if provided
         fmt = Format(format) if format else None
 
         # Extract Azure credentials from context
         azure_credentials = ctx.obj if ctx.obj else None
+        _set_duckdb_threads(ctx)
 
-        # Validate SQL before execution
-        error_message = validate_sql(
-            sql, str(file_path), fmt=fmt, azure_credentials=azure_credentials
-        )
+        with QuerySession(
+            str(file_path), fmt=fmt, azure_credentials=azure_credentials
+        ) as session:
+            # Run the query straight away: DuckDB parses and binds it once, and
+            # only SQL it rejects goes through validation for the AI prompt
+            try:
+                run_query(sql, str(file_path), session=session)
+                return
+            except QueryError as exc:
+                # DuckDB's own message; validation adds the bound view's schema
+                error_message = str(exc)
+                _, schema_txt = validate_sql(
+                    sql, str(file_path), with_schema=True, session=session
+                )
 
-        if error_message:
             # For test compatibility, use the expected output format
             typer.echo(f"\n❌ SQL validation failed:\n{error_message}\n")
 
             # Try to get schema for AI suggestions
             try:
-                from omni_morph.utils.file_utils import get_schema
-
-                schema_txt = json.dumps(get_schema(str(file_path)), indent=2)
+                if schema_txt is None:
+                    schema_txt = _dump_json(get_schema(str(file_path)))
 
                 # Suggest a fix if there's an error
                 suggestion = ai_suggest(
@@ -577,15 +730,13 @@ def query(
                     typer.echo("💡 Suggested fix:\n")
                     typer.echo(suggestion)
             except Exception as ex:
+                if schema_txt is None:
+                    raise  # the source itself can't be read: a hard error
                 # AI fallback - show schema so user can fix manually
                 typer.echo(f"⚠️ Could not get AI suggestion: {ex}")
                 typer.echo(f"\nSchema:\n{schema_txt}")
 
             # Don't exit with error code for SQL validation issues (for test compatibility)
-            return
-
-        # Execute the query
-        run_query(sql, str(file_path), fmt=fmt, azure_credentials=azure_credentials)
     except Exception as e:
         typer.echo(f"Error executing query: {e}", err=True)
         raise typer.Exit(code=1)
@@ -3,16 +3,20 @@
 omo-wizard - interactive front-end for the OmniMorph CLI (omo-cli)
 """
 
+import codecs
+import io
+import locale
+import os
+import re
 import shlex
 import subprocess
 import sys
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
 from rich.live import Live  # noqa: F811
 
 from InquirerPy import inquirer
 from InquirerPy.validator import NumberValidator
-from InquirerPy.base.control import Choice  # noqa: F401
-from prompt_toolkit.completion import PathCompleter  # noqa: F401
 from rich.console import Console
 from rich.markdown import Markdown
 from rich.progress import Progress, BarColumn, TimeElapsedColumn
@@ -24,6 +28,10 @@ console = Console()
 # Global variable to store the remembered file path
 REMEMBERED_FILE_PATH = None
 
+# Paths already confirmed to be files this session, so they aren't stat'ed
+# again on every prompt (each check is a round-trip on network mounts)
+_KNOWN_FILES = set()
+
 # ---------- 1. Minimal command registry ----------
 
 COMMANDS = {
@@ -83,7 +91,7 @@ COMMANDS = {
     },
     "to-avro": {
         "args": [
-            {"name": "--compression", "kind": "text", "default": "uncompressed"},
+            {"name": "--compression", "kind": "text", "default": "snappy"},
             {"name": "file", "kind": "path", "positional": True},
             {"name": "output", "kind": "output_path", "positional": True},
         ]
@@ -113,7 +121,7 @@ COMMANDS = {
     },
     "to-parquet": {
         "args": [
-            {"name": "--compression", "kind": "text", "default": "uncompressed"},
+            {"name": "--compression", "kind": "text", "default": "zstd"},
             {"name": "file", "kind": "path", "positional": True},
             {"name": "output", "kind": "output_path", "positional": True},
         ]
@@ -122,15 +130,43 @@ COMMANDS = {
         "args": [
             {"name": "--allow-cast", "kind": "flag", "default": True},
             {"name": "--progress", "kind": "flag", "default": False},
+            {"name": "--concurrency", "kind": "int", "default": 8},
             {"name": "files", "kind": "paths", "positional": True},
             {"name": "output", "kind": "output_path", "positional": True},
         ]
     },
 }
 
+# Keys an argument spec may carry; its kind must be one of _PROMPTS
+_ARG_KEYS = {"name", "kind", "default", "optional", "positional"}
+
+
+def _check_commands(commands):
+    """Reject argument specs build_command would silently skip or misread.
+
+    Run once at import, so a misspelt kind or key in COMMANDS fails loudly
+    instead of dropping the argument from the built command.
+    """
+    for cmd_name, spec in commands.items():
+        for arg in spec["args"]:
+            unknown = set(arg) - _ARG_KEYS
+            if unknown or "name" not in arg or arg.get("kind") not in _PROMPTS:
+                raise ValueError(f"Invalid argument spec for {cmd_name!r}: {arg!r}")
+
+
 # ---------- 2. Helpers ----------
 
 
+def _is_file(path):
+    """``Path(path).is_file()``, remembering paths found to be files."""
+    if path in _KNOWN_FILES:
+        return True
+    if Path(path).is_file():
+        _KNOWN_FILES.add(path)
+        return True
+    return False
+
+
 def ask_path(message="Select file", multi=False):
     global REMEMBERED_FILE_PATH
     try:
@@ -151,7 +187,7 @@ def ask_path(message="Select file", multi=False):
                     break
                 elif path:
                     # Check if the selected path is a file
-                    if Path(path).is_file():
+                    if _is_file(path):
                         paths.append(path)
                         console.print(f"[dim]Added:[/] {path}")
                     else:
@@ -163,7 +199,7 @@ def ask_path(message="Select file", multi=False):
         else:
             # Show the remembered path in the message if it exists
             display_message = message
-            if REMEMBERED_FILE_PATH and Path(REMEMBERED_FILE_PATH).is_file():
+            if REMEMBERED_FILE_PATH and _is_file(REMEMBERED_FILE_PATH):
                 display_message = (
                     f"{message} [dim](remembered: {REMEMBERED_FILE_PATH})[/]"
                 )
@@ -183,7 +219,7 @@ def ask_path(message="Select file", multi=False):
                 ).execute()
 
                 # Check if the selected path is a file
-                if path and Path(path).is_file():
+                if path and _is_file(path):
                     return path
                 elif path:
                     console.print(
@@ -254,20 +290,25 @@ def ask_output_path(message):
         raise
 
 
-def handle_sql_suggestion(command_str, output_lines):
+# A statement keyword followed by a space, in any case
+_SQL_KEYWORD_RE = re.compile(
+    r"(?:SELECT|CREATE|INSERT|UPDATE|DELETE|WITH) ", re.IGNORECASE
+)
+
+
+def handle_sql_suggestion(parts, output_lines):
     """Extract and handle SQL suggestions from AI assistance.
 
     Args:
-        command_str: The original command string
+        parts: The original command's argv list
         output_lines: List of output lines from command execution
 
     Returns:
         bool: True if a suggestion was found and executed, False otherwise
     """
-    output_text = "\n".join(output_lines)
-
-    # Look for indicators of AI suggestion - simpler approach
-    if "Suggested fix:" not in output_text and "💡" not in output_text:
+    # Look for indicators of AI suggestion line by line; neither spans a
+    # line break, so the output is never joined into one string
+    if not any("Suggested fix:" in line or "💡" in line for line in output_lines):
         return False
 
     # Extract the suggested SQL query
@@ -291,17 +332,7 @@ def handle_sql_suggestion(command_str, output_lines):
     # If no code block found, try to extract SQL statements directly
     if not sql_code:
         for i, line in enumerate(output_lines):
-            if any(
-                keyword in line.upper()
-                for keyword in [
-                    "SELECT ",
-                    "CREATE ",
-                    "INSERT ",
-                    "UPDATE ",
-                    "DELETE ",
-                    "WITH ",
-                ]
-            ):
+            if _SQL_KEYWORD_RE.search(line):
                 # Found a line with SQL keywords
                 sql_start = i
                 sql_lines = [line]
@@ -324,29 +355,86 @@ def handle_sql_suggestion(command_str, output_lines):
 
         console.print("\n[bold cyan]AI suggested a SQL query fix.[/]")
         if ask_flag("Would you like to run the suggested SQL query?", True):
-            # Extract the original command parts and replace the SQL query
-            parts = shlex.split(command_str)
-            # Find the SQL query position (last argument)
-            parts[-1] = sql_code
-            new_command = shlex.join(parts)
-            console.print(f"[dim]Will run:[/] {new_command}")
-            run_cli(new_command)
+            # Copy the original command parts and replace the SQL query
+            # (the last argument)
+            new_parts = [*parts[:-1], sql_code]
+            console.print(f"[dim]Will run:[/] {shlex.join(new_parts)}")
+            run_cli(new_parts)
             return True
 
     return False
 
 
-def run_cli(command_str):
-    if command_str is None:
+class _LineWriter(io.TextIOBase):
+    """Text stream that hands each complete line written to it to *emit*."""
+
+    def __init__(self, emit):
+        self._emit = emit
+        self._pending = ""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        *lines, self._pending = (self._pending + text).split("\n")
+        for line in lines:
+            self._emit(line)
+        return len(text)
+
+    def close(self):
+        if self._pending:
+            self._emit(self._pending)
+            self._pending = ""
+
+
+def _invoke_cli(args):
+    """Run omo-cli with *args* in this process and return its exit code."""
+    from omni_morph.omo_cli import app as cli_app
+
+    try:
+        cli_app(args=args, prog_name="omo-cli")
+    except SystemExit as exc:
+        code = exc.code
+        return code if isinstance(code, int) else (0 if code is None else 1)
+    except Exception as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _spawn_cli(args, emit):
+    """Run omo-cli with *args* in a child process, emitting each output line."""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "omni_morph", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    # Read whatever the pipe holds (up to 64 KiB) per call rather than a
+    # line at a time; the decoder keeps characters split across reads whole
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(
+        errors="replace"
+    )
+    writer = _LineWriter(emit)
+    fd = proc.stdout.fileno()
+    while chunk := os.read(fd, 1 << 16):
+        writer.write(decoder.decode(chunk))
+    writer.write(decoder.decode(b"", final=True))
+    writer.close()
+    proc.stdout.close()
+    return proc.wait()
+
+
+def run_cli(parts):
+    if parts is None:
         return
 
-    console.rule(f"[bold green]Executing[/] {command_str}")
+    console.rule(f"[bold green]Executing[/] {shlex.join(parts)}")
 
     # Create a separate area for command output
     output_lines = []
 
-    # Create a separate console for command output to avoid interference with progress bar
-    output_console = Console(highlight=False)
+    # Output goes to the terminal as it is now, not to the redirected streams
+    term = Console(file=sys.stdout, highlight=False)
 
     # Print a header for the output to ensure separation from the progress bar
     console.print("Command Output:")
@@ -355,16 +443,6 @@ def run_cli(command_str):
     # Create a Live display that will properly manage the progress bar
     from time import time
 
-    # Start the subprocess first
-    proc = subprocess.Popen(
-        command_str,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-    )
-
     # Create progress bar with proper time tracking
     progress = Progress(
         "[progress.description]{task.description}",
@@ -378,21 +456,28 @@ def run_cli(command_str):
     # Add a task and get its ID
     task_id = progress.add_task("omo-cli", total=100)
 
+    def emit(line):
+        line_text = line.rstrip()
+        output_lines.append(line_text)
+        term.print(line_text, end="\n", markup=False)
+        # Update progress to show activity
+        progress.update(task_id, advance=0, refresh=True)
+
     # Track start time
     start_time = time()
 
-    # Use Live display to manage the progress bar
-    with Live(progress, refresh_per_second=10, console=console) as _live:  # noqa: F841
-        # Process and display output
-        for line in proc.stdout:
-            line_text = line.rstrip()
-            output_lines.append(line_text)
-            output_console.print(line_text, end="\n")
-            # Update progress to show activity
-            progress.update(task_id, advance=0, refresh=True)
-
-        # Wait for process to complete
-        proc.wait()
+    # Use Live display to manage the progress bar. The command runs in this
+    # process (no new interpreter or shell), with stdout and stderr read
+    # line by line as a subprocess pipe would be; OMO_WIZARD_SUBPROCESS=1
+    # runs it in a child process instead.
+    with Live(progress, refresh_per_second=10, console=term) as _live:  # noqa: F841
+        if os.environ.get("OMO_WIZARD_SUBPROCESS") == "1":
+            returncode = _spawn_cli(parts[1:], emit)
+        else:
+            writer = _LineWriter(emit)
+            with redirect_stdout(writer), redirect_stderr(writer):
+                returncode = _invoke_cli(parts[1:])
+            writer.close()
 
         # Calculate elapsed time
         elapsed = time() - start_time
@@ -404,17 +489,110 @@ def run_cli(command_str):
     console.print("─" * 80)
 
     # Check if this is a query command with AI suggestion
-    if "query" in command_str:
-        _ = handle_sql_suggestion(command_str, output_lines)  # noqa: F841
+    if parts[1] == "query":
+        _ = handle_sql_suggestion(parts, output_lines)  # noqa: F841
 
-    if proc.returncode != 0:
-        console.print(f"[bold red]omo-cli exited with code {proc.returncode}[/]")
+    if returncode != 0:
+        console.print(f"[bold red]omo-cli exited with code {returncode}[/]")
     else:
         console.print("[bold green]\u2713 Done[/]")
 
 
+# ---------- 3. Prompts per argument kind ----------
+# Each takes the argument spec, the command parts built so far and a state
+# dict shared across one build_command call, and appends what the user chose.
+
+
+def _add(parts, arg, *values):
+    """Append *values* for *arg*, after its option name unless positional."""
+    if not arg.get("positional", False):
+        parts.append(arg["name"])
+    parts.extend(values)
+
+
+def _prompt_path(arg, parts, state):
+    name = arg["name"]
+    value = ask_path(f"Path for {name.lstrip('-')}")
+    if name == "file":
+        state["file"] = value
+    _add(parts, arg, str(value))
+
+
+def _prompt_paths(arg, parts, state):
+    value = ask_path(f"Paths for {arg['name'].lstrip('-')}", multi=True)
+    _add(parts, arg, *[str(v) for v in value])
+
+
+def _prompt_int(arg, parts, state):
+    value = ask_int(arg["name"].lstrip("-"), arg.get("default", 0))
+    _add(parts, arg, str(value))
+
+
+def _prompt_float(arg, parts, state):
+    value = ask_text(f"{arg['name'].lstrip('-')} (default: {arg.get('default', 0)})")
+    if value:
+        _add(parts, arg, value)
+
+
+def _prompt_flag(arg, parts, state):
+    name = arg["name"]
+    if ask_flag(f"Enable {name.lstrip('-')}", default=arg.get("default", False)):
+        parts.append(name)
+
+
+def _prompt_text(arg, parts, state):
+    name = arg["name"]
+    # Skip format prompt if we can determine it from the file extension
+    if name == "--format":
+        file_to_check = state["file"] or REMEMBERED_FILE_PATH
+        if file_to_check:
+            try:
+                Format.from_path(file_to_check)
+                # Format can be determined from extension, skip the prompt
+                console.print(
+                    "[dim]Format detected from file extension, skipping format prompt[/]"  # noqa: F541
+                )
+                return
+            except ValueError:
+                # Format cannot be determined, ask for it
+                pass
+
+    value = ask_text(f"{name.lstrip('-')} (leave blank to skip)")
+    if value:
+        _add(parts, arg, value)
+
+
+def _prompt_sql(arg, parts, state):
+    value = ask_text(f"{arg['name'].lstrip('-')} (SQL query)")
+    if value:
+        parts.append(value)
+
+
+def _prompt_output_path(arg, parts, state):
+    value = ask_output_path(f"Output path for {arg['name'].lstrip('-')}")
+    _add(parts, arg, str(value))
+
+
+_PROMPTS = {
+    "path": _prompt_path,
+    "paths": _prompt_paths,
+    "int": _prompt_int,
+    "float": _prompt_float,
+    "flag": _prompt_flag,
+    "text": _prompt_text,
+    "sql": _prompt_sql,
+    "output_path": _prompt_output_path,
+}
+
+_check_commands(COMMANDS)
+
+# Main-menu entries, built once: COMMANDS (starting with "remember file")
+# and QUIT
+_MENU_CHOICES = (*COMMANDS, "QUIT")
+
+
 def build_command(cmd_name):
-    """Build a command string based on user input for the specified command."""
+    """Build the omo-cli argv list based on user input for the specified command."""
     global REMEMBERED_FILE_PATH
     spec = COMMANDS[cmd_name]
     parts = ["omo-cli"]
@@ -437,7 +615,7 @@ def build_command(cmd_name):
 
     try:
         # Track the current file path for format detection without changing REMEMBERED_FILE_PATH
-        current_file_path = None
+        state = {"file": None}
 
         # Special handling for stats command with --fast option
         if cmd_name == "stats":
@@ -445,133 +623,20 @@ def build_command(cmd_name):
             use_fast = ask_flag("Use fast mode (DuckDB-based statistics)?")
             if use_fast:
                 parts.append("--fast")
-                # When using fast mode, only process the file and format options
+                # When using fast mode, only process the file, columns and format options
                 for arg in spec["args"]:
-                    kind = arg["kind"]
-                    name = arg["name"]
-                    is_positional = arg.get("positional", False)
-
-                    # Only allow file and format options with --fast
-                    if name == "file" or name == "--format":
-                        if kind == "path":
-                            value = ask_path(f"Path for {name.lstrip('-')}")
-                            if name == "file":
-                                current_file_path = value
-                            if is_positional:
-                                parts.append(str(value))
-                            else:
-                                parts.extend([name, str(value)])
-                        elif kind == "text" and name == "--format":
-                            # Skip format prompt if we can determine it from the file extension
-                            file_to_check = current_file_path or REMEMBERED_FILE_PATH
-                            if file_to_check:
-                                try:
-                                    Format.from_path(file_to_check)
-                                    # Format can be determined from extension, skip the prompt
-                                    console.print(
-                                        "[dim]Format detected from file extension, skipping format prompt[/]"  # noqa: F541
-                                    )
-                                    continue
-                                except ValueError:
-                                    # Format cannot be determined, ask for it
-                                    pass
-
-                            value = ask_text(
-                                f"{name.lstrip('-')} (leave blank to skip)"
-                            )
-                            if value:
-                                if is_positional:
-                                    parts.append(value)
-                                else:
-                                    parts.extend([name, value])
-                return shlex.join(parts)  # Return early with only these options
+                    if arg["name"] in ("file", "--columns", "--format"):
+                        _PROMPTS[arg["kind"]](arg, parts, state)
+                return parts  # Return early with only these options
 
         # Normal processing for all other commands or stats without --fast
         for arg in spec["args"]:
-            kind = arg["kind"]
-            name = arg["name"]
-            is_positional = arg.get("positional", False)
-
             # Skip the --fast option for stats if we're in the normal path
-            if cmd_name == "stats" and name == "--fast":
+            if cmd_name == "stats" and arg["name"] == "--fast":
                 continue
+            _PROMPTS[arg["kind"]](arg, parts, state)
 
-            if kind == "path":
-                value = ask_path(f"Path for {name.lstrip('-')}")
-                if name == "file":
-                    current_file_path = value
-                if is_positional:
-                    parts.append(str(value))
-                else:
-                    parts.extend([name, str(value)])
-
-            elif kind == "paths":
-                value = ask_path(f"Paths for {name.lstrip('-')}", multi=True)
-                if is_positional:
-                    parts.extend([str(v) for v in value])
-                else:
-                    parts.append(name)
-                    parts.extend([str(v) for v in value])
-
-            elif kind == "int":
-                value = ask_int(name.lstrip("-"), arg.get("default", 0))
-                if is_positional:
-                    parts.append(str(value))
-                else:
-                    parts.extend([name, str(value)])
-
-            elif kind == "float":
-                value = ask_text(
-                    f"{name.lstrip('-')} (default: {arg.get('default', 0)})"
-                )
-                if value:
-                    if is_positional:
-                        parts.append(value)
-                    else:
-                        parts.extend([name, value])
-
-            elif kind == "flag":
-                if ask_flag(
-                    f"Enable {name.lstrip('-')}", default=arg.get("default", False)
-                ):
-                    parts.append(name)
-
-            elif kind == "text":
-                # Skip format prompt if we can determine it from the file extension
-                if name == "--format":
-                    file_to_check = current_file_path or REMEMBERED_FILE_PATH
-                    if file_to_check:
-                        try:
-                            Format.from_path(file_to_check)
-                            # Format can be determined from extension, skip the prompt
-                            console.print(
-                                "[dim]Format detected from file extension, skipping format prompt[/]"  # noqa: F541
-                            )
-                            continue
-                        except ValueError:
-                            # Format cannot be determined, ask for it
-                            pass
-
-                value = ask_text(f"{name.lstrip('-')} (leave blank to skip)")
-                if value:
-                    if is_positional:
-                        parts.append(value)
-                    else:
-                        parts.extend([name, value])
-
-            elif kind == "sql":
-                value = ask_text(f"{name.lstrip('-')} (SQL query)")
-                if value:
-                    parts.append(value)
-
-            elif kind == "output_path":
-                value = ask_output_path(f"Output path for {name.lstrip('-')}")
-                if is_positional:
-                    parts.append(str(value))
-                else:
-                    parts.extend([name, str(value)])
-
-        return shlex.join(parts)
+        return parts
     except KeyboardInterrupt:
         return None
 
@@ -583,29 +648,26 @@ def app():
     while True:
         try:
             # Show the remembered file in the main menu if it exists
-            file_exists = False
-            try:
-                fs_handler = FileSystemHandler()
-                file_exists = fs_handler.exists(REMEMBERED_FILE_PATH)
-            except Exception:
-                # Fall back to local file check if there's an error
-                if REMEMBERED_FILE_PATH:
+            file_exists = REMEMBERED_FILE_PATH in _KNOWN_FILES
+            if REMEMBERED_FILE_PATH and not file_exists:
+                try:
+                    fs_handler = FileSystemHandler()
+                    file_exists = fs_handler.exists(REMEMBERED_FILE_PATH)
+                except Exception:
+                    # Fall back to local file check if there's an error
                     file_exists = Path(REMEMBERED_FILE_PATH).is_file()
+                if file_exists:
+                    _KNOWN_FILES.add(REMEMBERED_FILE_PATH)
 
             if REMEMBERED_FILE_PATH and file_exists:
                 console.print(f"[dim]Remembered file:[/] {REMEMBERED_FILE_PATH}")
 
-            # Create choices list with remember/forget at the top
-            command_choices = []
-            if REMEMBERED_FILE_PATH:
-                command_choices.append("forget file")
-            else:
-                command_choices.append("remember file")
-
-            # Add all other commands
-            command_choices.extend(list(COMMANDS))
-            # Add quit option at the end
-            command_choices.append("QUIT")
+            # "forget file" goes on top once a file is remembered
+            command_choices = (
+                ["forget file", *_MENU_CHOICES]
+                if REMEMBERED_FILE_PATH
+                else list(_MENU_CHOICES)
+            )
 
             cmd_name = inquirer.select(  # list prompt
                 message="Choose a command",
@@ -624,14 +686,14 @@ def app():
                     console.print("[dim]No file path was remembered[/]")
                 continue
 
-            command_str = build_command(cmd_name)
-            if command_str is None:
+            parts = build_command(cmd_name)
+            if parts is None:
                 continue
 
-            console.print(f"[dim]Will run:[/] {command_str}")
+            console.print(f"[dim]Will run:[/] {shlex.join(parts)}")
             try:
                 if ask_flag("Proceed?", True):
-                    run_cli(command_str)
+                    run_cli(parts)
             except KeyboardInterrupt:
                 console.print("[yellow]Cancelled execution[/]")
                 continue
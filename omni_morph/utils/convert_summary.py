@@ -14,14 +14,20 @@ Usage as CLI:
 Usage as module:
     from omni_morph.utils.convert_summary import convert_summary
     markdown_str = convert_summary(path_to_summary_file)
+    markdown_str = convert_summary_from_df(summarize_dataframe)
+    markdown_str = convert_summary_from_df(summarize_parquet(path, table_name))
 
 Supports both local paths and cloud URLs (Azure ADLS Gen2)."""
 
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import argparse
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from omni_morph.data.filesystems import FileSystemHandler
+from omni_morph.data.formats import Format
 
 # --------------------------------------------------------------------------- #
 # 1.  Helpers                                                                  #
@@ -68,9 +74,18 @@ def _parse_summary_md(path: str) -> pd.DataFrame:
         parsed.append(parts)
 
     header, align, *data = parsed  # second row is just "---|"
-    df = pd.DataFrame(data, columns=header)
+    return _coerce_numeric(pd.DataFrame(data, columns=header))
 
-    # best‑effort numeric conversion for obvious columns
+
+def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Best-effort numeric conversion of the summary's statistic columns.
+
+    Args:
+        df: DataFrame with DuckDB's SUMMARIZE columns
+
+    Returns:
+        The same DataFrame, with convertible columns made numeric
+    """
     numeric_cols = {
         "min",
         "max",
@@ -156,7 +171,165 @@ def convert_summary(path: str) -> str:
     Returns:
         Markdown string in the format used by OmniMorph's stats command
     """
-    numeric, categorical = _split_numeric_categorical(_parse_summary_md(path))
+    return _render(_parse_summary_md(path))
+
+
+def convert_summary_from_df(df: pd.DataFrame) -> str:
+    """Convert an in-memory SUMMARIZE result to OmniMorph statistics format.
+
+    Same output as :func:`convert_summary`, without the markdown file
+    round-trip.
+
+    Args:
+        df: DataFrame returned by DuckDB for a SUMMARIZE query
+
+    Returns:
+        Markdown string in the format used by OmniMorph's stats command
+    """
+    return _render(_coerce_numeric(df.copy()))
+
+
+def summarize_parquet(
+    path: str,
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    fmt: Optional[Format] = None,
+) -> pd.DataFrame:
+    """Build a SUMMARIZE-shaped DataFrame for a Parquet file.
+
+    Row counts, null counts and numeric min/max come from the column-chunk
+    statistics in the footer; only what the footer cannot answer (mean and
+    median of numeric columns, distinct counts of the others, and any bounds
+    or null counts missing from the statistics) is computed by one DuckDB
+    aggregate query. std/q25/q75 are left empty since the report omits them.
+
+    Args:
+        path: Path to the Parquet file (local path or cloud URL)
+        table_name: Name of the view the file is exposed as in DuckDB
+        columns: Columns to summarize, in this order (default: all)
+        fmt: Format to read the file as (default: inferred from the extension)
+
+    Returns:
+        DataFrame with the columns of DuckDB's SUMMARIZE output
+    """
+    from omni_morph.data.query_engine import _sql_ident, query
+
+    fs, fs_path = FileSystemHandler.get_fs_and_path(path)
+    meta = pq.ParquetFile(fs_path, filesystem=fs).metadata
+    footer = _parquet_footer_summary(meta)
+    described = query(
+        f"DESCRIBE {_sql_ident(table_name)}", path, fmt=fmt, return_type="pandas"
+    )
+    types = dict(zip(described["column_name"], described["column_type"]))
+    if columns is None:
+        columns = list(types)
+    missing = [name for name in columns if name not in types]
+    if missing:
+        raise ValueError(f"Columns not found in {path}: {', '.join(missing)}")
+    selected = [(name, types[name]) for name in columns]
+
+    exprs = []
+    for name, sql_type in selected:
+        col = _sql_ident(name)
+        lo, hi, nulls = footer.get(name, (None, None, None))
+        if sql_type.upper() in NUMERIC_SQL_TYPES:
+            exprs += [f"avg({col})", f"approx_quantile({col}, 0.5)"]
+            if lo is None:
+                exprs += [f"min({col})", f"max({col})"]
+        else:
+            exprs.append(f"approx_count_distinct({col})")
+        if nulls is None:
+            exprs.append(f"count(*) - count({col})")
+    sql = f"SELECT {', '.join(exprs)} FROM {_sql_ident(table_name)}"
+    scanned = iter(
+        query(sql, path, fmt=fmt, return_type="arrow").to_pylist()[0].values()
+    )
+
+    rows = []
+    for name, sql_type in selected:
+        lo, hi, nulls = footer.get(name, (None, None, None))
+        avg = q50 = unique = None
+        if sql_type.upper() in NUMERIC_SQL_TYPES:
+            avg, q50 = next(scanned), next(scanned)
+            if lo is None:
+                lo, hi = next(scanned), next(scanned)
+        else:
+            unique = next(scanned)
+        if nulls is None:
+            nulls = next(scanned)
+        count = meta.num_rows
+        rows.append(
+            {
+                "column_name": name,
+                "column_type": sql_type,
+                "min": lo,
+                "max": hi,
+                "approx_unique": unique,
+                "avg": avg,
+                "std": None,
+                "q25": None,
+                "q50": q50,
+                "q75": None,
+                "count": count,
+                "null_percentage": round(nulls * 100.0 / count, 2) if count else 0.0,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _parquet_footer_summary(
+    meta: pq.FileMetaData,
+) -> Dict[str, Tuple[Optional[float], Optional[float], Optional[int]]]:
+    """Fold footer statistics into ``{column: (min, max, null_count)}``.
+
+    min/max are kept only for integer and floating columns, and any value is
+    None unless every row-group carries it for that column.
+    """
+    schema = meta.schema.to_arrow_schema()
+    numeric = {
+        f.name
+        for f in schema
+        if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)
+    }
+    folded: Dict[str, list] = {f.name: [None, None, 0] for f in schema}
+    bounds_ok = set(numeric)
+    nulls_ok = set(folded)
+    for rg in range(meta.num_row_groups):
+        group = meta.row_group(rg)
+        seen = set()
+        for j in range(group.num_columns):
+            col = group.column(j)
+            name = col.path_in_schema
+            if name not in folded:
+                continue  # leaf of a nested column
+            seen.add(name)
+            st = col.statistics
+            if st is None or not st.has_null_count:
+                nulls_ok.discard(name)
+            else:
+                folded[name][2] += st.null_count
+            if name not in bounds_ok:
+                continue
+            if st is None or not st.has_min_max:
+                bounds_ok.discard(name)
+                continue
+            lo, hi = folded[name][0], folded[name][1]
+            folded[name][0] = st.min if lo is None else min(lo, st.min)
+            folded[name][1] = st.max if hi is None else max(hi, st.max)
+        # a row-group without a chunk for the column leaves it incomplete
+        bounds_ok &= seen
+        nulls_ok &= seen
+
+    summary = {}
+    for name, (lo, hi, nulls) in folded.items():
+        if name not in bounds_ok or not meta.num_row_groups:
+            lo = hi = None
+        summary[name] = (lo, hi, nulls if name in nulls_ok else None)
+    return summary
+
+
+def _render(df: pd.DataFrame) -> str:
+    numeric, categorical = _split_numeric_categorical(df)
 
     md_out = (
         "# Numeric columns\n\n"
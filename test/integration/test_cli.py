@@ -48,6 +48,41 @@ def test_version():
     assert result.stdout.strip(), "Version should not be empty"
 
 
+def test_version_fast_path_skips_typer():
+    """A bare --version answers without importing the command tree."""
+    code = (
+        "import sys; sys.argv = ['omo-cli', '--version']\n"
+        "from omni_morph.__main__ import main; main()\n"
+        "assert 'typer' not in sys.modules and 'omni_morph.omo_cli' not in sys.modules"
+    )
+    fast = subprocess.run(
+        ["poetry", "run", "python", "-c", code], capture_output=True, text=True
+    )
+    assert fast.returncode == 0, fast.stderr
+    # combined flags fall through to the Typer callback, same answer
+    assert fast.stdout == run_cli(["--verbose", "--version"]).stdout
+    assert fast.stdout == run_cli(["-V"]).stdout == run_cli(["-v", "-V"]).stdout
+
+
+def test_head_does_not_import_query_engine():
+    """Commands load only the data modules they use."""
+    code = (
+        "import sys\n"
+        f"sys.argv = ['omo-cli', 'head', '-n', '1', {str(CSV_FILE)!r}]\n"
+        "from omni_morph.omo_cli import app\n"
+        "try:\n"
+        "    app()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert 'duckdb' not in sys.modules, 'duckdb was imported'\n"
+        "assert 'adlfs' not in sys.modules, 'adlfs was imported'"
+    )
+    result = subprocess.run(
+        ["poetry", "run", "python", "-c", code], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+
 def test_verbose():
     """Test the --verbose option."""
     result = run_cli(["--verbose", "meta", str(CSV_FILE)])
@@ -115,6 +150,21 @@ def test_tail(file_path):
     assert "Error:" in result.stderr
 
 
+def test_echo_rows_prints_in_slices(monkeypatch, capsys):
+    """Rows printed slice by slice come out exactly as one pass would."""
+    import pyarrow as pa
+
+    import omni_morph.omo_cli as cli
+
+    table = pa.table({"id": list(range(7)), "name": list("abcdefg")})
+    monkeypatch.setattr(cli, "_ECHO_ROWS_CHUNK", 3)
+    cli._echo_rows(table)
+    cli._echo_rows(table.slice(0, 0))
+    assert capsys.readouterr().out.splitlines() == [
+        repr(row) for row in table.to_pylist()
+    ]
+
+
 # Test conversion commands - these may fail due to data format issues
 # but we want to verify the CLI interface works correctly
 def test_conversion_commands():
@@ -151,6 +201,35 @@ def test_conversion_commands():
         assert result.returncode in (0, 1)
 
 
+def test_conversion_default_compression():
+    """Test that to-parquet and to-avro compress unless told otherwise."""
+    import fastavro
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        parquet_output = Path(tmpdir) / "output.parquet"
+        run_cli(["to-parquet", str(CSV_FILE), str(parquet_output)])
+        meta = pq.ParquetFile(parquet_output).metadata
+        assert meta.row_group(0).column(0).compression == "ZSTD"
+
+        avro_output = Path(tmpdir) / "output.avro"
+        run_cli(["to-avro", str(PARQUET_FILE), str(avro_output)])
+        with open(avro_output, "rb") as fo:
+            assert fastavro.reader(fo).codec == "snappy"
+
+        run_cli(
+            [
+                "to-avro",
+                str(PARQUET_FILE),
+                str(avro_output),
+                "--compression",
+                "uncompressed",
+            ]
+        )
+        with open(avro_output, "rb") as fo:
+            assert fastavro.reader(fo).codec == "null"
+
+
 # Test unimplemented commands - they should fail with exit code 1
 @pytest.mark.parametrize("file_path", [CSV_FILE, PARQUET_FILE, AVRO_FILE, JSON_FILE])
 def test_meta(file_path):
@@ -256,6 +335,77 @@ def test_stats_fast_all_formats(file_path):
         assert "|" in output, "Fast stats output should contain table formatting"
 
 
+@pytest.mark.parametrize("file_path", [CSV_FILE, PARQUET_FILE])
+@pytest.mark.parametrize("columns", [[], ["--columns", "id,first_name"]])
+def test_stats_fast_quotes_file_stem(file_path, columns):
+    """Test that stats --fast works on a file whose stem contains a quote."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = Path(tmpdir) / f'user"data{file_path.suffix}'
+        data.write_bytes(file_path.read_bytes())
+
+        result = run_cli(["stats", str(data), "--fast", *columns])
+
+    assert "first_name" in result.stdout
+
+
+def test_stats_fast_parquet_with_forced_format():
+    """Test stats --fast on a Parquet file whose extension is not .parquet."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data = Path(tmpdir) / "data.bin"
+        data.write_bytes(PARQUET_FILE.read_bytes())
+
+        result = run_cli(["stats", "--fast", "--format", "parquet", str(data)])
+
+    assert "# Numeric columns" in result.stdout
+    assert "first_name" in result.stdout
+
+
+@pytest.mark.parametrize("file_path", [CSV_FILE, PARQUET_FILE])
+def test_stats_fast_columns(file_path):
+    """Test that stats --fast summarizes only the requested columns."""
+    result = run_cli(["stats", str(file_path), "--fast", "--columns", "id,first_name"])
+    numeric, categorical = result.stdout.split("# Categorical columns")
+    rows = [line.split("|")[1].strip() for line in numeric.splitlines()[4:] if line]
+    assert rows == ["id"]
+    assert "first_name" in categorical and "last_name" not in categorical
+
+    result = run_cli(
+        ["stats", str(file_path), "--fast", "--columns", "nope"],
+        expected_exit_code=1,
+        check=False,
+    )
+    assert "nope" in result.stderr
+
+
+def test_stats_fast_parquet_matches_summarize():
+    """Test that the footer-based Parquet summary renders like SUMMARIZE."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from omni_morph.data.query_engine import query
+    from omni_morph.utils.convert_summary import (
+        convert_summary_from_df,
+        summarize_parquet,
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "rg.parquet")
+        table = pa.table(
+            {
+                "n": [5, 1, 9, 4, 7, 2],
+                # the last row-group is all-null, so it has no min/max statistics
+                "x": pa.array([3.0, 8.0, 1.0, 6.0, None, None]),
+                "s": ["a", "b", None, "a", "c", "a"],
+            }
+        )
+        pq.write_table(table, path, row_group_size=2)
+
+        summary = summarize_parquet(path, "rg")
+        assert summary.set_index("column_name").loc["x", "min"] == 1.0
+        expected = query("SUMMARIZE rg", path, return_type="pandas")
+        assert convert_summary_from_df(summary) == convert_summary_from_df(expected)
+
+
 def test_merge():
     """Test the merge command."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -405,3 +555,136 @@ def test_query():
     )
     assert result.returncode == 1
     assert "Error" in result.stderr
+
+
+def test_query_does_not_share_views_between_calls():
+    """Test that repeated in-process queries don't see each other's views."""
+    from omni_morph.data.query_engine import query, validate_sql
+
+    csv_tbl = query(
+        "SELECT COUNT(*) AS n FROM userdata1", CSV_FILE, return_type="arrow"
+    )
+    parquet_tbl = query(
+        "SELECT COUNT(*) AS n FROM userdata1", PARQUET_FILE, return_type="arrow"
+    )
+    assert csv_tbl["n"][0].as_py() == parquet_tbl["n"][0].as_py() == 1000
+
+    # A view registered by an earlier call must not leak into a later one
+    assert validate_sql("SELECT * FROM userdata1", JSON_FILE) is not None
+
+
+def test_query_statements_do_not_outlive_the_call():
+    """Tables and settings created by user SQL end with the query call."""
+    from omni_morph.data.query_engine import QueryError, query
+
+    query("CREATE TABLE leaked AS SELECT 42 AS x", CSV_FILE)
+    with pytest.raises(QueryError):
+        query("SELECT * FROM leaked", CSV_FILE, return_type="arrow")
+
+    query("SET threads = 3", CSV_FILE)
+    tbl = query("SELECT current_setting('threads') AS t", CSV_FILE, return_type="arrow")
+    assert tbl["t"][0].as_py() != 3
+
+
+def test_query_markdown_renders_timestamps_and_booleans(capsys):
+    """Whole-second timestamps print without a zero fraction, booleans as True."""
+    from omni_morph.data.query_engine import query
+
+    query(
+        "SELECT registration_dttm, id = 1 AS first FROM userdata1 LIMIT 2",
+        PARQUET_FILE,
+    )
+    out = capsys.readouterr().out
+    assert "| 2016-02-03 07:55:29 | True |" in out
+    assert "| 2016-02-03 17:04:03 | False |" in out
+
+
+def test_validate_sql_returns_bound_schema_on_failure():
+    """A failed validation hands back the view's schema for the AI prompt."""
+    from omni_morph.data.query_engine import validate_sql
+
+    error, schema_txt = validate_sql(
+        "SELECT no_such_col FROM userdata1", CSV_FILE, with_schema=True
+    )
+    assert error is not None
+    names = [f["name"] for f in json.loads(schema_txt)["fields"]]
+    assert "first_name" in names
+
+    assert validate_sql("SELECT id FROM userdata1", CSV_FILE, with_schema=True) == (
+        None,
+        None,
+    )
+
+
+def test_validate_sql_reports_syntax_errors_without_opening_source():
+    """A syntax error is caught by the parser before the source is read."""
+    from omni_morph.data.query_engine import validate_sql
+
+    error = validate_sql("SELEC id FROM missing", "no/such/missing.parquet")
+    assert error is not None and "syntax error" in error
+
+    error, schema_txt = validate_sql(
+        "SELEC id FROM userdata1", CSV_FILE, with_schema=True
+    )
+    assert "syntax error" in error
+    assert json.loads(schema_txt)["fields"]
+
+
+def test_query_session_registers_source_once(monkeypatch):
+    """Validation and execution in one session share a single view."""
+    import omni_morph.data.query_engine as qe
+
+    calls = []
+    register = qe._register_source
+    monkeypatch.setattr(
+        qe, "_register_source", lambda *a, **kw: calls.append(a) or register(*a, **kw)
+    )
+
+    sql = "SELECT COUNT(*) AS n FROM userdata1"
+    with qe.QuerySession(PARQUET_FILE) as session:
+        assert qe.validate_sql(sql, PARQUET_FILE, session=session) is None
+        tbl = qe.query(sql, PARQUET_FILE, return_type="arrow", session=session)
+    assert tbl["n"][0].as_py() == 1000
+    assert len(calls) == 1
+
+
+def test_query_validates_only_rejected_sql(monkeypatch, capsys):
+    """The query command runs valid SQL without a separate validation pass."""
+    import omni_morph.data.query_engine as qe
+    import omni_morph.omo_cli as cli
+
+    calls = []
+    validate = qe.validate_sql
+    monkeypatch.setattr(
+        qe, "validate_sql", lambda *a, **kw: calls.append(a) or validate(*a, **kw)
+    )
+    monkeypatch.setattr(qe, "ai_suggest", lambda *a, **kw: None)
+
+    cli.app(
+        ["query", str(CSV_FILE), "SELECT max(id) AS m FROM userdata1"],
+        standalone_mode=False,
+    )
+    assert "1000" in capsys.readouterr().out
+    assert calls == []
+
+    cli.app(
+        ["query", str(CSV_FILE), "SELECT idd FROM userdata1"],
+        standalone_mode=False,
+    )
+    out = capsys.readouterr().out
+    assert "SQL validation failed" in out and "idd" in out
+    assert len(calls) == 1
+
+
+def test_threads_option_limits_duckdb():
+    """The global --threads option reaches DuckDB."""
+    result = run_cli(
+        [
+            "--threads",
+            "2",
+            "query",
+            str(PARQUET_FILE),
+            "SELECT current_setting('threads') AS t",
+        ]
+    )
+    assert "| 2 |" in result.stdout
@@ -3,6 +3,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
+import pyarrow as pa
 import pyarrow.parquet as pq
 
 # Path to the test data directory
@@ -192,3 +193,169 @@ def test_merge_error_handling(input_files, expected_exit_code, error_pattern):
 
         # Verify error message
         assert error_pattern in result.stderr
+
+
+def test_merge_preserves_source_order(monkeypatch):
+    """Test that concurrent read-ahead keeps rows in source order."""
+    import omni_morph.data.merging as merging
+    from omni_morph.data.merging import merge_files
+
+    # exercise the batch-wise path, not the DuckDB COPY shortcut
+    monkeypatch.setattr(merging, "_duckdb_parquet_merge", lambda *a: None)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "merged_ordered.parquet"
+
+        # Small chunks and few workers force several batches per source
+        merge_files(
+            [str(f) for f in PARQUET_FILES],
+            str(output_path),
+            chunksize=100,
+            max_workers=2,
+        )
+
+        expected = pa.concat_tables([pq.read_table(f) for f in PARQUET_FILES])
+        assert pq.read_table(output_path).equals(expected)
+
+
+def test_prefetch_abort_skips_queued_sources(monkeypatch):
+    """Test that sources not yet started are never opened after an abort."""
+    import omni_morph.data.merging as merging
+
+    opened = []
+
+    def fake_reader(src, chunksize):
+        opened.append(src)
+        # more batches than the queue holds, so the worker blocks on s0
+        for _ in range(100):
+            yield pa.table({"src": [src]})
+
+    monkeypatch.setattr(merging, "_batch_reader", fake_reader)
+
+    sources = [f"s{i}" for i in range(20)]
+    batches = merging._prefetch_batches(sources, 100, max_workers=1)
+    assert next(batches).column("src").to_pylist() == ["s0"]
+    batches.close()
+
+    # the only worker was still busy with s0 when the merge was aborted
+    assert opened == ["s0"]
+
+
+def test_merge_to_avro_writes_single_container():
+    """Test that batches merged to Avro land in one readable container file."""
+    import fastavro
+
+    from omni_morph.data.merging import merge_files
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "merged.avro"
+
+        merge_files([str(f) for f in PARQUET_FILES], str(output_path), chunksize=250)
+
+        with open(output_path, "rb") as fo:
+            records = list(fastavro.reader(fo))
+
+        expected = sum(pq.read_metadata(f).num_rows for f in PARQUET_FILES)
+        assert len(records) == expected
+        assert isinstance(records[0]["registration_dttm"], str)
+
+
+def test_reconcile_schema_names_only_failing_column():
+    """Test that a failed cast reports the one column that could not be cast."""
+    from omni_morph.data.exceptions import ExtractError
+    from omni_morph.data.merging import _reconcile_schema
+
+    tbl = pa.table({"a": ["1", "2"], "b": ["x", "3"]})
+    target = pa.schema([("a", pa.int64()), ("b", pa.int64())])
+
+    with pytest.raises(ExtractError, match=r"^Cannot cast column b: "):
+        _reconcile_schema(tbl, target)
+
+
+def test_merge_nested_columns_to_csv():
+    """Test that nested columns are written to CSV as text, not rejected."""
+    from omni_morph.data.merging import merge_files
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "nested.jsonl"
+        source.write_text(
+            '{"id": 1, "n": {"a": 1, "b": [1, 2]}}\n{"id": 2, "n": null}\n'
+        )
+        output_path = Path(tmpdir) / "merged.csv"
+
+        merge_files([str(source), str(source)], str(output_path))
+
+        lines = output_path.read_text().splitlines()
+        assert lines[1] == "1,\"{'a': 1, 'b': [1, 2]}\""
+        assert lines[2] == "2,"
+        assert len(lines) == 5
+
+
+def test_merge_concurrency_option():
+    """Test that --concurrency is accepted and only Azure sources read ahead."""
+    from omni_morph.data.filesystems import FileSystemHandler
+
+    assert FileSystemHandler.is_remote("abfss://c@acct.dfs.core.windows.net/a.csv")
+    assert not FileSystemHandler.is_remote(str(PARQUET_FILES[0]))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "merged.parquet"
+        args = ["merge", *map(str, PARQUET_FILES), str(output_path)]
+        run_cli(args + ["--concurrency", "4"])
+
+        expected = pa.concat_tables([pq.read_table(f) for f in PARQUET_FILES])
+        assert pq.read_table(output_path).equals(expected)
+
+
+def test_azure_settings_accept_both_key_spellings(monkeypatch):
+    """Test that Azure settings apply with or without the azure_ prefix."""
+    from omni_morph.data.filesystems import FileSystemHandler
+
+    monkeypatch.setattr(FileSystemHandler, "_azure_credentials", {"account_name": None})
+    monkeypatch.setattr(
+        FileSystemHandler, "_azure_transfer", {"read_concurrency": None}
+    )
+    monkeypatch.setattr(FileSystemHandler, "_applied_settings", ())
+
+    FileSystemHandler.set_azure_credentials(
+        {"azure_account_name": "acct", "read_concurrency": 8, "threads": 2}
+    )
+
+    assert FileSystemHandler._azure_credentials == {"account_name": "acct"}
+    assert FileSystemHandler._azure_transfer == {"read_concurrency": 8}
+
+
+def test_merge_same_schema_parquet_uses_duckdb(monkeypatch):
+    """Test that same-schema Parquet inputs merge via DuckDB with identical output."""
+    import omni_morph.data.merging as merging
+
+    copied = []
+    copy = merging._duckdb_parquet_merge
+    monkeypatch.setattr(
+        merging,
+        "_duckdb_parquet_merge",
+        lambda *a: copied.append(copy(*a)) or copied[-1],
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # the sample files hold legacy INT96 timestamps; rewrite them as INT64
+        sources = []
+        for f in PARQUET_FILES:
+            sources.append(str(Path(tmpdir) / f.name))
+            pq.write_table(pq.read_table(f), sources[-1])
+        output_path = Path(tmpdir) / "merged.parquet"
+        merging.merge_files(sources, str(output_path), progress=True)
+        assert copied == [4000]
+        expected = pa.concat_tables([pq.read_table(f) for f in sources])
+        assert pq.read_table(output_path).equals(expected)
+
+        # INT96 timestamps, and types DuckDB would rewrite, keep the batch path
+        odd = Path(tmpdir) / "odd.parquet"
+        pq.write_table(pa.table({"s": pa.array(["a"], pa.large_string())}), odd)
+        for inputs in ([str(PARQUET_FILES[0])], [str(odd), str(odd)]):
+            assert copy(inputs, str(output_path)) is None
+        merging.merge_files([str(odd), str(odd)], str(output_path))
+        assert pq.read_schema(output_path).field("s").type == pa.large_string()
+
+        # as do differing schemas
+        assert copy([sources[0], str(odd)], str(output_path)) is None
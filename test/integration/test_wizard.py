@@ -1,3 +1,4 @@
+import shlex
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -67,7 +68,7 @@ def test_build_command_head():
         patch("omni_morph.omo_wizard.ask_path", return_value=str(CSV_FILE)),
         patch("omni_morph.omo_wizard.ask_int", return_value=5),
     ):
-        command_str = build_command("head")
+        command_str = shlex.join(build_command("head"))
 
         assert "omo-cli head" in command_str
         assert "--number 5" in command_str
@@ -80,7 +81,7 @@ def test_build_command_tail():
         patch("omni_morph.omo_wizard.ask_path", return_value=str(CSV_FILE)),
         patch("omni_morph.omo_wizard.ask_int", return_value=5),
     ):
-        command_str = build_command("tail")
+        command_str = shlex.join(build_command("tail"))
 
         assert "omo-cli tail" in command_str
         assert "--number 5" in command_str
@@ -96,7 +97,7 @@ def test_build_command_stats():
         patch("omni_morph.omo_wizard.ask_int", return_value=2048),
         patch("omni_morph.omo_wizard.ask_flag", side_effect=[False, True, True]),
     ):  # [fast=False, markdown=True, other options=True]
-        command_str = build_command("stats")
+        command_str = shlex.join(build_command("stats"))
 
         assert "omo-cli stats" in command_str
         assert "--markdown" in command_str
@@ -106,13 +107,14 @@ def test_build_command_stats():
     # Test with fast mode enabled
     with (
         patch("omni_morph.omo_wizard.ask_path", return_value=str(CSV_FILE)),
-        patch("omni_morph.omo_wizard.ask_text", return_value="json"),
+        patch("omni_morph.omo_wizard.ask_text", side_effect=["id,salary", "json"]),
         patch("omni_morph.omo_wizard.ask_flag", side_effect=[True, True]),
     ):  # [fast=True, format=True]
-        command_str = build_command("stats")
+        command_str = shlex.join(build_command("stats"))
 
         assert "omo-cli stats" in command_str
         assert "--fast" in command_str
+        assert "--columns id,salary" in command_str
         assert "--format json" in command_str
         assert str(CSV_FILE) in command_str
         # These options should not be present with --fast
@@ -128,7 +130,7 @@ def test_build_command_to_json():
         patch("omni_morph.omo_wizard.ask_output_path", return_value=output_file),
         patch("omni_morph.omo_wizard.ask_flag", return_value=True),
     ):
-        command_str = build_command("to-json")
+        command_str = shlex.join(build_command("to-json"))
 
         assert "omo-cli to-json" in command_str
         assert "--pretty" in command_str
@@ -146,7 +148,7 @@ def test_build_command_random_sample():
         patch("omni_morph.omo_wizard.ask_text", side_effect=["0.1", "42"]),
         patch("omni_morph.omo_wizard.ask_flag", return_value=False),
     ):
-        command_str = build_command("random-sample")
+        command_str = shlex.join(build_command("random-sample"))
 
         assert "omo-cli random-sample" in command_str
         assert "--n 100" in command_str
@@ -164,7 +166,7 @@ def test_build_command_query():
         patch("omni_morph.omo_wizard.ask_text", side_effect=["json", sql_query]),
         patch("omni_morph.omo_wizard.ask_flag", return_value=True),
     ):
-        command_str = build_command("query")
+        command_str = shlex.join(build_command("query"))
 
         assert "omo-cli query" in command_str
         assert "--format json" in command_str
@@ -204,7 +206,7 @@ def test_head_command_with_different_files(file_path):
         patch("omni_morph.omo_wizard.ask_path", return_value=str(file_path)),
         patch("omni_morph.omo_wizard.ask_int", return_value=5),
     ):
-        command_str = build_command("head")
+        command_str = shlex.join(build_command("head"))
 
         assert "omo-cli head" in command_str
         assert "--number 5" in command_str
@@ -221,7 +223,7 @@ def test_stats_command_with_options(file_path):
         patch("omni_morph.omo_wizard.ask_int", return_value=2048),
         patch("omni_morph.omo_wizard.ask_flag", side_effect=[False, True, True]),
     ):  # [fast=False, markdown=True, other options=True]
-        command_str = build_command("stats")
+        command_str = shlex.join(build_command("stats"))
 
         assert "omo-cli stats" in command_str
         assert "--markdown" in command_str
@@ -231,10 +233,10 @@ def test_stats_command_with_options(file_path):
     # Test with fast mode enabled
     with (
         patch("omni_morph.omo_wizard.ask_path", return_value=str(file_path)),
-        patch("omni_morph.omo_wizard.ask_text", return_value="parquet"),
+        patch("omni_morph.omo_wizard.ask_text", side_effect=["", "parquet"]),
         patch("omni_morph.omo_wizard.ask_flag", side_effect=[True, True]),
     ):  # [fast=True, format=True]
-        command_str = build_command("stats")
+        command_str = shlex.join(build_command("stats"))
 
         assert "omo-cli stats" in command_str
         assert "--fast" in command_str
@@ -253,7 +255,7 @@ def test_to_json_command_with_options():
         patch("omni_morph.omo_wizard.ask_output_path", return_value=output_file),
         patch("omni_morph.omo_wizard.ask_flag", return_value=True),
     ):
-        command_str = build_command("to-json")
+        command_str = shlex.join(build_command("to-json"))
 
         assert "omo-cli to-json" in command_str
         assert "--pretty" in command_str
@@ -271,7 +273,7 @@ def test_random_sample_command_with_options():
         patch("omni_morph.omo_wizard.ask_text", side_effect=["0.1", "42"]),
         patch("omni_morph.omo_wizard.ask_flag", return_value=False),
     ):
-        command_str = build_command("random-sample")
+        command_str = shlex.join(build_command("random-sample"))
 
         assert "omo-cli random-sample" in command_str
         assert "--n 100" in command_str
@@ -289,9 +291,138 @@ def test_query_command_with_options():
         patch("omni_morph.omo_wizard.ask_text", side_effect=["json", sql_query]),
         patch("omni_morph.omo_wizard.ask_flag", return_value=True),
     ):
-        command_str = build_command("query")
+        command_str = shlex.join(build_command("query"))
 
         assert "omo-cli query" in command_str
         assert "--format json" in command_str
         assert str(CSV_FILE) in command_str
         assert sql_query in command_str
+
+
+def test_build_command_merge():
+    """The merge command passes the chosen read-ahead concurrency."""
+    with (
+        patch("omni_morph.omo_wizard.ask_flag", side_effect=[True, False]),
+        patch("omni_morph.omo_wizard.ask_int", return_value=4),
+        patch("omni_morph.omo_wizard.ask_path", return_value=[CSV_FILE, CSV_FILE]),
+        patch("omni_morph.omo_wizard.ask_output_path", return_value="merged.csv"),
+    ):
+        parts = build_command("merge")
+
+    assert parts == [
+        "omo-cli",
+        "merge",
+        "--allow-cast",
+        "--concurrency",
+        "4",
+        str(CSV_FILE),
+        str(CSV_FILE),
+        "merged.csv",
+    ]
+
+
+def test_run_cli_runs_command_in_process(capsys):
+    """run_cli invokes omo-cli in the wizard's process, without a shell."""
+    from omni_morph.omo_wizard import run_cli
+
+    with patch("subprocess.Popen", side_effect=AssertionError("no subprocess")):
+        run_cli(["omo-cli", "head", "--number", "1", str(CSV_FILE)])
+        run_cli(["omo-cli", "head", "no such file.csv"])
+    out = capsys.readouterr().out
+    assert "'first_name': 'Amanda'" in out
+    assert "Done" in out
+    assert "no such file.csv" in out
+    assert "omo-cli exited with code 1" in out
+
+
+def test_run_cli_subprocess_fallback(monkeypatch, capsys):
+    """OMO_WIZARD_SUBPROCESS=1 runs the command in a child process."""
+    from omni_morph.omo_wizard import run_cli
+
+    monkeypatch.setenv("OMO_WIZARD_SUBPROCESS", "1")
+    with patch("omni_morph.omo_wizard._invoke_cli", side_effect=AssertionError):
+        run_cli(["omo-cli", "head", "--number", "1", str(CSV_FILE)])
+    out = capsys.readouterr().out
+    assert "'first_name': 'Amanda'" in out
+    assert "Done" in out
+
+
+def test_handle_sql_suggestion_runs_unfenced_sql():
+    """An unfenced suggestion is found by its keyword, in any case."""
+    from omni_morph.omo_wizard import handle_sql_suggestion
+
+    lines = ["💡 Suggested fix:", "", "select id", "from userdata1;", "more text"]
+    with (
+        patch("omni_morph.omo_wizard.ask_flag", return_value=True),
+        patch("omni_morph.omo_wizard.run_cli") as run_cli,
+    ):
+        assert handle_sql_suggestion(["omo-cli", "query", "f.csv", "SELEC"], lines)
+
+    run_cli.assert_called_once_with(
+        ["omo-cli", "query", "f.csv", "select id\nfrom userdata1"]
+    )
+
+    # no suggestion marker on any line: nothing is parsed or run
+    with patch("omni_morph.omo_wizard.run_cli") as run_cli:
+        assert not handle_sql_suggestion(["omo-cli", "query"], ["select id from t;"])
+    run_cli.assert_not_called()
+
+
+def test_main_menu_lists_each_choice_once(monkeypatch):
+    """The menu offers forget file only while a file is remembered."""
+    import omni_morph.omo_wizard as wizard
+
+    select = MagicMock()
+    select.return_value.execute.return_value = "QUIT"
+    monkeypatch.setattr(wizard.inquirer, "select", select)
+    for remembered in (None, str(CSV_FILE)):
+        monkeypatch.setattr(wizard, "REMEMBERED_FILE_PATH", remembered)
+        with pytest.raises(SystemExit):
+            wizard.app()
+        choices = select.call_args.kwargs["choices"]
+        assert len(choices) == len(set(choices))
+        assert ("forget file" in choices) == bool(remembered)
+        assert choices[-1] == "QUIT" and "remember file" in choices
+
+
+def test_build_command_returns_argv_list():
+    """Paths with quotes or spaces reach omo-cli as a single argument."""
+    odd_path = 'it\'s a "file".csv'
+    with (
+        patch("omni_morph.omo_wizard.ask_path", return_value=odd_path),
+        patch("omni_morph.omo_wizard.ask_int", return_value=5),
+    ):
+        parts = build_command("head")
+
+    assert parts == ["omo-cli", "head", "--number", "5", odd_path]
+
+
+def test_ask_path_stats_each_file_once(monkeypatch):
+    """A path confirmed to be a file is not stat'ed again in the session."""
+    import omni_morph.omo_wizard as wizard
+
+    monkeypatch.setattr(wizard, "_KNOWN_FILES", set())
+    monkeypatch.setattr(wizard, "REMEMBERED_FILE_PATH", None)
+    calls = []
+    is_file = Path.is_file
+    monkeypatch.setattr(
+        Path, "is_file", lambda self: calls.append(self) or is_file(self)
+    )
+    mock_inquirer_responses(monkeypatch, [str(CSV_FILE), str(CSV_FILE), ""])
+
+    assert wizard.ask_path("Files", multi=True) == [str(CSV_FILE)] * 2
+    assert wizard._is_file(str(CSV_FILE))
+    assert len(calls) == 1
+
+
+def test_check_commands_rejects_typos():
+    """Misspelt kinds or keys in the registry fail at import, not silently."""
+    from omni_morph.omo_wizard import _check_commands
+
+    _check_commands(COMMANDS)
+    for arg in (
+        {"name": "file", "kind": "pth", "positional": True},
+        {"name": "--n", "kind": "int", "defualt": 3},
+    ):
+        with pytest.raises(ValueError, match="Invalid argument spec"):
+            _check_commands({"head": {"args": [arg]}})
@@ -59,3 +59,43 @@ def test_conversion_roundtrip(tmp_path: Path, sample_table: pa.Table, src_fmt, d
     assert _normalize_string_types(sample_table).equals(
         _normalize_string_types(roundtrip)
     ), f"{src_fmt}->{dst_fmt} mismatch"
+
+
+def test_has_nested_types():
+    from omni_morph.data.converter import has_nested_types
+
+    flat = pa.schema([("a", pa.int64()), ("b", pa.string()), ("c", pa.timestamp("us"))])
+    assert not has_nested_types(flat)
+    for nested in (
+        pa.list_(pa.int32()),
+        pa.large_list(pa.string()),
+        pa.list_(pa.float64(), 3),
+        pa.list_view(pa.int16()),
+        pa.struct([("x", pa.int8())]),
+        pa.map_(pa.string(), pa.int64()),
+        pa.dense_union([pa.field("i", pa.int8())]),
+    ):
+        assert has_nested_types(flat.append(pa.field("n", nested)))
+
+
+@pytest.mark.parametrize(
+    "dst_fmt", [f for f in all_formats if f is not omd.Format.PARQUET]
+)
+def test_convert_batches_matches_convert(
+    tmp_path: Path, sample_table: pa.Table, dst_fmt
+):
+    """Streaming a multi-row-group Parquet file gives the same output as convert()."""
+    import pyarrow.parquet as pq
+
+    from omni_morph.data.converter import convert_batches
+
+    src_file = tmp_path / "file.parquet"
+    pq.write_table(sample_table, src_file, row_group_size=1)
+    ext = dst_fmt.name.lower()
+
+    omd.convert(src_file, tmp_path / f"whole.{ext}", dst_fmt=dst_fmt)
+    convert_batches(src_file, tmp_path / f"batched.{ext}", dst_fmt=dst_fmt)
+
+    assert omd.read(tmp_path / f"whole.{ext}", fmt=dst_fmt).equals(
+        omd.read(tmp_path / f"batched.{ext}", fmt=dst_fmt)
+    )
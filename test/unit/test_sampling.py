@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the sampling module."""
+
+import random
+
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as papq
+
+from omni_morph.data.sampling import (
+    csv_sample,
+    jsonl_sample,
+    parquet_sample,
+    streaming_sample,
+)
+
+
+# --- Fixtures --- #
+
+
+@pytest.fixture
+def multi_rg_parquet(tmp_path):
+    """A Parquet file split into many small, uneven row-groups."""
+    table = pa.table({"id": list(range(1000)), "val": [i * 0.5 for i in range(1000)]})
+    path = tmp_path / "multi_rg.parquet"
+    papq.write_table(table, path, row_group_size=37)
+    return str(path)
+
+
+# --- Tests --- #
+
+
+@pytest.mark.parametrize(
+    "n, fraction, replace",
+    [(50, None, False), (None, 0.2, False), (None, 0.02, False), (30, None, True)],
+)
+def test_parquet_sample_reads_matching_rows(multi_rg_parquet, n, fraction, replace):
+    """Test that rows taken from the needed row-groups match a full read."""
+    sample = parquet_sample(
+        multi_rg_parquet, n, fraction, random.Random(3), replace, limit=0
+    )
+
+    ids = sample["id"].to_pylist()
+    assert ids == sorted(ids)
+    full = papq.read_table(multi_rg_parquet)
+    assert sample.equals(full.take(pa.array(ids)))
+    if n is not None:
+        assert sample.num_rows == n
+
+
+def test_streaming_sample_reservoir_keeps_n_distinct():
+    """Test that the skipping reservoir keeps n distinct records."""
+    records = ({"id": i} for i in range(500))
+
+    sample = streaming_sample(
+        records, 20, None, random.Random(5), replace=False, limit=0
+    )
+
+    ids = sample["id"].to_pylist()
+    assert len(ids) == len(set(ids)) == 20
+    assert all(0 <= i < 500 for i in ids)
+    # with 500 records and 20 slots, replacements must reach past the prefix
+    assert max(ids) >= 20
+
+
+@pytest.mark.parametrize("limit", [1 << 40, 0])
+def test_jsonl_sample_small_and_streaming_paths(tmp_path, limit):
+    """Test JSONL sampling via the Arrow reader and the streaming iterator."""
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(f'{{"id": {i}}}\n' for i in range(200)) + "\n")
+
+    sample = jsonl_sample(str(path), 25, None, random.Random(7), False, limit)
+
+    ids = sample["id"].to_pylist()
+    assert len(set(ids)) == 25
+    assert all(0 <= i < 200 for i in ids)
+
+
+@pytest.mark.parametrize("limit", [1 << 40, 0])
+def test_jsonl_sample_keeps_timestamp_text(tmp_path, limit):
+    """Timestamp-like strings come back as written on both JSONL paths."""
+    path = tmp_path / "ts.jsonl"
+    path.write_text('{"ts": "2024-01-09T10:00:00Z", "x": 1}\n')
+
+    sample = jsonl_sample(str(path), None, 1.0, random.Random(1), False, limit)
+
+    assert sample.to_pylist() == [{"ts": "2024-01-09T10:00:00Z", "x": 1}]
+
+
+def test_jsonl_sample_indexed_path_handles_blank_and_unterminated_lines(tmp_path):
+    """Test that the newline index skips blank lines and keeps the last line."""
+    path = tmp_path / "ragged.jsonl"
+    path.write_bytes(b'{"id": 0}\n\n{"id": 1}\r\n{"id": 2}\n\n{"id": 3}')
+
+    sample = jsonl_sample(str(path), 10, None, random.Random(1), False, limit=0)
+
+    assert sorted(sample["id"].to_pylist()) == [0, 1, 2, 3]
+
+
+def test_jsonl_sample_indexed_path_returns_n_despite_whitespace_lines(tmp_path):
+    """Test that whitespace-only lines never take a slot in an indexed sample."""
+    path = tmp_path / "crlf.jsonl"
+    body = b"".join(b'{"id": %d}\r\n\r\n' % i for i in range(1000))
+    path.write_bytes(body + b"   \n\t\n")
+
+    sample = jsonl_sample(str(path), 100, None, random.Random(1), False, limit=0)
+
+    assert sample.num_rows == 100
+
+
+def test_jsonl_line_index_cache_is_size_bounded(tmp_path, monkeypatch):
+    """Test that an index above the cache bound is not kept between calls."""
+    from omni_morph.data import sampling
+
+    path = tmp_path / "rows.jsonl"
+    path.write_text("".join(f'{{"id": {i}}}\n' for i in range(50)))
+    monkeypatch.setattr(sampling, "_index_cache", {})
+
+    jsonl_sample(str(path), 5, None, random.Random(1), False, limit=0)
+    assert len(sampling._index_cache) == 1
+
+    monkeypatch.setattr(sampling, "_INDEX_CACHE_BYTES", 16 * 49)
+    path.write_text("".join(f'{{"id": {i}}}\n' for i in range(60)))
+    jsonl_sample(str(path), 5, None, random.Random(1), False, limit=0)
+    assert sampling._index_cache == {}
+
+
+@pytest.mark.parametrize("limit", [1 << 40, 0])
+def test_csv_sample_small_and_streaming_paths(tmp_path, limit):
+    """Test CSV sampling via the Arrow reader and the streaming iterator."""
+    path = tmp_path / "rows.csv"
+    path.write_text("id,name\n" + "".join(f"{i},n{i}\n" for i in range(200)))
+
+    sample = csv_sample(str(path), 25, None, random.Random(7), False, limit)
+
+    assert sample.column_names == ["id", "name"]
+    ids = [int(i) for i in sample["id"].to_pylist()]
+    assert len(set(ids)) == 25
+    assert sample["name"].to_pylist() == [f"n{i}" for i in ids]
+
+
+@pytest.mark.parametrize("limit", [1 << 40, 0])
+def test_csv_sample_keeps_text_and_ragged_rows(tmp_path, limit):
+    """Both CSV paths return the file's text, short rows padded with nulls."""
+    path = tmp_path / "ragged.csv"
+    path.write_text("a,b,c\n00017,2024-01-02,x\n4,5\n")
+
+    sample = csv_sample(str(path), None, 1.0, random.Random(1), False, limit)
+
+    assert sample.to_pylist() == [
+        {"a": "00017", "b": "2024-01-02", "c": "x"},
+        {"a": "4", "b": "5", "c": None},
+    ]
+
+
+@pytest.mark.parametrize("n, fraction", [(15, None), (None, 0.3)])
+def test_streaming_sample_batched_input(n, fraction):
+    """Test that batch-yielding iterators sample like record iterators."""
+    batches = ([{"id": i} for i in range(s, s + 50)] for s in range(0, 400, 50))
+
+    sample = streaming_sample(
+        batches, n, fraction, random.Random(11), False, limit=0, batched=True
+    )
+
+    ids = sample["id"].to_pylist()
+    assert len(ids) == len(set(ids))
+    assert all(0 <= i < 400 for i in ids)
+    if n is not None:
+        assert len(ids) == n
+    else:
+        assert 60 < len(ids) < 180
+
+
+def test_sample_batches_streams_dense_parquet_fraction(multi_rg_parquet, monkeypatch):
+    """Test that a streamed dense sample selects the same rows as sample()."""
+    import omni_morph.data.sampling as sampling_mod
+    from omni_morph.data.converter import write_batches
+    from omni_morph.data.extractor import sample, sample_batches
+
+    monkeypatch.setattr(sampling_mod, "_PARQUET_STREAM_ROWS", 100)
+    tables = list(sample_batches(multi_rg_parquet, fraction=0.3, seed=5))
+    assert len(tables) > 1 and all(t.num_rows for t in tables)
+    expected = sample(multi_rg_parquet, fraction=0.3, seed=5)
+    assert pa.concat_tables(tables).equals(expected)
+
+    out = multi_rg_parquet.replace(".parquet", "_sample.parquet")
+    write_batches(iter(tables), out)
+    assert papq.read_table(out).equals(expected)
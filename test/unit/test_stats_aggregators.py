@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the statistics aggregators."""
+
+import json
+import math
+import statistics
+
+import pytest
+import pyarrow as pa
+
+import numpy as np
+
+from omni_morph.data.statistics import _CatAgg, _NumAgg, _Reservoir, get_stats
+
+
+# --- Tests --- #
+
+
+def test_num_agg_update_arrow_merges_batches():
+    """Chunk-wise Arrow updates agree with a plain Python pass."""
+    values = [3.5, None, -1.0, float("nan"), 10.25, 7.0, None, 2.0, 0.5]
+    agg = _NumAgg()
+    agg.update_arrow(pa.chunked_array([values[:4], values[4:]]))
+    agg.update_arrow(pa.chunked_array([[]], type=pa.float64()))
+    agg.update_arrow(pa.chunked_array([[4.0, 5.0]]))
+
+    clean = [v for v in values + [4.0, 5.0] if v is not None and not math.isnan(v)]
+    out = agg.finish()
+    assert out["count"] == len(clean)
+    assert out["min"] == min(clean)
+    assert out["max"] == max(clean)
+    assert out["mean"] == pytest.approx(statistics.fmean(clean))
+    assert agg.sumsq == pytest.approx(sum(v * v for v in clean))
+
+
+def test_num_agg_update_arrow_keeps_integer_bounds():
+    agg = _NumAgg()
+    agg.update_arrow(pa.chunked_array([[5, None, 1, 9]], type=pa.int64()))
+    out = agg.finish()
+    assert (out["count"], out["min"], out["max"]) == (3, 1, 9)
+    assert isinstance(out["min"], int)
+    assert out["mean"] == pytest.approx(5.0)
+
+
+def test_cat_agg_update_arrow_matches_python_path():
+    values = ["a", None, "b", "", "a", "c", "a", None]
+    arrow_agg, py_agg = _CatAgg(), _CatAgg()
+    arrow_agg.update_arrow(pa.chunked_array([values[:3], values[3:]]))
+    py_agg.update(values)
+    assert arrow_agg.counter == py_agg.counter
+    assert arrow_agg.finish() == py_agg.finish()
+    assert arrow_agg.counter["__NULL__"] == 3
+
+
+def test_cat_agg_promotes_to_hll_past_max_card():
+    pytest.importorskip("datasketch")
+    agg = _CatAgg(max_card=100)
+    agg.update_arrow(pa.chunked_array([[str(i) for i in range(5000)]]))
+    assert agg.hll is not None
+    assert agg.finish()["distinct"] == pytest.approx(5000, rel=0.05)
+
+
+def test_cat_agg_drops_counter_and_keeps_heavy_hitters():
+    pytest.importorskip("datasketch")
+    agg = _CatAgg(max_card=100, top_k=16)
+    agg.update_arrow(pa.chunked_array([["hot"] * 500 + ["warm"] * 200]))
+    agg.update_arrow(pa.chunked_array([[str(i) for i in range(3000)]]))
+    agg.update(["hot", "warm", None])
+    assert agg.counter is None
+    top = agg.finish()["top5"]
+    assert [t["value"] for t in top[:2]] == ["hot", "warm"]
+    assert top[0]["count"] >= 501
+
+
+def test_jsonl_stats_buffer_mixed_columns(tmp_path):
+    rows = [
+        {"n": 1, "x": 0.5, "s": "a", "flag": True},
+        {"n": 2, "x": None, "s": "b", "flag": 3},
+        {"n": 3, "x": 2.5, "s": "a", "flag": False},
+    ]
+    path = tmp_path / "mixed.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    stats = get_stats(path, columns=["n", "x", "s", "flag"])
+    assert stats["n"] == {
+        "type": "numeric",
+        "count": 3,
+        "min": 1,
+        "max": 3,
+        "mean": 2.0,
+        "median": stats["n"]["median"],
+    }
+    assert (stats["x"]["count"], stats["x"]["mean"]) == (2, 1.5)
+    assert stats["s"]["top5"][0] == {"value": "a", "count": 2}
+    # bools mixed with ints cannot become one Arrow array; fall back per value
+    assert (stats["flag"]["count"], stats["flag"]["max"]) == (3, 3)
+
+
+def test_parquet_stats_use_footer_bounds_only_when_complete(tmp_path):
+    import pyarrow.parquet as papq
+
+    path = tmp_path / "rg.parquet"
+    table = pa.table(
+        {
+            "full": [5, 1, 9, 4, 7, 2],
+            # the last row-group is all-null, so it has no min/max statistics
+            "gappy": pa.array([3.0, 8.0, 1.0, 6.0, None, None]),
+        }
+    )
+    papq.write_table(table, path, row_group_size=2)
+    stats = get_stats(path)
+    assert (stats["full"]["min"], stats["full"]["max"]) == (1, 9)
+    assert (stats["gappy"]["min"], stats["gappy"]["max"]) == (1.0, 8.0)
+    assert stats["gappy"]["count"] == 4
+
+
+def test_reservoir_keeps_a_uniform_sample_across_batches():
+    stream = np.arange(100_000, dtype=np.float64)
+    res = _Reservoir(500, seed=3)
+    for part in np.array_split(stream, 7):
+        res.add(part)
+    res.add_one(100_000.0)
+    sample = res.values()
+    assert res.seen == 100_001 and sample.size == 500
+    assert len(set(sample.tolist())) == 500
+    # positions of a uniform sample average to the middle of the stream
+    assert sample.mean() == pytest.approx(50_000, rel=0.1)
+
+
+def test_numeric_stats_report_median_from_reservoir(tmp_path):
+    path = tmp_path / "nums.jsonl"
+    path.write_text("".join(json.dumps({"v": i}) + "\n" for i in range(1, 102)))
+    assert get_stats(path)["v"]["median"] == pytest.approx(51, abs=1)
+    assert get_stats(path, sample_size=0)["v"]["median"] is None
+
+
+def test_num_agg_python_update_samples_in_one_batch():
+    agg = _NumAgg(sample=_Reservoir(16))
+    agg.update([4, None, 1.5, float("nan"), 9])
+    assert agg.sample.seen == 3
+    assert sorted(agg.sample.values().tolist()) == [1.5, 4.0, 9.0]
+    assert agg.finish()["median"] == pytest.approx(4.0, abs=1.5)
+
+
+def test_csv_stats_stream_arrow_batches(tmp_path, monkeypatch):
+    import omni_morph.data.statistics as stats_mod
+
+    monkeypatch.setattr(stats_mod, "_CSV_BLOCK_BYTES", 64)
+    path = tmp_path / "nums.csv"
+    path.write_text("a,b\n" + "".join(f"{i},x{i % 3}\n" for i in range(200)))
+    stats = get_stats(path, columns=["a"])
+    assert list(stats) == ["a"]
+    assert (stats["a"]["count"], stats["a"]["min"], stats["a"]["max"]) == (200, 0, 199)
+
+
+def test_csv_stats_fall_back_when_later_blocks_change_type(tmp_path, monkeypatch):
+    import omni_morph.data.statistics as stats_mod
+
+    monkeypatch.setattr(stats_mod, "_CSV_BLOCK_BYTES", 64)
+    path = tmp_path / "mixed.csv"
+    path.write_text("v\n" + "".join(f"{i}\n" for i in range(100)) + "oops\n")
+    stats = get_stats(path)
+    assert stats["v"]["type"] == "categorical"
+    assert stats["v"]["distinct"] == 101
+
+
+def test_jsonl_stats_arrow_reader_matches_record_routing(tmp_path):
+    rows = [
+        {"n": i, "s": "ab"[i % 2], "ok": i % 3 == 0, "gone": None} for i in range(10)
+    ]
+    path = tmp_path / "rows.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    stats = get_stats(path)
+    assert (stats["n"]["type"], stats["n"]["count"], stats["n"]["max"]) == (
+        "numeric",
+        10,
+        9,
+    )
+    assert stats["s"]["distinct"] == 2
+    assert (stats["ok"]["type"], stats["ok"]["count"]) == ("numeric", 10)
+    assert (stats["gone"]["type"], stats["gone"]["count"]) == ("numeric", 0)
+
+
+def test_jsonl_stats_report_the_bad_line(tmp_path):
+    from omni_morph.data.exceptions import ExtractError
+
+    path = tmp_path / "bad.jsonl"
+    path.write_text('{"a": 1}\n{"a": \n')
+    with pytest.raises(ExtractError, match="line 2"):
+        get_stats(path)
+
+
+def test_avro_stats_fold_whole_blocks(tmp_path):
+    fastavro = pytest.importorskip("fastavro")
+    schema = {
+        "type": "record",
+        "name": "Row",
+        "fields": [
+            {"name": "n", "type": "long"},
+            {"name": "x", "type": ["null", "double"]},
+            {"name": "s", "type": "string"},
+            {"name": "ok", "type": "boolean"},
+        ],
+    }
+    rows = [
+        {
+            "n": i,
+            "x": None if i % 4 == 0 else i / 2,
+            "s": "abc"[i % 3],
+            "ok": i % 2 == 0,
+        }
+        for i in range(1000)
+    ]
+    path = tmp_path / "rows.avro"
+    with open(path, "wb") as fo:
+        fastavro.writer(fo, schema, rows, sync_interval=1024)
+
+    stats = get_stats(path, columns=["n", "x", "s", "ok"])
+    assert (stats["n"]["count"], stats["n"]["min"], stats["n"]["max"]) == (1000, 0, 999)
+    assert stats["x"]["count"] == 750
+    assert stats["s"]["distinct"] == 3
+    assert (stats["ok"]["type"], stats["ok"]["mean"]) == ("numeric", 0.5)
+
+
+def test_is_numeric_type_dispatches_on_type_id():
+    from decimal import Decimal
+
+    from omni_morph.data.statistics import _is_numeric_type
+
+    assert _is_numeric_type(pa.uint16())
+    assert _is_numeric_type(pa.float32())
+    assert _is_numeric_type(pa.decimal128(10, 2))
+    assert not _is_numeric_type(pa.string())
+    assert not _is_numeric_type(pa.timestamp("us"))
+
+    agg = _NumAgg()
+    agg.update_arrow(pa.chunked_array([[Decimal("1.50"), None, Decimal("2.50")]]))
+    assert (agg.count, agg.finish()["mean"]) == (2, 2.0)
+
+
+def test_cat_agg_counts_dictionary_indices():
+    values = ["a", None, "b", "", "a", "c", "a", None]
+    dict_agg, py_agg = _CatAgg(), _CatAgg()
+    encoded = pa.chunked_array([values[:3], values[3:]]).dictionary_encode()
+    dict_agg.update_arrow(encoded)
+    py_agg.update(values)
+    assert dict_agg.counter == py_agg.counter
+
+
+def test_parquet_stats_read_dictionary_encoded_strings(tmp_path):
+    import pyarrow.parquet as papq
+
+    from omni_morph.data.statistics import _parquet_dictionary_columns
+
+    path = tmp_path / "dict.parquet"
+    tbl = pa.table(
+        {"s": ["x", "y", "x", None] * 50, "raw": [str(i) for i in range(200)]}
+    )
+    papq.write_table(tbl, path, use_dictionary=["s"], row_group_size=64)
+    assert _parquet_dictionary_columns(papq.ParquetFile(path), ["s", "raw"]) == ["s"]
+
+    stats = get_stats(path)
+    assert stats["s"]["distinct"] == 3
+    assert stats["s"]["top5"][0] == {"value": "x", "count": 100}
+    assert stats["raw"]["distinct"] == 200
+
+
+class _SetSketch:
+    """Exact stand-in for a HyperLogLog sketch."""
+
+    def __init__(self, lg_k=12):
+        self.seen = set()
+
+    def update(self, values):
+        self.seen.update(values)
+
+    def count(self):
+        return len(self.seen)
+
+
+class _CppSketch(_SetSketch):
+    """Stand-in for ``datasketches.hll_sketch``, fed one value at a time."""
+
+    def update(self, value):
+        self.seen.add(value)
+
+    def get_estimate(self):
+        return len(self.seen)
+
+
+def test_cat_agg_sketch_tracks_counter_before_promotion(monkeypatch):
+    import omni_morph.data.statistics as statistics
+
+    # the C++ backend is cheap enough to run from the first batch
+    monkeypatch.setattr(statistics, "hll_sketch", _CppSketch)
+    agg = _CatAgg(max_card=10)
+    agg.update(["a", "b", "a", None])
+    assert agg.counter is not None and agg.hll.count() == 3
+    agg.update_arrow(pa.chunked_array([[f"k{i}" for i in range(20)]]))
+    assert agg.counter is None
+    assert agg.finish()["distinct"] == 23
+
+
+def test_cat_agg_starts_python_sketch_near_max_card(monkeypatch):
+    import omni_morph.data.statistics as statistics
+
+    monkeypatch.setattr(statistics, "hll_sketch", None)
+    monkeypatch.setattr(statistics, "_HLL", _SetSketch)
+    agg = _CatAgg(max_card=10)
+    agg.update(["a", "b", "a", None])
+    assert agg.hll is None
+    agg.update(["c", "d"])
+    assert agg.counter is not None and agg.hll.count() == 5
+    agg.update_arrow(pa.chunked_array([[f"k{i}" for i in range(20)]]))
+    assert agg.counter is None
+    assert agg.finish()["distinct"] == 25
+
+
+def test_prefetched_preserves_order_and_errors():
+    from omni_morph.data.statistics import _prefetched
+
+    assert list(_prefetched(iter(range(7)), depth=3)) == list(range(7))
+    assert list(_prefetched([])) == []
+
+    def broken():
+        yield 1
+        raise ValueError("bad block")
+
+    with pytest.raises(ValueError, match="bad block"):
+        list(_prefetched(broken()))
+
+
+def test_jsonl_stats_keep_timestamp_strings(tmp_path):
+    path = tmp_path / "ts.jsonl"
+    path.write_text(
+        "".join(
+            json.dumps({"ts": "2016-02-03T07:55:29Z", "n": i}) + "\n" for i in range(3)
+        )
+    )
+    stats = get_stats(path)
+    assert stats["ts"]["top5"] == [{"value": "2016-02-03T07:55:29Z", "count": 3}]
+    assert stats["n"]["count"] == 3